@@ -1,7 +1,9 @@
 import json
+import re
 from typing import Any, Optional, Dict, Tuple, List
 from pathlib import Path
 
+import orjson
 from rich.console import Console
 from rich import print as rprint
 
@@ -12,7 +14,7 @@ from aye.presenter.ui_utils import StoppableSpinner, DEFAULT_THINKING_MESSAGES
 from aye.model.source_collector import collect_sources
 from aye.model.auth import get_user_config
 from aye.model.offline_llm_manager import is_offline_model
-from aye.controller.util import is_truncated_json, discover_agents_file
+from aye.controller.util import is_truncated_json, discover_agents_file, index_models_by_id
 from aye.model.config import SYSTEM_PROMPT, MODELS, DEFAULT_MAX_OUTPUT_TOKENS, DEFAULT_CONTEXT_TARGET_KB, CONTEXT_HARD_LIMIT_KB
 from aye.model import telemetry
 from aye.model.skills_system import SkillsResolver
@@ -56,13 +58,24 @@ TRUNCATED_RESPONSE_MESSAGE = (
 # Module-level skills resolver singleton (keeps cache across invocations)
 _skills_resolver = SkillsResolver()
 
+# Key of the answer_summary field in a streamed JSON response
+_ANSWER_SUMMARY_KEY = '"answer_summary"'
+# Opening of the answer_summary string in a streamed JSON response
+_ANSWER_SUMMARY_START_RE = re.compile(r'"answer_summary"\s*:\s*"')
+# The key followed by as much of the opening as has been received
+_ANSWER_SUMMARY_PREFIX_RE = re.compile(r'"answer_summary"\s*(?::\s*)?')
+# Characters and complete escapes of a JSON string body, up to its closing quote
+_JSON_STRING_BODY_RE = re.compile(r'(?:[^"\\]|\\.)*')
+# A trailing escape that cannot be decoded yet: a \uXXXX cut off at the end of
+# the received text, or a high surrogate still waiting for its pair
+_HELD_ESCAPE_RE = re.compile(r'\\u(?:[0-9a-fA-F]{0,3}|[dD][89abAB][0-9a-fA-F]{2})$')
+# Models sometimes put raw newlines inside strings; accept them while streaming
+_LENIENT_JSON = json.JSONDecoder(strict=False)
+
 
 def _get_model_config(model_id: str) -> Optional[Dict[str, Any]]:
     """Get configuration for a specific model."""
-    for model in MODELS:
-        if model["id"] == model_id:
-            return model
-    return None
+    return index_models_by_id(MODELS).get(model_id)
 
 
 def _get_context_target_size(model_id: str) -> int:
@@ -251,6 +264,74 @@ def _print_context_message(
         return
 
 
+class _AnswerSummaryStream:
+    """Extract the answer_summary of a streaming local model response as it arrives.
+
+    Deltas are fed in order. Only text not consumed by an earlier feed is
+    scanned and decoded, so the whole stream costs time linear in its length.
+    Plain-text responses are passed through as they are.
+    """
+
+    def __init__(self) -> None:
+        self.summary = ""
+        # Received text not consumed yet
+        self._pending = ""
+        self._plain: Optional[bool] = None
+        self._in_summary = False
+        self._done = False
+
+    def feed(self, delta: str) -> bool:
+        """Add a delta of the response; return True if the summary grew."""
+        if self._done:
+            return False
+        self._pending += delta
+
+        if self._plain is None:
+            head = self._pending.lstrip()
+            if not head:
+                return False
+            self._plain = not head.startswith(("{", "`"))
+        if self._plain:
+            self.summary += self._pending
+            self._pending = ""
+            return True
+
+        if not self._in_summary and not self._find_summary():
+            return False
+
+        body = _JSON_STRING_BODY_RE.match(self._pending).group()
+        closed = self._pending[len(body):len(body) + 1] == '"'
+        held = None if closed else _HELD_ESCAPE_RE.search(body)
+        cut = held.start() if held else len(body)
+        try:
+            chunk = _LENIENT_JSON.decode(f'"{body[:cut]}"')
+        except ValueError:
+            return False
+        self._pending = "" if closed else self._pending[cut:]
+        self._done = closed
+        self.summary += chunk
+        return bool(chunk)
+
+    def _find_summary(self) -> bool:
+        """Consume pending text up to the opening quote of answer_summary, if received."""
+        pending = self._pending
+        while True:
+            i = pending.find(_ANSWER_SUMMARY_KEY)
+            if i < 0:
+                # Keep what may be the beginning of the key
+                self._pending = pending[-(len(_ANSWER_SUMMARY_KEY) - 1):]
+                return False
+            start = _ANSWER_SUMMARY_START_RE.match(pending, i)
+            if start is not None:
+                self._pending = pending[start.end():]
+                self._in_summary = True
+                return True
+            if _ANSWER_SUMMARY_PREFIX_RE.fullmatch(pending, i):
+                self._pending = pending[i:]
+                return False
+            pending = pending[i + 1:]
+
+
 def _parse_api_response(resp: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[int]]:
     """Parses the JSON response from the API."""
     assistant_resp_str = resp.get('assistant_response')
@@ -261,10 +342,10 @@ def _parse_api_response(resp: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[
         return parsed, chat_id
 
     try:
-        parsed = json.loads(assistant_resp_str)
+        parsed = orjson.loads(assistant_resp_str)
         if _is_debug():
             print(f"[DEBUG] Successfully parsed assistant_response JSON")
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         if _is_debug():
             print(f"[DEBUG] Failed to parse assistant_response as JSON: {e}. Checking for truncation.")
             print(f"[DEBUG] LLM response: {resp}")
@@ -402,13 +483,21 @@ def invoke_llm(
         interval=15.0
     )
 
-    streaming_display: Optional[StreamingResponseDisplay] = None
     token_usage: Optional[Dict[str, int]] = None
 
     def stop_spinner():
         """Callback to stop spinner when first content arrives (for streaming API)."""
         spinner.stop()
 
+    streaming_display = StreamingResponseDisplay(on_first_content=stop_spinner)
+
+    summary_stream = _AnswerSummaryStream()
+
+    def local_stream_update(delta: str) -> None:
+        """Show the answer_summary of a streaming local model as it arrives."""
+        if summary_stream.feed(delta):
+            streaming_display.update(summary_stream.summary)
+
     try:
         spinner.start()
 
@@ -420,19 +509,26 @@ def invoke_llm(
             "chat_id": chat_id,
             "root": conf.root,
             "system_prompt": system_prompt,
-            "max_output_tokens": max_output_tokens
+            "max_output_tokens": max_output_tokens,
+            "on_stream_update": local_stream_update,
         })
 
         if local_response is not None:
             # Extract token usage if present (for printing after spinner stops)
             token_usage = local_response.get("token_usage")
-            
+            summary = local_response.get("summary", "")
+
+            # Replace the streamed (possibly partial) summary with the parsed one.
+            streamed_summary = streaming_display.has_received_content()
+            if streamed_summary:
+                streaming_display.update(summary, is_final=True)
+
             return LLMResponse(
-                summary=local_response.get("summary", ""),
+                summary=summary,
                 updated_files=local_response.get("updated_files", []),
                 chat_id=None,
                 source=LLMSource.LOCAL,
-                summary_already_printed=False,
+                summary_already_printed=streamed_summary,
             )
 
         # 2) API call with streaming display
@@ -441,7 +537,6 @@ def invoke_llm(
 
         telemetry_payload = telemetry.build_payload(top_n=20) if telemetry.is_enabled() else None
 
-        streaming_display = StreamingResponseDisplay(on_first_content=stop_spinner)
         stream_callback = create_streaming_callback(streaming_display)
 
         api_resp = cli_invoke(
@@ -481,7 +576,7 @@ def invoke_llm(
     finally:
         spinner.stop()
 
-        if streaming_display is not None and streaming_display.is_active():
+        if streaming_display.is_active():
             streaming_display.stop()
         
         # Print token usage after spinner has stopped
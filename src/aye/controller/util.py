@@ -1,6 +1,6 @@
 from pathlib import Path
 import os
-from typing import Union, Optional, Tuple, Dict, Any
+from typing import Union, Optional, Tuple, Dict, Any, List
 import re
 import json
 from rich import print as rprint
@@ -127,6 +127,9 @@ def _try_read_agents(path: Path, verbose: bool) -> Optional[Tuple[Path, str]]:
         return None
 
 
+_NON_SPACE = re.compile(r"\S")
+
+
 def is_truncated_json(raw_text: str) -> bool:
     """
     Detect if a JSON string appears to be truncated.
@@ -143,20 +146,47 @@ def is_truncated_json(raw_text: str) -> bool:
     if not raw_text:
         return False
     
-    text = raw_text.strip()
-    if not text:
+    # Only the outermost characters matter, so locate them directly instead of
+    # strip()-ing, which copies the whole response when it ends in a newline.
+    first = _NON_SPACE.search(raw_text)
+    if first is None:
         return False
+    opening = raw_text[first.start()]
+    
+    end = len(raw_text) - 1
+    while raw_text[end].isspace():
+        end -= 1
+    closing = raw_text[end]
     
     # Check for matching outer delimiters
-    if text.startswith('{') and text.endswith('}'):
+    if opening == '{' and closing == '}':
         return False
     
-    if text.startswith('[') and text.endswith(']'):
+    if opening == '[' and closing == ']':
         return False
     
     # If it starts with { or [ but doesn't have matching closing delimiter, it's truncated
-    if text.startswith('{') or text.startswith('['):
+    if opening == '{' or opening == '[':
         return True
     
     # Doesn't look like JSON at all
     return False
+
+
+# Single-entry cache for index_models_by_id: (models list it was built from, index)
+_models_index: Tuple[Optional[List[Dict[str, Any]]], Dict[str, Dict[str, Any]]] = (None, {})
+
+
+def index_models_by_id(models: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Return an id -> model config dict for a models list such as ``MODELS``.
+
+    The index is built once and reused for as long as the same list object is
+    passed in, turning repeated linear scans into dict lookups. If several
+    entries share an id, the first one wins (matching a front-to-back scan).
+    """
+    global _models_index
+    indexed, by_id = _models_index
+    if indexed is not models:
+        by_id = {model["id"]: model for model in reversed(models)}
+        _models_index = (models, by_id)
+    return by_id
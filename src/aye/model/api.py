@@ -6,6 +6,7 @@ from typing import Any, Dict, Optional, Callable
 from rich import print as rprint
 
 import httpx
+import orjson
 from aye.model.auth import get_token, get_user_config
 from aye.model.config import DEFAULT_MAX_OUTPUT_TOKENS
 
@@ -117,7 +118,7 @@ def _extract_answer_summary_from_assistant_response(resp: Dict[str, Any]) -> str
             return ""
 
     try:
-        parsed = json.loads(assistant_resp_str)
+        parsed = orjson.loads(assistant_resp_str)
         if isinstance(parsed, dict):
             return str(parsed.get("answer_summary", ""))
     except Exception:
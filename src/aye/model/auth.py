@@ -36,6 +36,11 @@ def _parse_user_config() -> dict[str, str]:
     return config
 
 
+def _render_user_config(config: dict[str, str]) -> str:
+    """Render config as the contents of a [default]-only ~/.ayecfg."""
+    return "".join(["[default]\n", *(f"{k}={v}\n" for k, v in config.items())])
+
+
 def get_user_config(key: str, default: Any = None) -> Any:
     """Get a user config value, with environment variable override."""
     env_key = f"AYE_{key.upper().replace('-', '_')}"
@@ -50,11 +55,8 @@ def set_user_config(key: str, value: Any) -> None:
     """Set a user config value in the [default] section."""
     config = _parse_user_config()
     config[key] = str(value)
-    new_content = "[default]\n"
-    for k, v in config.items():
-        new_content += f"{k}={v}\n"
     TOKEN_FILE.parent.mkdir(parents=True, exist_ok=True)
-    TOKEN_FILE.write_text(new_content, encoding="utf-8")
+    TOKEN_FILE.write_text(_render_user_config(config), encoding="utf-8")
     TOKEN_FILE.chmod(0o600)
 
 
@@ -72,10 +74,7 @@ def delete_user_config(key: str) -> None:
         # If no config left, remove the file entirely
         TOKEN_FILE.unlink(missing_ok=True)
     else:
-        new_content = "[default]\n"
-        for k, v in config.items():
-            new_content += f"{k}={v}\n"
-        TOKEN_FILE.write_text(new_content, encoding="utf-8")
+        TOKEN_FILE.write_text(_render_user_config(config), encoding="utf-8")
         TOKEN_FILE.chmod(0o600)
 
 
@@ -125,10 +124,7 @@ def delete_token() -> None:
     if not config:
         TOKEN_FILE.unlink(missing_ok=True)
     else:
-        new_content = "[default]\n"
-        for k, v in config.items():
-            new_content += f"{k}={v}\n"
-        TOKEN_FILE.write_text(new_content, encoding="utf-8")
+        TOKEN_FILE.write_text(_render_user_config(config), encoding="utf-8")
         TOKEN_FILE.chmod(0o600)
 
 
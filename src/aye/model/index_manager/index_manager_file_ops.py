@@ -6,11 +6,12 @@ This module contains classes for:
 - Loading and saving the hash index
 """
 
-import json
 import os
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple, Callable
 
+import orjson
+
 from .index_manager_utils import calculate_hash
 
 
@@ -171,8 +172,8 @@ class IndexPersistence:
         """
         if self.hash_index_path.is_file():
             try:
-                return json.loads(self.hash_index_path.read_text(encoding="utf-8"))
-            except (json.JSONDecodeError, FileNotFoundError):
+                return orjson.loads(self.hash_index_path.read_bytes())
+            except (orjson.JSONDecodeError, FileNotFoundError):
                 pass
         return {}
     
@@ -195,7 +196,8 @@ class IndexPersistence:
         temp_path = self.hash_index_path.with_suffix('.json.tmp')
         
         try:
-            temp_path.write_text(json.dumps(index_data, indent=2), encoding="utf-8")
+            # Compact encoding: the index is only ever read back by load_index.
+            temp_path.write_bytes(orjson.dumps(index_data))
             os.replace(temp_path, self.hash_index_path)
             return True
         except Exception:
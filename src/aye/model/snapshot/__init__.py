@@ -8,11 +8,12 @@ Note:
 """
 
 import json
+import os
 import subprocess
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 
-from .base import SnapshotBackend
+from .base import SnapshotBackend, truncate_prompt
 from .file_backend import FileBasedBackend, SNAP_ROOT, LATEST_SNAP_DIR
 from .git_ref_backend import GitRefBackend
 
@@ -300,23 +301,28 @@ def _get_latest_snapshot_dir() -> Optional[Path]:
     """Get the latest snapshot directory by finding the one with the highest ordinal."""
     backend = get_backend()
     if isinstance(backend, FileBasedBackend):
-        if not backend.snap_root.is_dir():
+        # Single scandir pass tracking the max ordinal; dirent type info avoids
+        # an extra stat per entry and there is no list to build and sort.
+        best_ordinal = -1
+        best_path: Optional[str] = None
+        try:
+            with os.scandir(backend.snap_root) as it:
+                for entry in it:
+                    name = entry.name
+                    if name == "latest" or "_" not in name:
+                        continue
+                    ordinal_str = name.partition("_")[0]
+                    if not ordinal_str.isdigit():
+                        continue
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    ordinal = int(ordinal_str)
+                    if ordinal >= best_ordinal:
+                        best_ordinal, best_path = ordinal, entry.path
+        except OSError:
             return None
 
-        snapshot_dirs = []
-        for batch_dir in backend.snap_root.iterdir():
-            if batch_dir.is_dir() and "_" in batch_dir.name and batch_dir.name != "latest":
-                try:
-                    ordinal = int(batch_dir.name.split("_")[0])
-                    snapshot_dirs.append((ordinal, batch_dir))
-                except ValueError:
-                    continue
-
-        if not snapshot_dirs:
-            return None
-
-        snapshot_dirs.sort(key=lambda x: x[0])
-        return snapshot_dirs[-1][1]
+        return Path(best_path) if best_path is not None else None
     return None
 
 
@@ -325,14 +331,7 @@ def _truncate_prompt(prompt: Optional[str], max_length: int = 32) -> str:
     backend = get_backend()
     if hasattr(backend, "_truncate_prompt"):
         return backend._truncate_prompt(prompt, max_length)
-    if not prompt:
-        return "no prompt".ljust(max_length)
-    prompt = prompt.strip()
-    if not prompt:
-        return "no prompt".ljust(max_length)
-    if len(prompt) <= max_length:
-        return prompt.ljust(max_length)
-    return prompt[:max_length] + "..."
+    return truncate_prompt(prompt, max_length)
 
 
 def _list_all_snapshots_with_metadata() -> List[str]:
@@ -2,12 +2,36 @@
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Padded "no prompt" placeholders keyed by width; listings reuse one width.
+_NO_PROMPT_CACHE: Dict[int, str] = {}
+
+
+def truncate_prompt(prompt: Optional[str], max_length: int = 32) -> str:
+    """Truncate a prompt to max_length characters, adding ellipsis if needed.
+
+    Short prompts are left-justified to max_length so listings line up.
+    """
+    if prompt and (prompt[0].isspace() or prompt[-1].isspace()):
+        prompt = prompt.strip()
+    if not prompt:
+        placeholder = _NO_PROMPT_CACHE.get(max_length)
+        if placeholder is None:
+            placeholder = _NO_PROMPT_CACHE[max_length] = "no prompt".ljust(max_length)
+        return placeholder
+    if len(prompt) <= max_length:
+        return prompt.ljust(max_length)
+    return prompt[:max_length] + "..."
 
 
 class SnapshotBackend(ABC):
     """Abstract base class for snapshot storage backends."""
 
+    def _truncate_prompt(self, prompt: Optional[str], max_length: int = 32) -> str:
+        """Truncate a prompt for display in snapshot listings."""
+        return truncate_prompt(prompt, max_length)
+
     @abstractmethod
     def create_snapshot(self, file_paths: List[Path], prompt: Optional[str] = None) -> str:
         """Create a snapshot of the given files.
@@ -50,17 +50,6 @@ class FileBasedBackend(SnapshotBackend):
         batch_dir.mkdir(parents=True, exist_ok=True)
         return batch_dir
 
-    def _truncate_prompt(self, prompt: Optional[str], max_length: int = 32) -> str:
-        """Truncate a prompt to max_length characters, adding ellipsis if needed."""
-        if not prompt:
-            return "no prompt".ljust(max_length)
-        prompt = prompt.strip()
-        if not prompt:
-            return "no prompt".ljust(max_length)
-        if len(prompt) <= max_length:
-            return prompt.ljust(max_length)
-        return prompt[:max_length] + "..."
-
     def _list_all_snapshots_with_metadata(self) -> List[str]:
         """List all snapshots in descending order with file names from metadata."""
         if not self.snap_root.is_dir():
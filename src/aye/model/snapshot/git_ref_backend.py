@@ -101,16 +101,6 @@ class GitRefBackend(SnapshotBackend):
         ordinal, timestamp = batch_id.split("_", 1)
         return (ordinal, timestamp)
 
-    def _truncate_prompt(self, prompt: Optional[str], max_length: int = 32) -> str:
-        if not prompt:
-            return "no prompt".ljust(max_length)
-        prompt = prompt.strip()
-        if not prompt:
-            return "no prompt".ljust(max_length)
-        if len(prompt) <= max_length:
-            return prompt.ljust(max_length)
-        return prompt[:max_length] + "..."
-
     def _get_all_snapshot_refs(self) -> List[_SnapshotRef]:
         res = self._run_git(
             [
@@ -1,7 +1,8 @@
 import os
-import json
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 import httpx
+import orjson
 from pathlib import Path
 import traceback
 
@@ -9,28 +10,30 @@ from rich import print as rprint
 
 from .plugin_base import Plugin
 from .model_plugin_utils import (
+    ChatHistoryMixin,
+    PooledClientMixin,
+    bearer_json_headers,
     get_conversation_id,
     build_user_message,
-    build_history_message,
+    build_request_body,
     create_error_response,
     parse_llm_response,
-    load_history,
-    save_history,
+    delete_history,
+    send_with_retry,
+    serialize_message,
+    serialize_system_message,
+    use_conversation,
 )
 from aye.model.config import SYSTEM_PROMPT, MODELS, DEFAULT_MAX_OUTPUT_TOKENS
 from aye.model.auth import get_user_config
+from aye.controller.util import index_models_by_id
 
-LLM_TIMEOUT = 600.0
-
-HISTORY_FILENAME = "chat_history.json"
+HISTORY_FILENAME = "chat_history.jsonl.gz"
 
 
 def _get_model_config(model_id: str) -> Optional[Dict[str, Any]]:
     """Get configuration for a specific model."""
-    for model in MODELS:
-        if model["id"] == model_id:
-            return model
-    return None
+    return index_models_by_id(MODELS).get(model_id)
 
 
 def _extract_json_object(raw_response: str, prefer_last: bool = True, require_keys=None):
@@ -52,7 +55,7 @@ def _extract_json_object(raw_response: str, prefer_last: bool = True, require_ke
     """
     # 1) Direct JSON parse
     try:
-        obj = json.loads(raw_response)
+        obj = orjson.loads(raw_response)
         if isinstance(obj, dict):
             if require_keys and not all(k in obj for k in require_keys):
                 return None
@@ -97,7 +100,7 @@ def _extract_json_object(raw_response: str, prefer_last: bool = True, require_ke
     parsed = []
     for cand in candidates:
         try:
-            obj = json.loads(cand)
+            obj = orjson.loads(cand)
             if not isinstance(obj, dict):
                 continue
             if require_keys and not all(k in obj for k in require_keys):
@@ -112,15 +115,22 @@ def _extract_json_object(raw_response: str, prefer_last: bool = True, require_ke
     return parsed[-1] if prefer_last else parsed[0]
 
 
+@lru_cache(maxsize=8)
+def _history_path_for(root: Any) -> Path:
+    """Return the history file path under an explicit project root (memoized)."""
+    return Path(root) / ".aye" / HISTORY_FILENAME
+
+
 def _is_databricks_configured() -> bool:
     """Check if Databricks environment variables are configured."""
     return bool(os.environ.get("AYE_DBX_API_URL") and os.environ.get("AYE_DBX_API_KEY"))
 
 
-class DatabricksModelPlugin(Plugin):
+class DatabricksModelPlugin(PooledClientMixin, ChatHistoryMixin, Plugin):
     name = "databricks_model"
     version = "1.0.3"  # Version bump for token usage in response
     premium = "free"
+    history_label = "databricks model"
 
     def __init__(self):
         super().__init__()
@@ -132,6 +142,11 @@ class DatabricksModelPlugin(Plugin):
         self.chat_history: Dict[str, list] = {}
         self.history_file: Optional[Path] = None
 
+        # Encoded form of each history message, kept alongside chat_history so
+        # that a turn only serializes the messages that were added since the
+        # previous one. Entries are (history list, fragments) per conversation.
+        self._history_bytes: Dict[str, Tuple[list, List[bytes]]] = {}
+
     @property
     def verbose(self) -> bool:  # type: ignore[override]
         return bool(self._verbose)
@@ -163,18 +178,34 @@ class DatabricksModelPlugin(Plugin):
             rprint(f"[bold yellow]Initializing {self.name} v{self.version}[/]")
 
     def _get_history_file_path(self, root: Optional[Any]) -> Path:
-        """Get the history file path for this plugin."""
+        """Get the history file path for this plugin.
+
+        Paths under an explicit root are memoized; the cwd fallback is resolved
+        on every call since the working directory may change between commands.
+        """
         if root:
-            return Path(root) / ".aye" / HISTORY_FILENAME
+            return _history_path_for(root)
         return Path.cwd() / ".aye" / HISTORY_FILENAME
 
     def _load_history(self) -> None:
-        """Load chat history from disk."""
-        self.chat_history = load_history(self.history_file, self.verbose, "databricks model")
-
-    def _save_history(self) -> None:
-        """Save chat history to disk."""
-        save_history(self.history_file, self.chat_history, self.verbose, "databricks model")
+        """Load chat history from disk, dropping encodings of a replaced history."""
+        previous = self.chat_history
+        super()._load_history()
+        if self.chat_history is not previous:
+            self._history_bytes = {}
+
+    def _serialized_history(self, conv_id: str) -> List[bytes]:
+        """Return encoded history messages for a conversation, encoding only new ones."""
+        history = self.chat_history[conv_id]
+        cached = self._history_bytes.get(conv_id)
+        if cached is None or cached[0] is not history or len(cached[1]) > len(history):
+            fragments: List[bytes] = []
+            self._history_bytes[conv_id] = (history, fragments)
+        else:
+            fragments = cached[1]
+        for message in history[len(fragments):]:
+            fragments.append(serialize_message(message))
+        return fragments
 
     def _handle_databricks(
         self,
@@ -192,76 +223,86 @@ class DatabricksModelPlugin(Plugin):
             return None
 
         conv_id = get_conversation_id(chat_id)
-        if conv_id not in self.chat_history:
-            self.chat_history[conv_id] = []
+        use_conversation(self.chat_history, conv_id)
+        if len(self._history_bytes) > len(self.chat_history):
+            # Forget encodings of conversations dropped from chat_history
+            self._history_bytes = {k: v for k, v in self._history_bytes.items() if k in self.chat_history}
 
         # Full message (with file contents) for the current API call only
         user_message = build_user_message(prompt, source_files)
-        # Lightweight message (prompt + file names only) for history storage
-        history_message = build_history_message(prompt, source_files)
 
         effective_system_prompt = system_prompt if system_prompt else SYSTEM_PROMPT
 
-        messages_json = (
-            [{"role": "system", "content": effective_system_prompt}]
-            + self.chat_history[conv_id]
-            + [{"role": "user", "content": user_message}]
-        )
-        messages = messages_json
         if self.debug:
             print(">>>>>>>>>>>>>>>>")
             print(self.chat_history[conv_id])
             print(">>>>>>>>>>>>>>>>")
 
-        headers = {"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"}
-        payload = {
+        headers = bearer_json_headers(api_key)
+        settings = {
             "model": model_name,
-            "messages": messages,
             "temperature": 0.7,
             "max_tokens": max_output_tokens,
         }
+        body = build_request_body(
+            settings,
+            [
+                serialize_system_message(effective_system_prompt),
+                *self._serialized_history(conv_id),
+                serialize_message({"role": "user", "content": user_message}),
+            ],
+        )
 
         try:
-            with httpx.Client(timeout=LLM_TIMEOUT) as client:
-                response = client.post(api_url, json=payload, headers=headers)
-                if self.verbose and response.status_code != 200:
-                    print(f"Status code: {response.status_code}")
+            client = self._get_client()
+            response = send_with_retry(lambda: client.post(api_url, content=body, headers=headers))
+            if self.verbose and response.status_code != 200:
+                print(f"Status code: {response.status_code}")
+                print("-----------------")
+                print(response.text)
+                print("-----------------")
+            response.raise_for_status()
+            result = response.json()
+            if result.get("choices") and result["choices"][0].get("message"):
+                raw_response = result["choices"][0]["message"]["content"]
+                generated_json = _extract_json_object(raw_response)
+                # Serialized form is only needed for the history entry; the
+                # decoded object is handed to the parser as-is.
+                generated_text = orjson.dumps(generated_json).decode("utf-8")
+                if self.debug:
                     print("-----------------")
                     print(response.text)
                     print("-----------------")
-                response.raise_for_status()
-                result = response.json()
-                if result.get("choices") and result["choices"][0].get("message"):
-                    raw_response = result["choices"][0]["message"]["content"]
-                    generated_json = _extract_json_object(raw_response)
-                    generated_text = json.dumps(generated_json)
-                    if self.debug:
-                        print("-----------------")
-                        print(response.text)
-                        print("-----------------")
-                        print(generated_text)
-                        print("-----------------")
-                    # Store only the lightweight history message (no file contents)
-                    self.chat_history[conv_id].append({"role": "user", "content": history_message})
-                    self.chat_history[conv_id].append({"role": "assistant", "content": generated_text})
-                    self._save_history()
-                    
-                    # Parse the response and include token usage
-                    parsed_response = parse_llm_response(generated_text, self.debug)
-                    
-                    # Add token usage to the response if available
-                    usage = result.get("usage")
-                    if usage:
-                        parsed_response["token_usage"] = {
-                            "prompt_tokens": usage.get("prompt_tokens", 0),
-                            "completion_tokens": usage.get("completion_tokens", 0),
-                            "total_tokens": usage.get("total_tokens", 0),
-                        }
-                    
-                    return parsed_response
-                return create_error_response("Failed to get a valid response from the Databricks API", self.verbose)
+                    print(generated_text)
+                    print("-----------------")
+                # Store only the prompt in history (no file contents)
+                new_messages = [
+                    {"role": "user", "content": prompt},
+                    {"role": "assistant", "content": generated_text},
+                ]
+                self.chat_history[conv_id].extend(new_messages)
+                self._append_history(conv_id, new_messages)
+
+                # Parse the response and include token usage
+                parsed_response = parse_llm_response(
+                    generated_json if generated_json is not None else generated_text,
+                    self.debug,
+                )
+
+                # Add token usage to the response if available
+                usage = result.get("usage")
+                if usage:
+                    parsed_response["token_usage"] = {
+                        "prompt_tokens": usage.get("prompt_tokens", 0),
+                        "completion_tokens": usage.get("completion_tokens", 0),
+                        "total_tokens": usage.get("total_tokens", 0),
+                    }
+
+                return parsed_response
+            return create_error_response("Failed to get a valid response from the Databricks API", self.verbose)
         except httpx.HTTPStatusError as e:
-            traceback.print_exc()
+            if self.debug:
+                traceback.print_exc()
             error_msg = f"DBX API error: {e.response.status_code}"
             try:
                 error_detail = e.response.json()
@@ -274,7 +315,8 @@ class DatabricksModelPlugin(Plugin):
                 error_msg += f" - {e.response.text[:200]}"
             return create_error_response(error_msg, self.verbose)
         except Exception as e:
-            traceback.print_exc()
+            if self.debug:
+                traceback.print_exc()
             return create_error_response(f"Error calling Databricks API: {str(e)}", self.verbose)
 
     def on_command(self, command_name: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -285,7 +327,7 @@ class DatabricksModelPlugin(Plugin):
             
             root = params.get("root")
             history_file = self._get_history_file_path(root)
-            history_file.unlink(missing_ok=True)
+            delete_history(history_file)
             self.chat_history = {}
             if self.verbose:
                 rprint("[yellow]Databricks model chat history cleared.[/]")
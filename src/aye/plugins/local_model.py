@@ -1,53 +1,117 @@
 import os
-import json
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Callable, Dict, Any, List, Mapping, Optional, Tuple
 import httpx
+import orjson
 from pathlib import Path
+from types import MappingProxyType
 
 from rich import print as rprint
 
 from .plugin_base import Plugin
 from .model_plugin_utils import (
+    ChatHistoryMixin,
+    PooledClientMixin,
+    bearer_json_headers,
     get_conversation_id,
     build_user_message,
-    build_history_message,
     create_error_response,
+    is_llm_cache_enabled,
+    iter_sse_json,
+    llm_cache_key,
     parse_llm_response,
-    load_history,
-    save_history,
+    read_llm_cache,
+    send_with_retry,
+    delete_history,
+    system_message,
+    use_conversation,
+    write_llm_cache,
 )
 from aye.model.config import SYSTEM_PROMPT, MODELS, DEFAULT_MAX_OUTPUT_TOKENS
+from aye.model import auth
 from aye.model.auth import get_user_config
+from aye.controller.util import index_models_by_id
 
-LLM_TIMEOUT = 600.0
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-pro"
+
+# Chat history role -> Gemini content role (anything else is a model turn)
+GEMINI_ROLES = {"user": "user", "assistant": "model"}
 
 # History file name for this plugin
-HISTORY_FILENAME = "chat_history.json"
+HISTORY_FILENAME = "chat_history.jsonl.gz"
 
 
 def _get_model_config(model_id: str) -> Optional[Dict[str, Any]]:
     """Get configuration for a specific model."""
-    for model in MODELS:
-        if model["id"] == model_id:
-            return model
-    return None
+    return index_models_by_id(MODELS).get(model_id)
+
+
+@lru_cache(maxsize=8)
+def _gemini_headers(api_key: str) -> Mapping[str, str]:
+    """Return the (shared, read-only) Gemini request headers for api_key."""
+    return MappingProxyType({"Content-Type": "application/json", "x-goog-api-key": api_key})
+
+
+def _openai_stream_delta(event: Dict[str, Any]) -> Optional[str]:
+    """Extract the content delta from an OpenAI-style streaming chunk."""
+    choices = event.get("choices") or []
+    if not choices:
+        return None
+    return (choices[0].get("delta") or {}).get("content")
+
+
+def _gemini_stream_delta(event: Dict[str, Any]) -> Optional[str]:
+    """Extract the text delta from a Gemini streamGenerateContent chunk."""
+    candidates = event.get("candidates") or []
+    if not candidates:
+        return None
+    parts = (candidates[0].get("content") or {}).get("parts") or []
+    return "".join(part.get("text", "") for part in parts)
+
+
+def _config_stamp() -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) of the user config file, or None if it is missing."""
+    try:
+        st = auth.TOKEN_FILE.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
 
 
 def _is_local_model_configured() -> bool:
-    """Check if local model (OpenAI-compatible or Gemini) is configured."""
-    # OpenAI-compatible API
-    if get_user_config("llm_api_url") and get_user_config("llm_api_key"):
-        return True
+    """Check if local model (OpenAI-compatible or Gemini) is configured.
+
+    The answer is memoized on everything it depends on (the relevant env vars
+    and the config file's stamp), so repeated checks skip re-parsing ~/.ayecfg
+    while edits made through the ``llm`` command are still picked up.
+    """
+    return _local_model_configured_for(
+        os.environ.get("AYE_LLM_API_URL"),
+        os.environ.get("AYE_LLM_API_KEY"),
+        os.environ.get("GEMINI_API_KEY"),
+        _config_stamp(),
+    )
+
+
+@lru_cache(maxsize=1)
+def _local_model_configured_for(
+    llm_api_url_env: Optional[str],
+    llm_api_key_env: Optional[str],
+    gemini_api_key: Optional[str],
+    config_stamp: Optional[Tuple[int, int]],
+) -> bool:
     # Gemini API
-    if os.environ.get("GEMINI_API_KEY"):
+    if gemini_api_key:
         return True
-    return False
+    # OpenAI-compatible API
+    return bool(get_user_config("llm_api_url") and get_user_config("llm_api_key"))
 
 
-class LocalModelPlugin(Plugin):
+class LocalModelPlugin(PooledClientMixin, ChatHistoryMixin, Plugin):
     name = "local_model"
     version = "1.0.1"  # Version bump for new_chat fix
     premium = "free"
+    history_label = "local model"
 
     def __init__(self):
         super().__init__()
@@ -66,21 +130,115 @@ class LocalModelPlugin(Plugin):
             return Path(root) / ".aye" / HISTORY_FILENAME
         return Path.cwd() / ".aye" / HISTORY_FILENAME
 
-    def _load_history(self) -> None:
-        """Load chat history from disk."""
-        self.chat_history = load_history(self.history_file, self.verbose, "local model")
+    def _stream_text(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        headers: Mapping[str, str],
+        extract_delta: Callable[[Dict[str, Any]], Optional[str]],
+        on_stream_update: Callable[[str], None],
+    ) -> Optional[str]:
+        """POST a streaming request and accumulate the generated text.
+
+        on_stream_update is called with each text delta as it arrives. Returns
+        None when the stream produced no content.
+        """
+        parts: List[str] = []
+        client = self._get_client()
+        request = client.build_request("POST", url, content=orjson.dumps(payload), headers=headers)
+        response = send_with_retry(lambda: client.send(request, stream=True))
+        try:
+            if response.is_error:
+                # Load the body so error handlers can report it.
+                response.read()
+            response.raise_for_status()
+            for event in iter_sse_json(response.iter_lines()):
+                delta = extract_delta(event)
+                if delta:
+                    parts.append(delta)
+                    on_stream_update(delta)
+        finally:
+            response.close()
+        return "".join(parts) if parts else None
+
+    def _generate(
+        self,
+        cache_parts: Tuple[Any, ...],
+        fetch: Callable[[], Optional[str]],
+        on_stream_update: Optional[Callable[[str], None]],
+    ) -> Optional[str]:
+        """Return generated text from fetch(), going through the response cache when enabled.
+
+        cache_parts must identify the request completely (endpoint + payload);
+        exact repeats are then answered from disk without a network round-trip.
+        """
+        cache_key = llm_cache_key(*cache_parts) if is_llm_cache_enabled() else None
+        if cache_key:
+            cached = read_llm_cache(cache_key)
+            if cached is not None:
+                if self.debug:
+                    rprint(f"[yellow]LLM response cache hit: {cache_key[:12]}[/]")
+                if on_stream_update is not None:
+                    on_stream_update(cached)
+                return cached
 
-    def _save_history(self) -> None:
-        """Save chat history to disk."""
-        save_history(self.history_file, self.chat_history, self.verbose, "local model")
+        generated_text = fetch()
+        if cache_key and generated_text is not None:
+            write_llm_cache(cache_key, generated_text)
+        return generated_text
 
-    def _handle_openai_compatible(self, prompt: str, source_files: Dict[str, str], chat_id: Optional[int] = None, system_prompt: Optional[str] = None, max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS) -> Optional[Dict[str, Any]]:
+    def _fetch_openai_compatible(
+        self,
+        api_url: str,
+        payload: Dict[str, Any],
+        headers: Mapping[str, str],
+        on_stream_update: Optional[Callable[[str], None]],
+    ) -> Optional[str]:
+        """Send a chat-completions request and return the generated text, if any."""
+        if on_stream_update is not None:
+            stream_payload = {**payload, "stream": True}
+            return self._stream_text(api_url, stream_payload, headers, _openai_stream_delta, on_stream_update)
+
+        body = orjson.dumps(payload)
+        client = self._get_client()
+        response = send_with_retry(lambda: client.post(api_url, content=body, headers=headers))
+        response.raise_for_status()
+        result = response.json()
+        if result.get("choices") and result["choices"][0].get("message"):
+            return result["choices"][0]["message"]["content"]
+        return None
+
+    def _fetch_gemini(
+        self,
+        payload: Dict[str, Any],
+        headers: Mapping[str, str],
+        on_stream_update: Optional[Callable[[str], None]],
+    ) -> Optional[str]:
+        """Send a Gemini generateContent request and return the generated text, if any."""
+        if on_stream_update is not None:
+            url = f"{GEMINI_BASE_URL}:streamGenerateContent?alt=sse"
+            return self._stream_text(url, payload, headers, _gemini_stream_delta, on_stream_update)
+
+        url = f"{GEMINI_BASE_URL}:generateContent"
+        body = orjson.dumps(payload)
+        client = self._get_client()
+        response = send_with_retry(lambda: client.post(url, content=body, headers=headers))
+        response.raise_for_status()
+        result = response.json()
+        if result.get("candidates") and result["candidates"][0].get("content"):
+            return result["candidates"][0]["content"]["parts"][0].get("text", "")
+        return None
+
+    def _handle_openai_compatible(self, prompt: str, source_files: Dict[str, str], chat_id: Optional[int] = None, system_prompt: Optional[str] = None, max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS, on_stream_update: Optional[Callable[[str], None]] = None) -> Optional[Dict[str, Any]]:
         """Handle OpenAI-compatible API endpoints.
         
         Reads configuration from:
         - get_user_config("llm_api_url") / AYE_LLM_API_URL
         - get_user_config("llm_api_key") / AYE_LLM_API_KEY  
         - get_user_config("llm_model") / AYE_LLM_MODEL (default: gpt-3.5-turbo)
+
+        When on_stream_update is given, the response is requested as an SSE
+        stream and the callback receives each text delta as it arrives.
         """
         api_url = get_user_config("llm_api_url")
         api_key = get_user_config("llm_api_key")
@@ -90,71 +248,78 @@ class LocalModelPlugin(Plugin):
             return None
         
         conv_id = get_conversation_id(chat_id)
-        if conv_id not in self.chat_history:
-            self.chat_history[conv_id] = []
+        use_conversation(self.chat_history, conv_id)
         
         user_message = build_user_message(prompt, source_files)
-        history_message = build_history_message(prompt, source_files)
         effective_system_prompt = system_prompt if system_prompt else SYSTEM_PROMPT
-        messages = [{"role": "system", "content": effective_system_prompt}] + self.chat_history[conv_id] + [{"role": "user", "content": user_message}]
-        headers = {"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"}
+        messages = [
+            system_message(effective_system_prompt),
+            *self.chat_history[conv_id],
+            {"role": "user", "content": user_message},
+        ]
+        headers = bearer_json_headers(api_key)
         payload = {"model": model_name, "messages": messages, "temperature": 0.7, "max_tokens": max_output_tokens, "response_format": {"type": "json_object"}}
         
         try:
-            with httpx.Client(timeout=LLM_TIMEOUT) as client:
-                response = client.post(api_url, json=payload, headers=headers)
-                response.raise_for_status()
-                result = response.json()
-                if result.get("choices") and result["choices"][0].get("message"):
-                    generated_text = result["choices"][0]["message"]["content"]
-                    self.chat_history[conv_id].append({"role": "user", "content": history_message})
-                    self.chat_history[conv_id].append({"role": "assistant", "content": generated_text})
-                    self._save_history()
-                    return parse_llm_response(generated_text, self.debug)
-                return create_error_response("Failed to get a valid response from the OpenAI-compatible API", self.verbose)
+            generated_text = self._generate(
+                (api_url, payload),
+                lambda: self._fetch_openai_compatible(api_url, payload, headers, on_stream_update),
+                on_stream_update,
+            )
+            if generated_text is not None:
+                new_messages = [
+                    {"role": "user", "content": prompt},
+                    {"role": "assistant", "content": generated_text},
+                ]
+                self.chat_history[conv_id].extend(new_messages)
+                self._append_history(conv_id, new_messages)
+                return parse_llm_response(generated_text, self.debug)
+            return create_error_response("Failed to get a valid response from the OpenAI-compatible API", self.verbose)
         except httpx.HTTPStatusError as e:
             error_msg = f"OpenAI API error: {e.response.status_code}"
             try:
                 error_detail = e.response.json()
                 if "error" in error_detail:
                     error_msg += f" - {error_detail['error'].get('message', str(error_detail['error']))}"
-            except: error_msg += f" - {e.response.text[:200]}"
+            except (ValueError, AttributeError, TypeError):
+                # Body is not JSON (ValueError covers JSONDecodeError) or has an unexpected shape.
+                error_msg += f" - {e.response.text[:200]}"
             return create_error_response(error_msg, self.verbose)
         except Exception as e:
             return create_error_response(f"Error calling OpenAI-compatible API: {str(e)}", self.verbose)
 
-    def _handle_gemini_pro_25(self, prompt: str, source_files: Dict[str, str], chat_id: Optional[int] = None, system_prompt: Optional[str] = None, max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS) -> Optional[Dict[str, Any]]:
+    def _handle_gemini_pro_25(self, prompt: str, source_files: Dict[str, str], chat_id: Optional[int] = None, system_prompt: Optional[str] = None, max_output_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS, on_stream_update: Optional[Callable[[str], None]] = None) -> Optional[Dict[str, Any]]:
         api_key = os.environ.get("GEMINI_API_KEY")
         if not api_key:
             return None
 
         conv_id = get_conversation_id(chat_id)
-        if conv_id not in self.chat_history:
-            self.chat_history[conv_id] = []
+        use_conversation(self.chat_history, conv_id)
 
         user_message = build_user_message(prompt, source_files)
-        history_message = build_history_message(prompt, source_files)
-        url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-pro:generateContent"
-        headers = {"Content-Type": "application/json", "x-goog-api-key": api_key}
+        headers = _gemini_headers(api_key)
         
-        contents = [{"role": "user" if msg["role"] == "user" else "model", "parts": [{"text": msg["content"]}]} for msg in self.chat_history[conv_id]]
+        contents = [{"role": GEMINI_ROLES.get(msg["role"], "model"), "parts": [{"text": msg["content"]}]} for msg in self.chat_history[conv_id]]
         contents.append({"role": "user", "parts": [{"text": user_message}]})
         
         effective_system_prompt = system_prompt if system_prompt else SYSTEM_PROMPT
         payload = {"contents": contents, "systemInstruction": {"parts": [{"text": effective_system_prompt}]}, "generationConfig": {"temperature": 0.7, "topK": 40, "topP": 0.95, "maxOutputTokens": max_output_tokens, "responseMimeType": "application/json"}}
 
         try:
-            with httpx.Client(timeout=LLM_TIMEOUT) as client:
-                response = client.post(url, json=payload, headers=headers)
-                response.raise_for_status()
-                result = response.json()
-                if result.get("candidates") and result["candidates"][0].get("content"):
-                    generated_text = result["candidates"][0]["content"]["parts"][0].get("text", "")
-                    self.chat_history[conv_id].append({"role": "user", "content": history_message})
-                    self.chat_history[conv_id].append({"role": "assistant", "content": generated_text})
-                    self._save_history()
-                    return parse_llm_response(generated_text, self.debug)
-                return create_error_response("Failed to get a valid response from Gemini API", self.verbose)
+            generated_text = self._generate(
+                (GEMINI_BASE_URL, payload),
+                lambda: self._fetch_gemini(payload, headers, on_stream_update),
+                on_stream_update,
+            )
+            if generated_text is not None:
+                new_messages = [
+                    {"role": "user", "content": prompt},
+                    {"role": "assistant", "content": generated_text},
+                ]
+                self.chat_history[conv_id].extend(new_messages)
+                self._append_history(conv_id, new_messages)
+                return parse_llm_response(generated_text, self.debug)
+            return create_error_response("Failed to get a valid response from Gemini API", self.verbose)
         except httpx.HTTPStatusError as e:
             return create_error_response(f"Gemini API error: {e.response.status_code} - {e.response.text}", self.verbose)
         except Exception as e:
@@ -168,7 +333,7 @@ class LocalModelPlugin(Plugin):
             
             root = params.get("root")
             history_file = self._get_history_file_path(root)
-            history_file.unlink(missing_ok=True)
+            delete_history(history_file)
             self.chat_history = {}
             if self.verbose:
                 rprint("[yellow]Local model chat history cleared.[/]")
@@ -182,15 +347,16 @@ class LocalModelPlugin(Plugin):
             root = params.get("root")
             system_prompt = params.get("system_prompt")
             max_output_tokens = params.get("max_output_tokens", DEFAULT_MAX_OUTPUT_TOKENS)
+            on_stream_update = params.get("on_stream_update")
 
             self.history_file = self._get_history_file_path(root)
             self._load_history()
 
-            result = self._handle_openai_compatible(prompt, source_files, chat_id, system_prompt, max_output_tokens)
+            result = self._handle_openai_compatible(prompt, source_files, chat_id, system_prompt, max_output_tokens, on_stream_update)
             if result is not None: return result
 
             if model_id == "google/gemini-2.5-pro":
-                return self._handle_gemini_pro_25(prompt, source_files, chat_id, system_prompt, max_output_tokens)
+                return self._handle_gemini_pro_25(prompt, source_files, chat_id, system_prompt, max_output_tokens, on_stream_update)
             
             return None
 
@@ -1,11 +1,23 @@
 """Shared utilities for model plugins."""
-import json
-from typing import Dict, Any, Optional
+import atexit
+import gzip
+import hashlib
+import os
+import random
+import time
+import weakref
+import zlib
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 from pathlib import Path
 
+import httpx
+import orjson
 from rich import print as rprint
 
 from aye.controller.util import is_truncated_json
+from aye.model.auth import get_user_config
 
 
 # Message shown when LLM response is truncated due to output token limits
@@ -20,6 +32,19 @@ TRUNCATED_RESPONSE_MESSAGE = (
     "  `with src/main.py: add logging to this file`"
 )
 
+# Pooled HTTP client used by the model plugins for their API calls
+LLM_TIMEOUT = 600.0
+LLM_HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+
+# Transient HTTP failures (timeouts, rate limits, gateway errors) are retried
+# with exponential backoff plus jitter, honoring Retry-After when present.
+RETRY_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+MAX_HTTP_ATTEMPTS = 5
+RETRY_MAX_DELAY = 30.0
+
+# On-disk cache of raw LLM responses, enabled with llm_cache=on (AYE_LLM_CACHE)
+LLM_CACHE_DIR = Path.home() / ".aye" / "llm_cache"
+
 
 def get_conversation_id(chat_id: Optional[int] = None) -> str:
     """Get conversation ID for history tracking."""
@@ -27,17 +52,200 @@ def get_conversation_id(chat_id: Optional[int] = None) -> str:
 
 
 def build_user_message(prompt: str, source_files: Dict[str, str]) -> str:
-    """Build the full user message with source files appended (for the current API call)."""
-    user_message = prompt
-    if source_files:
-        user_message += "\n\n--- Source files are below. ---\n"
-        for file_name, content in source_files.items():
-            user_message += f"\n** {file_name} **\n```\n{content}\n```\n"
-    return user_message
+    """Build the full user message with source files appended (for the current API call).
+
+    History stores only the bare prompt. Requests are laid out as
+    [system prompt] + [history] + [current user message with files], so keeping
+    the volatile file contents out of history means each turn's request starts
+    with the byte-identical prefix of the previous one, which is what provider
+    prompt caches key on.
+    """
+    if not source_files:
+        return prompt
+    # Join once instead of repeated += so large file dumps are copied a single time.
+    parts = [prompt, "\n\n--- Source files are below. ---\n"]
+    parts.extend(
+        f"\n** {file_name} **\n```\n{content}\n```\n" for file_name, content in source_files.items()
+    )
+    return "".join(parts)
+
 
+@lru_cache(maxsize=8)
+def bearer_json_headers(api_key: str) -> Mapping[str, str]:
+    """Return the JSON + bearer-auth request headers for api_key.
+
+    Built once per key and shared across requests; the mapping is read-only
+    so no caller can alter it for the others.
+    """
+    return MappingProxyType({"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"})
+
+
+def serialize_message(message: Dict[str, Any]) -> bytes:
+    """Serialize a single chat message to compact JSON bytes.
+
+    Used to cache the encoded form of history messages so that each request
+    body only has to encode the messages that are new since the last turn.
+    """
+    return orjson.dumps(message)
 
-def build_history_message(prompt: str, source_files: Dict[str, str]) -> str:
-    return prompt
+
+@lru_cache(maxsize=8)
+def system_message(system_prompt: str) -> Dict[str, str]:
+    """Return the system message dict for a prompt, built once per distinct prompt.
+
+    The returned dict is shared between requests and must not be mutated.
+    """
+    return {"role": "system", "content": system_prompt}
+
+
+@lru_cache(maxsize=8)
+def serialize_system_message(system_prompt: str) -> bytes:
+    """Serialize the system message once per distinct prompt.
+
+    The system prompt is the same large string on nearly every request, so
+    its encoded form is reused instead of being re-encoded each turn.
+    """
+    return serialize_message(system_message(system_prompt))
+
+
+def build_request_body(settings: Dict[str, Any], message_fragments: Iterable[bytes]) -> bytes:
+    """Build a chat-completions JSON body from settings and pre-serialized messages.
+
+    Args:
+        settings: Top-level payload fields other than ``messages`` (model, max_tokens, ...)
+        message_fragments: Messages already encoded with ``serialize_message``
+
+    Returns:
+        UTF-8 JSON body suitable for ``httpx`` ``content=``
+    """
+    head = orjson.dumps(settings)
+    sep = b"," if len(head) > 2 else b""
+    return b"".join((head[:-1], sep, b'"messages":[', b",".join(message_fragments), b"]}"))
+
+
+def iter_sse_json(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Yield the JSON payloads of ``data:`` lines from a server-sent event stream.
+
+    Blank lines, comments, non-data fields, the ``[DONE]`` sentinel and
+    undecodable payloads are skipped.
+    """
+    for line in lines:
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if not data or data == "[DONE]":
+            continue
+        try:
+            event = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            continue
+        if isinstance(event, dict):
+            yield event
+
+
+def _retry_delay(attempt: int, retry_after: Optional[str]) -> float:
+    """Seconds to wait before retry number attempt + 1."""
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), RETRY_MAX_DELAY)
+        except ValueError:
+            pass  # HTTP-date form; fall back to backoff
+    return min(2 ** attempt, RETRY_MAX_DELAY) + random.uniform(0, 1)
+
+
+# Pooled clients that are still open; closed at interpreter exit.
+_open_http_clients: "weakref.WeakSet[httpx.Client]" = weakref.WeakSet()
+
+
+def _close_http_clients() -> None:
+    """Close every pooled HTTP client still open (registered with atexit)."""
+    for client in list(_open_http_clients):
+        try:
+            client.close()
+        except Exception:
+            pass
+    _open_http_clients.clear()
+
+
+atexit.register(_close_http_clients)
+
+
+class PooledClientMixin:
+    """One keep-alive httpx.Client per plugin, created on first use.
+
+    Reusing the client across turns lets follow-up requests skip the
+    TCP/TLS handshake. Clients still open when the interpreter exits are
+    closed then.
+    """
+
+    _client: Optional[httpx.Client] = None
+
+    def _get_client(self) -> httpx.Client:
+        """Return the shared keep-alive HTTP client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.Client(timeout=LLM_TIMEOUT, limits=LLM_HTTP_LIMITS)
+            _open_http_clients.add(self._client)
+        return self._client
+
+    def close(self) -> None:
+        """Close the pooled HTTP client, if one was created."""
+        if self._client is not None:
+            _open_http_clients.discard(self._client)
+            self._client.close()
+            self._client = None
+
+
+def send_with_retry(send: Callable[[], httpx.Response]) -> httpx.Response:
+    """Call send() again while it returns a transient error status.
+
+    Args:
+        send: Issues the request and returns the response (streamed or not)
+
+    Returns:
+        The first non-transient response, or the last one once attempts run out.
+        Callers still call ``raise_for_status()`` on it.
+    """
+    for attempt in range(MAX_HTTP_ATTEMPTS - 1):
+        response = send()
+        if response.status_code not in RETRY_STATUS_CODES:
+            return response
+        response.close()
+        time.sleep(_retry_delay(attempt, response.headers.get("retry-after")))
+    return send()
+
+
+def is_llm_cache_enabled() -> bool:
+    """Check whether the exact-match LLM response cache is turned on."""
+    return str(get_user_config("llm_cache", "off")).lower() in ("on", "1", "true")
+
+
+def llm_cache_key(*parts: Any) -> str:
+    """Hash request parts (endpoint, payload, ...) into a response cache key."""
+    return hashlib.blake2b(orjson.dumps(parts), digest_size=32).hexdigest()
+
+
+def _llm_cache_path(key: str) -> Path:
+    return LLM_CACHE_DIR / key[:2] / f"{key}.json"
+
+
+def read_llm_cache(key: str) -> Optional[str]:
+    """Return the cached response text for key, or None on a miss."""
+    try:
+        return _llm_cache_path(key).read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def write_llm_cache(key: str, generated_text: str) -> None:
+    """Store response text under key. Failures are ignored; the cache is best-effort."""
+    path = _llm_cache_path(key)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(generated_text, encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
 
 
 def create_error_response(error_msg: str, verbose: bool = False) -> Dict[str, Any]:
@@ -50,19 +258,26 @@ def create_error_response(error_msg: str, verbose: bool = False) -> Dict[str, An
     }
 
 
-def parse_llm_response(generated_text: str, debug: bool = False, check_truncation: bool = False) -> Dict[str, Any]:
+def parse_llm_response(
+    generated_text: Union[str, bytes, bytearray, Dict[str, Any]], debug: bool = False, check_truncation: bool = False
+) -> Dict[str, Any]:
     """Parse LLM response text and convert to expected format.
     
     Args:
-        generated_text: Raw response text from LLM
+        generated_text: Raw response text from LLM (str, or UTF-8 bytes which are
+            parsed without decoding first), or an already-decoded JSON object
         debug: Enable debug printing
         check_truncation: If True, check for truncated JSON and return truncation message
     """
+    if isinstance(generated_text, dict):
+        return _convert_llm_response(generated_text, debug)
+
     try:
-        llm_response = json.loads(generated_text)
-    except json.JSONDecodeError as e:
+        llm_response = orjson.loads(generated_text)
+    except orjson.JSONDecodeError as e:
         if debug:
             print(f"JSON decode error: {e}")
+        generated_text = _as_text(generated_text)
         
         if check_truncation and is_truncated_json(generated_text):
             if debug:
@@ -82,10 +297,22 @@ def parse_llm_response(generated_text: str, debug: bool = False, check_truncatio
     # treat it as plain text.
     if not isinstance(llm_response, dict):
         return {
-            "summary": generated_text,
+            "summary": _as_text(generated_text),
             "updated_files": []
         }
-    
+
+    return _convert_llm_response(llm_response, debug)
+
+
+def _as_text(generated_text: Union[str, bytes, bytearray]) -> str:
+    """Decode bytes-like response text for use as a plain-text summary."""
+    if isinstance(generated_text, (bytes, bytearray)):
+        return generated_text.decode("utf-8", "replace")
+    return generated_text
+
+
+def _convert_llm_response(llm_response: Dict[str, Any], debug: bool = False) -> Dict[str, Any]:
+    """Convert a decoded LLM JSON object to the summary/updated_files format."""
     # Some models wrap response in "properties"
     props = llm_response.get("properties")
     if not props:
@@ -94,7 +321,9 @@ def parse_llm_response(generated_text: str, debug: bool = False, check_truncatio
     result = {
         "summary": props.get("answer_summary", ""),
         "updated_files": [
-            {
+            # Entries that already have exactly the expected keys are freshly
+            # decoded and owned by us, so they are reused as-is.
+            f if len(f) == 2 and "file_name" in f and "file_content" in f else {
                 "file_name": f.get("file_name"),
                 "file_content": f.get("file_content")
             }
@@ -109,11 +338,237 @@ def parse_llm_response(generated_text: str, debug: bool = False, check_truncatio
     return result
 
 
+# Conversations whose estimated size exceeds this many tokens (configurable
+# via max_history_tokens / AYE_MAX_HISTORY_TOKENS) are compacted: the most
+# recent messages are kept and everything older collapses into one summary.
+MAX_HISTORY_TOKENS = 24000
+HISTORY_KEEP_MESSAGES = 8
+HISTORY_SUMMARY_PREFIX = "[Earlier conversation compacted]"
+HISTORY_SUMMARY_MAX_LINES = 30
+HISTORY_SUMMARY_LINE_CHARS = 160
+
+# History is gzip-compressed; level 1 is nearly free and the embedded source
+# dumps still shrink several times over.
+HISTORY_COMPRESSLEVEL = 1
+# Each append adds a gzip member; once a file holds this many, the next load
+# rewrites it as a single member (better compression, faster reads).
+HISTORY_REWRITE_MEMBERS = 50
+# Pre-JSONL history ({"conversations": {...}} as JSON), imported once into the
+# gzip-compressed file that replaces it.
+LEGACY_HISTORY_FILENAME = "chat_history.json"
+# Conversations kept per history file; beyond this the least recently used
+# are dropped from memory, and from disk on the next load.
+HISTORY_MAX_CONVERSATIONS = 16
+
+
+def use_conversation(chat_history: Dict[str, list], conv_id: str) -> list:
+    """Return a conversation's messages, marking it as the most recently used.
+
+    chat_history is kept in least- to most-recently-used order; starting a
+    new conversation when HISTORY_MAX_CONVERSATIONS are held drops the oldest.
+    """
+    messages = chat_history.pop(conv_id, None)
+    if messages is None:
+        messages = []
+        while len(chat_history) >= HISTORY_MAX_CONVERSATIONS:
+            del chat_history[next(iter(chat_history))]
+    chat_history[conv_id] = messages
+    return messages
+
+
+def history_stamp(history_file: Optional[Path]) -> Optional[Tuple[str, int, int]]:
+    """Return an identity stamp (path, mtime, size) for the history file, if present.
+
+    Plugins compare stamps to skip reloading a history file they already hold.
+    """
+    if not history_file:
+        return None
+    try:
+        st = os.stat(history_file)
+    except OSError:
+        return None
+    return (str(history_file), st.st_mtime_ns, st.st_size)
+
+
+def _history_record(conv_id: str, message: Dict[str, Any]) -> bytes:
+    """Encode one history message as a JSONL record tagged with its conversation."""
+    return orjson.dumps({"conv_id": conv_id, **message}) + b"\n"
+
+
+def get_history_token_limit() -> int:
+    """Return the configured history size limit in (estimated) tokens."""
+    try:
+        return int(get_user_config("max_history_tokens", MAX_HISTORY_TOKENS))
+    except (TypeError, ValueError):
+        return MAX_HISTORY_TOKENS
+
+
+def estimate_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Roughly estimate the token count of messages (about 4 characters per token)."""
+    return sum(len(m.get("content") or "") for m in messages) // 4
+
+
+def compact_history(
+    history: List[Dict[str, Any]],
+    max_tokens: int,
+    keep_messages: int = HISTORY_KEEP_MESSAGES,
+) -> Optional[List[Dict[str, Any]]]:
+    """Shrink a conversation that has outgrown max_tokens.
+
+    At most the last ``keep_messages`` messages are kept, starting with an
+    assistant turn, and older tail messages are dropped until the tail itself
+    fits in max_tokens (the newest assistant turn is always kept). The
+    dropped messages are replaced by a single user message listing the
+    earlier requests, so roles still alternate.
+
+    Returns:
+        The compacted message list, or None if no compaction is needed or
+        it would not drop anything
+    """
+    if len(history) <= keep_messages or estimate_tokens(history) <= max_tokens:
+        return None
+
+    assistant_turns = [
+        i for i in range(len(history) - keep_messages, len(history))
+        if history[i].get("role") == "assistant"
+    ]
+    if not assistant_turns:
+        return None
+    # Assistant turns embed whole files, so a few of them can outgrow the
+    # budget on their own; start the tail at the oldest turn that still fits.
+    start = assistant_turns[-1]
+    tail_tokens = estimate_tokens(history[start:])
+    for i in reversed(assistant_turns[:-1]):
+        tail_tokens += estimate_tokens(history[i:start])
+        if tail_tokens > max_tokens:
+            break
+        start = i
+
+    already_compacted = (history[0].get("content") or "").startswith(HISTORY_SUMMARY_PREFIX)
+    if start == 0 or (start == 1 and already_compacted):
+        # Nothing older than the tail to summarize; compacting again would
+        # only rewrite the history file without shrinking it.
+        return None
+
+    lines: List[str] = []
+    for message in history[:start]:
+        if message.get("role") != "user":
+            continue
+        content = (message.get("content") or "").strip()
+        if content.startswith(HISTORY_SUMMARY_PREFIX):
+            # Carry forward what an earlier compaction already summarized.
+            lines.extend(content.splitlines()[1:])
+        elif content:
+            lines.append(f"- {content.splitlines()[0][:HISTORY_SUMMARY_LINE_CHARS]}")
+
+    summary = "\n".join(
+        [f"{HISTORY_SUMMARY_PREFIX} Requests made earlier in this conversation, oldest first:"]
+        + lines[-HISTORY_SUMMARY_MAX_LINES:]
+    )
+    return [{"role": "user", "content": summary}, *history[start:]]
+
+
+def _read_file(path: Path) -> bytes:
+    """Read a whole file with a single unbuffered read sized by fstat."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size + 1)
+        if len(data) > size:
+            # The file grew since fstat; pick up the rest.
+            chunks = [data]
+            while chunk := os.read(fd, 1 << 16):
+                chunks.append(chunk)
+            data = b"".join(chunks)
+        return data
+    finally:
+        os.close(fd)
+
+
+def _write_file(path: Path, data: bytes) -> None:
+    """Write a whole file with unbuffered writes and flush it to disk.
+
+    The fsync makes a following os.replace safe: the renamed file can never
+    be observed without its contents after a crash.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _gunzip_members(raw: bytes) -> Tuple[bytes, bool, int]:
+    """Decompress concatenated gzip members, stopping at the first unreadable one.
+
+    Every append adds a gzip member, so a crash mid-append leaves a truncated
+    trailing member. Unlike ``gzip.decompress`` this keeps the members before it.
+
+    Returns:
+        Tuple of (decompressed bytes, whether all of raw was readable, member count)
+    """
+    chunks = []
+    while raw:
+        decomp = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        try:
+            chunk = decomp.decompress(raw)
+        except zlib.error:
+            return b"".join(chunks), False, len(chunks)
+        if not decomp.eof:
+            return b"".join(chunks), False, len(chunks)
+        chunks.append(chunk)
+        raw = decomp.unused_data
+    return b"".join(chunks), True, len(chunks)
+
+
+def _import_legacy_history(history_file: Path, verbose: bool = False, log_prefix: str = "") -> Dict[str, list]:
+    """Convert a legacy chat_history.json next to history_file, then delete it.
+
+    Returns the imported conversations ({} when there is no legacy file).
+    """
+    legacy_file = history_file.with_name(LEGACY_HISTORY_FILENAME)
+    try:
+        data = orjson.loads(_read_file(legacy_file))
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        if verbose:
+            rprint(f"[yellow]Could not import{' ' + log_prefix if log_prefix else ''} legacy chat history: {e}[/]")
+        return {}
+
+    conversations = data.get("conversations") if isinstance(data, dict) else None
+    if not isinstance(conversations, dict):
+        conversations = {}
+    conversations = {
+        conv_id: messages for conv_id, messages in conversations.items() if isinstance(messages, list)
+    }
+    # The legacy file kept conversations in insertion order; keep the newest.
+    conversations = dict(list(conversations.items())[-HISTORY_MAX_CONVERSATIONS:])
+
+    if save_history(history_file, conversations, verbose, log_prefix):
+        legacy_file.unlink(missing_ok=True)
+    return conversations
+
+
+def delete_history(history_file: Path) -> None:
+    """Delete a history file, along with any legacy chat_history.json beside it."""
+    history_file.unlink(missing_ok=True)
+    history_file.with_name(LEGACY_HISTORY_FILENAME).unlink(missing_ok=True)
+
+
 def load_history(history_file: Optional[Path], verbose: bool = False, log_prefix: str = "") -> Dict[str, list]:
     """Load chat history from disk.
-    
+
+    History is stored as gzip-compressed JSON Lines, one message per line
+    tagged with its ``conv_id``. Unreadable data (e.g. a write torn by a
+    crash) is skipped, and the file is then rewritten without it. When the
+    file does not exist yet, a legacy chat_history.json is imported instead.
+
     Args:
-        history_file: Path to history JSON file
+        history_file: Path to gzip-compressed history JSONL file
         verbose: Enable verbose logging
         log_prefix: Prefix for log messages (e.g., "offline model")
     
@@ -125,35 +580,179 @@ def load_history(history_file: Optional[Path], verbose: bool = False, log_prefix
             rprint(f"[yellow]History file path not set{' for ' + log_prefix if log_prefix else ''}. Skipping load.[/]")
         return {}
 
-    if history_file.exists():
+    try:
+        raw = _read_file(history_file)
+    except FileNotFoundError:
+        return _import_legacy_history(history_file, verbose, log_prefix)
+    except Exception as e:
+        if verbose:
+            rprint(f"[yellow]Could not load{' ' + log_prefix if log_prefix else ''} chat history: {e}[/]")
+        return {}
+
+    data, intact, members = _gunzip_members(raw)
+    conversations: Dict[str, list] = {}
+    last_seen: Dict[str, int] = {}
+    skipped = 0 if intact else 1
+    for i, line in enumerate(data.splitlines()):
+        if not line.strip():
+            continue
         try:
-            data = json.loads(history_file.read_text(encoding="utf-8"))
-            return data.get("conversations", {})
-        except Exception as e:
-            if verbose:
-                rprint(f"[yellow]Could not load{' ' + log_prefix if log_prefix else ''} chat history: {e}[/]")
-            return {}
-    return {}
+            record = orjson.loads(line)
+            conv_id = record.pop("conv_id")
+        except (orjson.JSONDecodeError, AttributeError, KeyError, TypeError):
+            skipped += 1
+            continue
+        conversations.setdefault(conv_id, []).append(record)
+        last_seen[conv_id] = i
 
+    # Order conversations by last use (see use_conversation), keeping only
+    # the most recent ones.
+    recent = sorted(last_seen, key=last_seen.__getitem__)[-HISTORY_MAX_CONVERSATIONS:]
+    dropped = len(conversations) - len(recent)
+    conversations = {conv_id: conversations[conv_id] for conv_id in recent}
+
+    if skipped and verbose:
+        rprint(
+            f"[yellow]Could not load{' ' + log_prefix if log_prefix else ''} chat history: "
+            f"skipped {skipped} unreadable record(s)[/]"
+        )
+
+    # Rewrite the log when it has become fragmented, holds dropped
+    # conversations, or has unreadable data: appends made after a torn record
+    # would otherwise be unreachable.
+    if skipped or dropped or members > HISTORY_REWRITE_MEMBERS:
+        save_history(history_file, conversations, verbose, log_prefix)
+    return conversations
+
+
+def append_history(
+    history_file: Optional[Path],
+    conv_id: str,
+    messages: List[Dict[str, Any]],
+    verbose: bool = False,
+    log_prefix: str = "",
+) -> bool:
+    """Append new messages of one conversation to the history file.
+
+    Only the new records are written, so the cost per turn does not grow
+    with the length of the stored history.
+
+    Args:
+        history_file: Path to gzip-compressed history JSONL file
+        conv_id: Conversation the messages belong to
+        messages: Messages to append, in order
+        verbose: Enable verbose logging
+        log_prefix: Prefix for log messages (e.g., "offline model")
+
+    Returns:
+        True if the messages were written, False otherwise
+    """
+    if not history_file:
+        if verbose:
+            rprint(f"[yellow]History file path not set{' for ' + log_prefix if log_prefix else ''}. Skipping save.[/]")
+        return False
+
+    try:
+        history_file.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(history_file, "ab", compresslevel=HISTORY_COMPRESSLEVEL) as f:
+            f.write(b"".join(_history_record(conv_id, m) for m in messages))
+    except Exception as e:
+        if verbose:
+            rprint(f"[yellow]Could not save{' ' + log_prefix if log_prefix else ''} chat history: {e}[/]")
+        return False
+    return True
+
+
+def save_history(history_file: Optional[Path], chat_history: Dict[str, list], verbose: bool = False, log_prefix: str = "") -> bool:
+    """Rewrite the whole chat history file (compaction).
+
+    Per-turn updates should go through append_history; this is for when the
+    in-memory history no longer matches what has been appended.
 
-def save_history(history_file: Optional[Path], chat_history: Dict[str, list], verbose: bool = False, log_prefix: str = "") -> None:
-    """Save chat history to disk.
-    
     Args:
-        history_file: Path to history JSON file
+        history_file: Path to gzip-compressed history JSONL file
         chat_history: Dictionary of conversations to save
         verbose: Enable verbose logging
         log_prefix: Prefix for log messages (e.g., "offline model")
+
+    Returns:
+        True if the file was rewritten, False otherwise
     """
     if not history_file:
         if verbose:
             rprint(f"[yellow]History file path not set{' for ' + log_prefix if log_prefix else ''}. Skipping save.[/]")
-        return
+        return False
 
+    # Write to a sibling temp file and rename over the original so a crash
+    # mid-write leaves the previous history intact.
+    tmp_path = history_file.with_name(f"{history_file.name}.{os.getpid()}.tmp")
     try:
         history_file.parent.mkdir(parents=True, exist_ok=True)
-        data = {"conversations": chat_history}
-        history_file.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        data = b"".join(
+            _history_record(conv_id, m)
+            for conv_id, messages in chat_history.items()
+            for m in messages
+        )
+        _write_file(tmp_path, gzip.compress(data, compresslevel=HISTORY_COMPRESSLEVEL))
+        os.replace(tmp_path, history_file)
     except Exception as e:
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
         if verbose:
             rprint(f"[yellow]Could not save{' ' + log_prefix if log_prefix else ''} chat history: {e}[/]")
+        return False
+    return True
+
+
+class ChatHistoryMixin:
+    """chat_history persistence for model plugins, backed by history_file.
+
+    The history file's stamp as of our last load/save is remembered, so a
+    reload is skipped while the file is unchanged and chat_history has not
+    been replaced in the meantime. Plugins set history_label for log messages.
+    """
+
+    history_label = ""
+    chat_history: Dict[str, list]
+    history_file: Optional[Path]
+    _history_stamp: Optional[Tuple[str, int, int]] = None
+    _stamped_history: Optional[Dict[str, list]] = None
+
+    def _load_history(self) -> None:
+        """Load chat history from disk, unless it is already in sync."""
+        stamp = history_stamp(self.history_file)
+        if (
+            stamp is not None
+            and stamp == self._history_stamp
+            and self.chat_history is self._stamped_history
+        ):
+            return
+        self.chat_history = load_history(self.history_file, self.verbose, self.history_label)
+        self._history_stamp = stamp
+        self._stamped_history = self.chat_history
+
+    def _mark_history_synced(self) -> None:
+        """Record that the history file now matches chat_history."""
+        self._history_stamp = history_stamp(self.history_file)
+        self._stamped_history = self.chat_history
+
+    def _save_history(self) -> None:
+        """Save chat history to disk."""
+        if save_history(self.history_file, self.chat_history, self.verbose, self.history_label):
+            self._mark_history_synced()
+        else:
+            self._history_stamp = None
+
+    def _append_history(self, conv_id: str, messages: List[Dict[str, Any]]) -> None:
+        """Persist messages just added to a conversation, compacting it once it grows too large."""
+        compacted = compact_history(self.chat_history.get(conv_id, []), get_history_token_limit())
+        if compacted is not None:
+            self.chat_history[conv_id] = compacted
+            self._save_history()
+            return
+        if append_history(self.history_file, conv_id, messages, self.verbose, self.history_label):
+            self._mark_history_synced()
+        else:
+            self._history_stamp = None
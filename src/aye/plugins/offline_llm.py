@@ -1,23 +1,22 @@
+import gc
 import os
-import json
 import threading
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 from rich import print as rprint
-from rich.console import Console
-from rich.spinner import Spinner
 
 from .plugin_base import Plugin
 from .model_plugin_utils import (
     TRUNCATED_RESPONSE_MESSAGE,
+    ChatHistoryMixin,
     get_conversation_id,
     build_user_message,
-    build_history_message,
     create_error_response,
     parse_llm_response,
-    load_history,
-    save_history,
+    delete_history,
+    system_message,
+    use_conversation,
 )
 from aye.model.config import SYSTEM_PROMPT
 from aye.model.offline_llm_manager import (
@@ -28,14 +27,33 @@ from aye.model.offline_llm_manager import (
     is_offline_model
 )
 
+# Prompt tokens evaluated per llama.cpp batch during prefill
+LLAMA_N_BATCH = 512
+
+# Memory budget for llama.cpp's in-RAM prompt (KV state) cache
+PROMPT_CACHE_BYTES = 1 << 30
+
+# GBNF grammar for the response schema in SYSTEM_PROMPT. Constraining decode to
+# this exact shape is cheaper per token than llama.cpp's generic JSON grammar
+# and the output always has the fields parse_llm_response expects. Whitespace is
+# bounded as in llama.cpp's json.gbnf so decoding cannot run away on it.
+RESPONSE_GRAMMAR = r'''
+root   ::= "{" ws "\"answer_summary\"" ws ":" ws string ws "," ws "\"source_files\"" ws ":" ws files ws "}" ws
+files  ::= "[" ws ( file ( ws "," ws file )* )? ws "]"
+file   ::= "{" ws "\"file_name\"" ws ":" ws string ws "," ws "\"file_content\"" ws ":" ws string ws "}"
+string ::= "\"" ( [^"\\\x7F\x00-\x1F] | "\\" ( ["\\/bfnrt] | "u" [0-9a-fA-F] [0-9a-fA-F] [0-9a-fA-F] [0-9a-fA-F] ) )* "\""
+ws     ::= | " " | "\n" [ \t]{0,20}
+'''
+
 # History file name for this plugin
-HISTORY_FILENAME = "chat_history.json"
+HISTORY_FILENAME = "chat_history.jsonl.gz"
 
 
-class OfflineLLMPlugin(Plugin):
+class OfflineLLMPlugin(ChatHistoryMixin, Plugin):
     name = "offline_llm"
     version = "1.0.1"  # Version bump for new_chat fix
     premium = "free"
+    history_label = "offline model"
 
     def __init__(self):
         super().__init__()
@@ -44,6 +62,10 @@ class OfflineLLMPlugin(Plugin):
         self._llm_instance = None
         self._current_model_id = None
         self._model_lock = threading.Lock()
+        # Result of the llama_cpp import probe; installing it needs a restart anyway
+        self._has_llama_cpp: Optional[bool] = None
+        # Compiled RESPONSE_GRAMMAR; model-independent, so built once
+        self._grammar = None
 
     def init(self, cfg: Dict[str, Any]) -> None:
         """Initialize the offline LLM plugin."""
@@ -59,13 +81,30 @@ class OfflineLLMPlugin(Plugin):
 
     def _check_dependencies(self) -> bool:
         """Check if required dependencies are available."""
-        try:
-            import llama_cpp
-            return True
-        except ImportError:
+        if self._has_llama_cpp is None:
+            try:
+                import llama_cpp
+                self._has_llama_cpp = True
+            except ImportError:
+                self._has_llama_cpp = False
+        if not self._has_llama_cpp:
             rprint("[yellow]llama-cpp-python not available for offline inference.[/]")
             rprint("[yellow]Install it with `pip install llama-cpp-python`, restart and try again.[/]")
-            return False
+        return self._has_llama_cpp
+
+    def _unload_model(self) -> None:
+        """Release the loaded model before another one is mapped in.
+
+        Llama.close() frees the native context and model right away; the
+        collect pass clears any cycles still holding the wrapper so its GGUF
+        mapping is dropped before the next model's weights are loaded.
+        """
+        close = getattr(self._llm_instance, "close", None)
+        self._llm_instance = None
+        self._current_model_id = None
+        if close is not None:
+            close()
+        gc.collect()
 
     def _load_model(self, model_id: str) -> bool:
         """Load a model into memory for inference. Returns True on success, False on failure."""
@@ -76,9 +115,7 @@ class OfflineLLMPlugin(Plugin):
                 
             # Unload previous model
             if self._llm_instance is not None:
-                del self._llm_instance
-                self._llm_instance = None
-                self._current_model_id = None
+                self._unload_model()
 
             if not self._check_dependencies():
                 return False
@@ -90,20 +127,40 @@ class OfflineLLMPlugin(Plugin):
                 return False
 
             try:
-                from llama_cpp import Llama
+                import llama_cpp
                 
-                model_config = get_model_config(model_id)
-                context_length = model_config.get("context_length", 16384) if model_config else 16384
+                model_config = get_model_config(model_id) or {}
+                context_length = model_config.get("context_length", 16384)
+
+                # Models ship pre-quantized (Q4_K_M GGUF). On Metal/CUDA/Vulkan builds,
+                # push every layer and the KV cache to the accelerator and use flash
+                # attention; CPU-only builds keep the defaults.
+                supports_gpu = getattr(llama_cpp, "llama_supports_gpu_offload", lambda: False)()
                 
                 if self.verbose:
                     rprint(f"[cyan]Loading {model_id} into memory...[/]")
                 
-                self._llm_instance = Llama(
+                self._llm_instance = llama_cpp.Llama(
                     model_path=str(model_path),
                     n_ctx=context_length,
                     n_threads=None,  # Auto-detect
+                    n_batch=LLAMA_N_BATCH,
+                    n_gpu_layers=model_config.get("n_gpu_layers", -1) if supports_gpu else 0,
+                    offload_kqv=supports_gpu,
+                    flash_attn=supports_gpu,
+                    use_mmap=True,
                     verbose=False
                 )
+
+                # Keep KV state for recent prompts so a turn that extends an
+                # earlier one (same system prompt + history) only prefills the new tokens.
+                cache_cls = getattr(llama_cpp, "LlamaRAMCache", None)
+                if cache_cls is not None:
+                    self._llm_instance.set_cache(cache_cls(capacity_bytes=PROMPT_CACHE_BYTES))
+
+                grammar_cls = getattr(llama_cpp, "LlamaGrammar", None)
+                if self._grammar is None and grammar_cls is not None:
+                    self._grammar = grammar_cls.from_string(RESPONSE_GRAMMAR, verbose=False)
                 
                 self._current_model_id = model_id
                 
@@ -117,14 +174,6 @@ class OfflineLLMPlugin(Plugin):
                     rprint(f"[red]Failed to load model {model_id}: {e}[/]")
                 return False
 
-    def _load_history(self) -> None:
-        """Load chat history from disk."""
-        self.chat_history = load_history(self.history_file, self.verbose, "offline model")
-
-    def _save_history(self) -> None:
-        """Save chat history to disk."""
-        save_history(self.history_file, self.chat_history, self.verbose, "offline model")
-
     def _generate_response(self, model_id: str, prompt: str, source_files: Dict[str, str], chat_id: Optional[int] = None, system_prompt: Optional[str] = None, max_output_tokens: int = 4096) -> Optional[Dict[str, Any]]:
         """Generate a response using the offline model."""
         if not self._load_model(model_id):
@@ -134,48 +183,57 @@ class OfflineLLMPlugin(Plugin):
             return create_error_response(f"Model instance for '{model_id}' not available after load attempt.", self.verbose)
 
         conv_id = get_conversation_id(chat_id)
-        if conv_id not in self.chat_history:
-            self.chat_history[conv_id] = []
+        use_conversation(self.chat_history, conv_id)
 
         user_message = build_user_message(prompt, source_files)
-        history_message = build_history_message(prompt, source_files)
+        # The debug property re-reads the user config; look it up once per turn
+        debug = self.debug
         
         # Build conversation history
         effective_system_prompt = system_prompt if system_prompt else SYSTEM_PROMPT
-        messages = [{"role": "system", "content": effective_system_prompt}]
-        messages.extend(self.chat_history[conv_id])
-        messages.append({"role": "user", "content": user_message})
+        messages = [
+            system_message(effective_system_prompt),
+            *self.chat_history[conv_id],
+            {"role": "user", "content": user_message},
+        ]
         
         # Format for llama.cpp chat completion
         try:
-            if self.debug:
+            if debug:
                 print(messages)
+            if self._grammar is not None:
+                constraint = {"grammar": self._grammar}
+            else:
+                constraint = {"response_format": {"type": "json_object"}}
             response = self._llm_instance.create_chat_completion(
                 messages=messages,
                 temperature=0.7,
                 max_tokens=max_output_tokens,
-                response_format={"type": "json_object"}
+                **constraint
             )
 
-            if self.debug:
+            if debug:
                 print(response)
                 print("----------------")
             
             if response and "choices" in response and response["choices"]:
                 generated_text = response["choices"][0]["message"]["content"]
                 
-                if self.debug:
+                if debug:
                     print(generated_text)
                     print("----------------")
 
-                # Update chat history with lightweight message
-                self.chat_history[conv_id].append({"role": "user", "content": history_message})
-                self.chat_history[conv_id].append({"role": "assistant", "content": generated_text})
-                self._save_history()
+                # Update chat history with the prompt only (no file contents)
+                new_messages = [
+                    {"role": "user", "content": prompt},
+                    {"role": "assistant", "content": generated_text},
+                ]
+                self.chat_history[conv_id].extend(new_messages)
+                self._append_history(conv_id, new_messages)
                 
-                res = parse_llm_response(generated_text, self.debug, check_truncation=True)
+                res = parse_llm_response(generated_text, debug, check_truncation=True)
 
-                if self.debug:
+                if debug:
                     print("----- parse_llm_response -------")
                     print(res)
                     print("----------------")
@@ -189,8 +247,9 @@ class OfflineLLMPlugin(Plugin):
 
     def on_command(self, command_name: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Handle commands for the offline LLM plugin."""
+        debug = self.debug
 
-        if self.debug:
+        if debug:
             print("[DEBUG] offline_llm on_command entering...")
         
         if command_name == "download_offline_model":
@@ -215,7 +274,7 @@ class OfflineLLMPlugin(Plugin):
             # (even if no offline model is currently selected, we clean up any existing history)
             root = params.get("root")
             history_file = self._get_history_file_path(root)
-            history_file.unlink(missing_ok=True)
+            delete_history(history_file)
             self.chat_history = {}
             if self.verbose: 
                 rprint("[yellow]Offline model chat history cleared.[/]")
@@ -244,7 +303,7 @@ class OfflineLLMPlugin(Plugin):
             self._load_history()
 
             res = self._generate_response(model_id, prompt, source_files, chat_id, system_prompt, max_output_tokens)
-            if self.debug:
+            if debug:
                 print("[DEBUG] -------- end of offline_llm -------")
                 print(res)
             return res
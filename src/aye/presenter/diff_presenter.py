@@ -1,5 +1,3 @@
-import subprocess
-import re
 import difflib
 from pathlib import Path
 from typing import Union, Iterator, Any
@@ -10,7 +8,8 @@ from rich.theme import Theme
 from rich.style import Style
 from rich.table import Table
 from rich.text import Text
-from pygments.lexers import get_lexer_for_filename
+from pygments.lexer import Lexer
+from pygments.lexers import get_lexer_by_name, get_lexer_for_filename
 from pygments.util import ClassNotFound
 
 # Exposed at module level so unit tests can patch:
@@ -63,6 +62,13 @@ STYLE_REMOVED = Style(bgcolor=RED)
 STYLE_ADD_SIGN = Style(color="#a8cc8c", bold=True)
 STYLE_DEL_SIGN = Style(color="#f08080", bold=True)
 
+# Syntax theme shared by every rendered line; resolving it by name per line
+# would rebuild the Pygments style each time.
+SYNTAX_THEME = Syntax.get_theme("monokai")
+
+# Lexer options matching what Rich's Syntax uses when it resolves a lexer itself.
+_LEXER_OPTIONS = {"stripnl": False, "ensurenl": True, "tabsize": 4}
+
 
 def _is_git_ref_backend(backend: Any) -> bool:
     """Return True if backend is (or mocks) GitRefBackend.
@@ -83,7 +89,15 @@ def _is_git_ref_backend(backend: Any) -> bool:
         return False
 
 
-def _print_line(prefix: str, code: str, style: Style, lexer_name: str) -> None:
+def _diff_lexer(file_path: str) -> Lexer:
+    """Return the Pygments lexer for a file name, falling back to plain text."""
+    try:
+        return get_lexer_for_filename(file_path, **_LEXER_OPTIONS)
+    except (ClassNotFound, Exception):
+        return get_lexer_by_name("text", **_LEXER_OPTIONS)
+
+
+def _print_line(prefix: str, code: str, style: Style, lexer: Lexer) -> None:
     """Print a single unified-diff *content* line using a prefix + code layout.
 
     Unified diff content lines look like:
@@ -94,7 +108,8 @@ def _print_line(prefix: str, code: str, style: Style, lexer_name: str) -> None:
     Implementation details:
     - We use a 2-column `Table.grid` so the diff prefix stays aligned and visible
       even when the code wraps.
-    - Syntax highlighting is provided by Rich `Syntax` using the given lexer.
+    - Syntax highlighting is provided by Rich `Syntax` using the given lexer,
+      which is resolved once per diff rather than by name on every line.
 
     Important:
     - We fix the prefix column width and disable table edge padding so every line
@@ -122,8 +137,8 @@ def _print_line(prefix: str, code: str, style: Style, lexer_name: str) -> None:
 
     syntax = Syntax(
         code,
-        lexer_name,
-        theme="monokai",
+        lexer,
+        theme=SYNTAX_THEME,
         background_color=bgcolor,
         word_wrap=True,
         code_width=None,
@@ -141,6 +156,11 @@ def _print_line(prefix: str, code: str, style: Style, lexer_name: str) -> None:
     _diff_console.print(grid, style=style)
 
 
+def _print_no_differences() -> None:
+    """Report that the compared contents are identical."""
+    _diff_console.print("No differences found.", style="diff.warning")
+
+
 def _print_diff_with_syntax(
     diff_lines: Iterator[str],
     file_path: str = ""
@@ -151,11 +171,7 @@ def _print_diff_with_syntax(
     has_diff = False
 
     # Best-effort lexer inference based on filename.
-    try:
-        lexer = get_lexer_for_filename(file_path)
-        lexer_name = lexer.aliases[0]
-    except (ClassNotFound, Exception):
-        lexer_name = "text"
+    lexer = _diff_lexer(file_path)
 
     for line in diff_lines:
         has_diff = True
@@ -172,12 +188,12 @@ def _print_diff_with_syntax(
         # Added lines (content additions).
         elif line.startswith("+"):
             code = line_content[1:]
-            _print_line("+ ", code, STYLE_ADDED, lexer_name)
+            _print_line("+ ", code, STYLE_ADDED, lexer)
 
         # Removed lines (content deletions).
         elif line.startswith("-"):
             code = line_content[1:]
-            _print_line("- ", code, STYLE_REMOVED, lexer_name)
+            _print_line("- ", code, STYLE_REMOVED, lexer)
 
         # Hunk header lines (range metadata for a block of changes).
         elif line.startswith("@@"):
@@ -187,27 +203,42 @@ def _print_diff_with_syntax(
         # leading space.
         elif line.startswith(" "):
             code = line_content[1:]
-            _print_line("  ", code, Style(), lexer_name)
+            _print_line("  ", code, Style(), lexer)
 
         # Fallback for any unexpected lines.
         else:
-            _print_line("  ", line_content, Style(), lexer_name)
+            _print_line("  ", line_content, Style(), lexer)
 
     if not has_diff:
-        _diff_console.print("No differences found.", style="diff.warning")
+        _print_no_differences()
+
+
+def _read_text(path: Path) -> str:
+    """Read a file for diffing; a missing file reads as empty.
+
+    Opening directly (instead of exists() + read) saves a stat per file. Text
+    mode is kept so CRLF files still compare equal to their LF snapshots.
+    """
+    try:
+        return path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return ""
 
 
 def _python_diff_files(file1: Path, file2: Path) -> None:
     """Show diff between two files using Python's difflib."""
     try:
         # Read file contents.
-        content1 = file1.read_text(encoding="utf-8").splitlines(keepends=True) if file1.exists() else []
-        content2 = file2.read_text(encoding="utf-8").splitlines(keepends=True) if file2.exists() else []
+        content1 = _read_text(file1)
+        content2 = _read_text(file2)
+        if content1 == content2:
+            _print_no_differences()
+            return
 
         # Generate unified diff.
         diff = difflib.unified_diff(
-            content2,  # from file (snapshot)
-            content1,  # to file (current)
+            content2.splitlines(keepends=True),  # from file (snapshot)
+            content1.splitlines(keepends=True),  # to file (current)
             fromfile=str(file2),
             tofile=str(file1),
         )
@@ -222,6 +253,12 @@ def _python_diff_files(file1: Path, file2: Path) -> None:
 def _python_diff_content(content1: str, content2: str, label1: str, label2: str) -> None:
     """Show diff between two in-memory strings using Python's difflib."""
     try:
+        # Unchanged content (the common "diff against snapshot" case) needs
+        # no splitting or matching at all.
+        if content1 == content2:
+            _print_no_differences()
+            return
+
         lines1 = content1.splitlines(keepends=True)
         lines2 = content2.splitlines(keepends=True)
 
@@ -298,13 +335,12 @@ def show_diff(file1: Union[Path, str], file2: Union[Path, str], is_stash_ref: bo
                 return
 
             # Read current file content from disk.
-            current_file = Path(file1)
-            if not current_file.exists():
+            try:
+                current_content = Path(file1).read_text(encoding="utf-8")
+            except FileNotFoundError:
                 _diff_console.print(f"Error: Current file {file1} does not exist", style="diff.error")
                 return
 
-            current_content = current_file.read_text(encoding="utf-8")
-
             # Diff the contents.
             _python_diff_content(
                 current_content,
@@ -323,20 +359,3 @@ def show_diff(file1: Union[Path, str], file2: Union[Path, str], is_stash_ref: bo
     file1_path = Path(file1) if not isinstance(file1, Path) else file1
     file2_path = Path(file2) if not isinstance(file2, Path) else file2
     _python_diff_files(file1_path, file2_path)
-
-#    try:
-#        result = subprocess.run(
-#            ["diff", "--color=always", "-u", str(file2_path), str(file1_path)],
-#            capture_output=True,
-#            text=True,
-#        )
-#        if result.stdout.strip():
-#            clean_output = ANSI_RE.sub("", result.stdout)
-#            _diff_console.print(clean_output)
-#        else:
-#            _diff_console.print("No differences found.")
-#    except FileNotFoundError:
-#        # Fallback to Python's difflib if system diff is not available
-#        _python_diff_files(file1_path, file2_path)
-#    except Exception as e:
-#        _diff_console.print(f"Error running diff: {e}", style="diff.error")
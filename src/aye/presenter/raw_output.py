@@ -18,6 +18,7 @@ See: printraw.md for the full design plan.
 from typing import Optional
 
 from rich import print as rprint
+from rich.text import Text
 
 
 # Short, stable, ASCII delimiters \u2014 easy to search in scrollback.
@@ -25,6 +26,8 @@ _RAW_BEGIN = "--- RAW BEGIN ---"
 _RAW_END = "--- RAW END ---"
 
 _NO_RESPONSE_MSG = "No assistant response available yet."
+# Pre-styled so printing it skips Rich's markup parser.
+_NO_RESPONSE_TEXT = Text(_NO_RESPONSE_MSG, style="yellow")
 
 
 def print_assistant_response_raw(text: Optional[str]) -> None:
@@ -45,8 +48,8 @@ def print_assistant_response_raw(text: Optional[str]) -> None:
               whitespace-only strings are treated as \"no response\".
     """
     # Treat None or whitespace-only as \"no response available\"
-    if not text or not text.strip():
-        rprint(f"[yellow]{_NO_RESPONSE_MSG}[/]")
+    if not text or text.isspace():
+        rprint(_NO_RESPONSE_TEXT)
         return
 
     # Plain print() \u2014 intentionally avoiding Rich so markup leaks are impossible.
@@ -18,6 +18,7 @@ Design notes:
   output (headers, lists, code fences) and have it display cleanly.
 """
 
+from functools import lru_cache
 from typing import Optional
 
 from rich import box
@@ -64,6 +65,16 @@ deep_ocean_theme = Theme({
 # Shared console used by the REPL.
 console = Console(force_terminal=True, theme=deep_ocean_theme)
 
+# Static pieces of the assistant response block; only the Markdown body
+# changes from one response to the next.
+_RESPONSE_PULSE = "[ui.response_symbol.waves](([/] [ui.response_symbol.pulse]\u25cf[/] [ui.response_symbol.waves]))[/]"
+_RESPONSE_PANEL_OPTIONS = {
+    "border_style": "ui.border",
+    "box": box.ROUNDED,
+    "padding": (0, 1),
+    "expand": True,
+}
+
 
 # ---------------------------------------------------------------------------
 # Last assistant response capture
@@ -88,6 +99,56 @@ def get_last_assistant_response() -> Optional[str]:
     return _last_assistant_response
 
 
+# (command, description) rows of the help message; section headers have no
+# description and ("", "") rows are blank lines.
+_HELP_COMMANDS = (
+    ("Snapshot & Undo", ""),
+    (r"  restore, undo \[id] \[file]", "Revert changes to the last state, a specific snapshot `id`, or for a single `file`."),
+    ("  history", "Show snapshot history"),
+    (r"  diff <file> \[snapshot_id]", "Show diff of file with the latest snapshot, or a specified snapshot"),
+    ("  keep [N]", "Keep only N most recent snapshots (10 by default)"),
+    ("", ""),
+
+    ("Prompt Context & Augmentation", ""),
+    ("  @filename", "Include a file in your prompt inline (e.g., \"explain @main.py\"). Supports wildcards (e.g., @*.py, @src/*.js)."),
+    (r"  shellcap \[none|fail|all]", "Shell output capture: 'none' (default), 'fail' (failing commands), or 'all' (all commands)"),
+    # skills: multi-line
+    ("  skills", "Apply repo-local skills by file name (no '.md') from the nearest (non-ignored) `skills/` directory found by walking upward. "),
+    ("", "Explicit forms: `skill:foo`, `skill foo`, `foo skill`, `skills:foo,bar` (order preserved, duplicates deduped). "),
+    ("", "If you mention 'skill'/'skills' without `skill:`/`skills:`, Aye may fuzzy-match phrases like `using <X> skill`."),
+    ("", "See https://github.com/acrotron/aye-chat/tree/main/skills for examples."),
+    # end of skills
+    ("", ""),
+
+    ("Session & Model", ""),
+    ("  new", "Start a new chat session (if you want to change the subject)"),
+    ("  model", "Select a different model. Selection will persist between sessions."),
+    ("  llm", "Configure OpenAI-compatible LLM endpoint (URL, key, model). Use 'llm clear' to reset."),
+    ("", ""),
+
+    ("Display & Preferences", ""),
+    (r"  verbose \[on|off]", "Toggle verbose mode to increase or decrease chattiness (on/off, persists between sessions)"),
+    (r"  autodiff \[on|off]", "Toggle automatic diff display after LLM file updates (off by default, persists between sessions)"),
+    (r"  completion \[readline|multi]", "Switch auto-completion style (readline or multi, persists between sessions)"),
+    ("", ""),
+
+    ("Utilities", ""),
+    ("  raw / printraw", "Reprint last assistant response as plain text (copy-friendly)"),
+    ("  !command", "Force shell execution (e.g., \"!echo hello\")."),
+    ("", ""),
+
+    ("Exit & Help", ""),
+    ("  exit, quit, Ctrl+D", "Exit the chat session"),
+    ("  help", "Show this help message"),
+)
+
+# The rows above rendered as one markup string, so a help call is a single print.
+_HELP_TEXT = "\n".join(
+    f"  [ui.help.command]{cmd:<28}[/]\t{'-' if cmd and desc else ' '} [ui.help.text]{desc}[/]"
+    for cmd, desc in _HELP_COMMANDS
+)
+
+
 def print_welcome_message():
     """Display the welcome message for the Aye Chat REPL."""
     console.print("Aye Chat \u2013 type `help` for available commands, `exit` or Ctrl+D to quit", style="ui.welcome")
@@ -98,51 +159,7 @@ def print_help_message():
     console.print("Available chat commands:", style="ui.help.header")
     console.print()
 
-    commands = [
-        ("Snapshot & Undo", ""),
-        (r"  restore, undo \[id] \[file]", "Revert changes to the last state, a specific snapshot `id`, or for a single `file`."),
-        ("  history", "Show snapshot history"),
-        (r"  diff <file> \[snapshot_id]", "Show diff of file with the latest snapshot, or a specified snapshot"),
-        ("  keep [N]", "Keep only N most recent snapshots (10 by default)"),
-        ("", ""),
-
-        ("Prompt Context & Augmentation", ""),
-        ("  @filename", "Include a file in your prompt inline (e.g., \"explain @main.py\"). Supports wildcards (e.g., @*.py, @src/*.js)."),
-        (r"  shellcap \[none|fail|all]", "Shell output capture: 'none' (default), 'fail' (failing commands), or 'all' (all commands)"),
-        # skills: multi-line
-        ("  skills", "Apply repo-local skills by file name (no '.md') from the nearest (non-ignored) `skills/` directory found by walking upward. "),
-        ("", "Explicit forms: `skill:foo`, `skill foo`, `foo skill`, `skills:foo,bar` (order preserved, duplicates deduped). "),
-        ("", "If you mention 'skill'/'skills' without `skill:`/`skills:`, Aye may fuzzy-match phrases like `using <X> skill`."),
-        ("", "See https://github.com/acrotron/aye-chat/tree/main/skills for examples."),
-        # end of skills
-        ("", ""),
-
-        ("Session & Model", ""),
-        ("  new", "Start a new chat session (if you want to change the subject)"),
-        ("  model", "Select a different model. Selection will persist between sessions."),
-        ("  llm", "Configure OpenAI-compatible LLM endpoint (URL, key, model). Use 'llm clear' to reset."),
-        ("", ""),
-
-        ("Display & Preferences", ""),
-        (r"  verbose \[on|off]", "Toggle verbose mode to increase or decrease chattiness (on/off, persists between sessions)"),
-        (r"  autodiff \[on|off]", "Toggle automatic diff display after LLM file updates (off by default, persists between sessions)"),
-        (r"  completion \[readline|multi]", "Switch auto-completion style (readline or multi, persists between sessions)"),
-        ("", ""),
-
-        ("Utilities", ""),
-        ("  raw / printraw", "Reprint last assistant response as plain text (copy-friendly)"),
-        ("  !command", "Force shell execution (e.g., \"!echo hello\")."),
-        ("", ""),
-
-        ("Exit & Help", ""),
-        ("  exit, quit, Ctrl+D", "Exit the chat session"),
-        ("  help", "Show this help message"),
-    ]
-
-    for cmd, desc in commands:
-        #console.print(f"  [ui.help.command]{cmd:<28}[/]\t- [ui.help.text]{desc}[/]")
-        sep = '-' if cmd and desc else ' '
-        console.print(f"  [ui.help.command]{cmd:<28}[/]\t{sep} [ui.help.text]{desc}[/]")
+    console.print(_HELP_TEXT)
 
     console.print("")
     console.print("By default, relevant files are found using code lookup to provide context for your prompt.", style="ui.warning")
@@ -153,48 +170,58 @@ def print_prompt():
     return "(\u30c4\u00bb "
 
 
+def _response_grid() -> Table:
+    """Return an empty pulse | body grid for one assistant response.
+
+    Rich tables keep their rows once rendered, so each response needs a new one.
+    """
+    grid = Table.grid(padding=(0, 1))
+    grid.add_column()
+    grid.add_column()
+    return grid
+
+
+@lru_cache(maxsize=8)
+def _markdown(summary: str) -> Markdown:
+    """Parse a response once; re-displaying it reuses the parsed document.
+
+    Rendering a Rich Markdown does not modify its parsed tokens, so the same
+    instance can be printed any number of times.
+    """
+    return Markdown(summary)
+
+
 def print_assistant_response(summary: str):
     """Render the assistant's response as Markdown inside a styled panel."""
     set_last_assistant_response(summary)
 
-    console.print()
-
-    pulse = "[ui.response_symbol.waves](([/] [ui.response_symbol.pulse]\u25cf[/] [ui.response_symbol.waves]))[/]"
+    grid = _response_grid()
+    grid.add_row(_RESPONSE_PULSE, _markdown(summary))
 
-    grid = Table.grid(padding=(0, 1))
-    grid.add_column()
-    grid.add_column()
+    resonse_with_layout = Panel(grid, **_RESPONSE_PANEL_OPTIONS)
 
-    grid.add_row(pulse, Markdown(summary))
+    # Buffer the block so it reaches the terminal in one write and flush.
+    with console:
+        console.print()
+        console.print()
+        console.print(resonse_with_layout)
+        console.print()
 
-    resonse_with_layout = Panel(
-        grid,
-        border_style="ui.border",
-        box=box.ROUNDED,
-        padding=(0, 1),
-        expand=True,
-    )
 
-    console.print()
-    console.print(resonse_with_layout)
-    console.print()
+def _status_console(console_arg: Console) -> Console:
+    """Return console_arg if it carries a theme, else the shared REPL console."""
+    return console_arg if getattr(console_arg, "theme", None) else console
 
 
 def print_no_files_changed(console_arg: Console):
     """Display message when no files were changed."""
-    if not getattr(console_arg, "theme", None):
-        console.print(Padding("[ui.warning]No files were changed.[/]", (0, 4, 0, 4)))
-    else:
-        console_arg.print(Padding("[ui.warning]No files were changed.[/]", (0, 4, 0, 4)))
+    _status_console(console_arg).print(Padding("[ui.warning]No files were changed.[/]", (0, 4, 0, 4)))
 
 
 def print_files_updated(console_arg: Console, file_names: list):
     """Display message about updated files."""
     text = f"[ui.success]Files updated:[/] [ui.help.text]{','.join(file_names)}[/]"
-    if not getattr(console_arg, "theme", None):
-        console.print(Padding(text, (0, 4, 0, 4)))
-    else:
-        console_arg.print(Padding(text, (0, 4, 0, 4)))
+    _status_console(console_arg).print(Padding(text, (0, 4, 0, 4)))
 
 
 def print_error(exc: Exception):
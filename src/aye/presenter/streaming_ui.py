@@ -10,6 +10,8 @@ Streaming Markdown rendering uses a "stable prefix + tail" approach:
 - The unstable tail is rendered as plain Text
 - This avoids incomplete Markdown constructs (especially unclosed
   code fences) from breaking the entire display
+- The stable prefix is parsed block by block and cached, so each refresh
+  only parses blocks that have not been seen before
 
 Tailing (viewport follow):
 - When streaming content exceeds the terminal height, only the last
@@ -19,20 +21,25 @@ Tailing (viewport follow):
   so the user can scroll back through the entire answer.
 - Controlled via the AYE_STREAM_TAIL env var (default: on).
 """
-from aye.presenter.repl_ui import deep_ocean_theme
-
+from aye.presenter.repl_ui import (
+    _RESPONSE_PANEL_OPTIONS,
+    _RESPONSE_PULSE,
+    _response_grid,
+    deep_ocean_theme,
+)
+
+import bisect
 import os
 import re
+import signal
 import time
 import threading
-from typing import Optional, Callable, Tuple
+from typing import Dict, Iterator, List, Optional, Callable, Tuple
 
-from rich import box
 from rich.console import Console, Group
 from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
-from rich.table import Table
 from rich.text import Text
 from rich.theme import Theme
 
@@ -40,13 +47,40 @@ from rich.theme import Theme
 # Instead of manually trying to make the theme consistent I just directly used the theme from repl_ui.py
 _STREAMING_THEME = deep_ocean_theme
 
-# Regex to detect fenced code block markers (3+ backticks or tildes, optional leading whitespace)
-_FENCE_RE = re.compile(r"^\s*(`{3,}|~{3,})", re.MULTILINE)
+# Decorative "sonar pulse" marker, parsed from markup once instead of on every refresh
+_PULSE = Text.from_markup(_RESPONSE_PULSE)
+
+# Regex to detect fenced code block markers (3+ backticks or tildes, optional leading whitespace).
+# Leading whitespace must not span lines, so a match always starts on the fence line itself.
+_FENCE_RE = re.compile(r"^[ \t]*(`{3,}|~{3,})", re.MULTILINE)
+
+# One or more blank lines followed by an unindented line: a candidate block boundary
+_BLOCK_BREAK_RE = re.compile(r"(?:\A|\n)(?:[ \t\r]*\n)+(?=[^ \t\n])")
+
+# A line starting a list item; a list may continue across blank lines
+_LIST_ITEM_RE = re.compile(r"[ \t]{0,3}(?:[-+*]|\d{1,9}[.)])(?:[ \t]|$)", re.MULTILINE)
+
+# Link reference definitions and raw HTML blocks: both can affect text in
+# other blocks (references resolve document-wide, HTML comments span blank
+# lines), so a document containing them is never parsed block by block.
+_DOCUMENT_WIDE_RE = re.compile(r"^[ ]{0,3}(?:\[[^\]\n]+\]:|<)", re.MULTILINE)
+
+# Animation tokens: a single line break, a run of spaces/tabs, or a word
+_TOKEN_RE = re.compile(r"[\n\r]|[ \t]+|[^ \t\n\r]+")
+
+# Bounds for Live's redraw rate, which follows AYE_STREAM_RENDER_INTERVAL
+_LIVE_MIN_REFRESH_PER_SECOND = 4
+_LIVE_MAX_REFRESH_PER_SECOND = 30
 
 # Truncation indicator shown at the top of tailed content
 _TRUNCATION_INDICATOR_TEXT = "  \u2191 \u00b7\u00b7\u00b7 (streaming)"
 _TRUNCATION_STYLE = "dim italic"
 
+# Indicator renderables shared by every refresh.  Rich does not modify a Text
+# while rendering it; code that extends a Text must append *to* its own copy.
+_TRUNCATION_TEXT = Text(_TRUNCATION_INDICATOR_TEXT, style=_TRUNCATION_STYLE)
+_STALL_TEXT = Text("\n\u22ef waiting for more", style="ui.stall_spinner")
+
 
 def _get_env_float(env_var: str, default: float) -> float:
     """Get a float value from environment variable with fallback default."""
@@ -66,6 +100,17 @@ def _get_env_bool(env_var: str, default: bool) -> bool:
     return default
 
 
+def _iter_fence_positions(text: str, start: int = 0, end: Optional[int] = None) -> Iterator[int]:
+    """Yield the offset of every fence line (``` or ~~~) in ``text[start:end]``.
+
+    *start* must be a line start.  All fence scanning goes through here; a
+    single regex pass is faster than walking the lines in Python, even for
+    the few lines of a streaming delta.
+    """
+    for match in _FENCE_RE.finditer(text, start, len(text) if end is None else end):
+        yield match.start()
+
+
 def _split_streaming_markdown(text: str) -> Tuple[str, str]:
     """Split streaming text into a stable Markdown prefix and an unstable tail.
 
@@ -91,15 +136,20 @@ def _split_streaming_markdown(text: str) -> Tuple[str, str]:
     inside_fence = False
     last_open_fence_pos = 0
 
-    for match in _FENCE_RE.finditer(text):
+    for fence_pos in _iter_fence_positions(text):
         if not inside_fence:
             # Opening a fence
             inside_fence = True
-            last_open_fence_pos = match.start()
+            last_open_fence_pos = fence_pos
         else:
             # Closing a fence
             inside_fence = False
 
+    return _split_at_boundary(text, inside_fence, last_open_fence_pos)
+
+
+def _split_at_boundary(text: str, inside_fence: bool, last_open_fence_pos: int) -> Tuple[str, str]:
+    """Apply steps 2-4 of :func:`_split_streaming_markdown` given the fence state."""
     if inside_fence:
         # We are inside an unclosed fence \ cut right before it
         prefix = text[:last_open_fence_pos]
@@ -123,79 +173,118 @@ def _split_streaming_markdown(text: str) -> Tuple[str, str]:
     return ("", text)
 
 
-def _tail_content(content: str, width: int, max_lines: int) -> Tuple[str, bool]:
-    """Tail content to fit within *max_lines* when wrapped at *width*.
+def _has_document_wide_markup(text: str) -> bool:
+    """Return True if *text* has reference definitions or HTML outside fences."""
+    fences = None
+    for match in _DOCUMENT_WIDE_RE.finditer(text):
+        if fences is None:
+            fences = list(_iter_fence_positions(text))
+        # An even number of fence lines before the match means it is outside.
+        if bisect.bisect_left(fences, match.start()) % 2 == 0:
+            return True
+    return False
 
-    Estimates the number of terminal rows each raw line would occupy
-    after wrapping and keeps only the last lines that fit.
 
-    Args:
-        content: The raw streaming content.
-        width: Available inner width in terminal columns.
-        max_lines: Maximum number of wrapped terminal lines to keep.
+def _split_markdown_blocks(text: str) -> List[str]:
+    """Split stable Markdown text into top-level blocks.
 
-    Returns:
-        ``(tailed_content, is_truncated)`` where *is_truncated* is True
-        when content was shortened.
+    Blocks are separated by blank lines outside fenced code blocks.  A blank
+    line followed by an indented line (list continuation, indented code)
+    or by a list item (the list may continue) does not start a new block.
+    Every block keeps its trailing newlines, so ``"".join(blocks) == text``.
+    """
+    fences = list(_iter_fence_positions(text))
+    n_fences = len(fences)
+    fence_index = 0
+
+    blocks = []
+    block_start = 0
+    for match in _BLOCK_BREAK_RE.finditer(text):
+        cut = match.end()
+        # An odd number of fence lines before the cut means it is inside a fence.
+        while fence_index < n_fences and fences[fence_index] < cut:
+            fence_index += 1
+        if fence_index % 2 == 0 and cut > block_start and not _LIST_ITEM_RE.match(text, cut):
+            blocks.append(text[block_start:cut])
+            block_start = cut
+
+    if block_start < len(text):
+        blocks.append(text[block_start:])
+    return blocks
+
+
+class _BlockCache:
+    """Parsed Markdown for the completed blocks of a streaming response.
+
+    Once a block is followed by another one it no longer changes, so it is
+    parsed once and its tokens are reused on every later refresh.  The
+    tokens of consecutive blocks are joined into a single ``Markdown``
+    renderable, which keeps Rich's spacing between blocks intact.  Text
+    whose blocks do not parse independently is parsed as a whole.
     """
-    if not content or max_lines <= 0 or width <= 0:
-        return (content, False)
-
-    raw_lines = content.split("\n")
 
-    # Estimate the wrapped-line count for each raw line.
-    def _wrapped_height(line: str) -> int:
-        if not line:
-            return 1  # empty line still occupies one terminal row
-        return max(1, -(-len(line) // width))  # ceiling division
+    def __init__(self, max_blocks: int = 256):
+        self._blocks: Dict[str, Markdown] = {}
+        self._max_blocks = max_blocks
 
-    line_heights = [_wrapped_height(line) for line in raw_lines]
-    total_height = sum(line_heights)
+    def get(self, block: str) -> Markdown:
+        """Return the parsed Markdown for a single block."""
+        markdown = self._blocks.get(block)
+        if markdown is None:
+            if len(self._blocks) >= self._max_blocks:
+                del self._blocks[next(iter(self._blocks))]
+            markdown = self._blocks[block] = Markdown(block)
+        return markdown
 
-    if total_height <= max_lines:
-        return (content, False)
+    def render(self, text: str) -> Markdown:
+        """Return a Markdown renderable for *text* built from cached blocks."""
+        if _has_document_wide_markup(text):
+            return Markdown(text)
 
-    # Accumulate from the end until we fill the budget.
-    accumulated = 0
-    start_index = len(raw_lines)
-    for i in range(len(raw_lines) - 1, -1, -1):
-        if accumulated + line_heights[i] > max_lines:
-            break
-        accumulated += line_heights[i]
-        start_index = i
+        blocks = _split_markdown_blocks(text)
+        if len(blocks) == 1:
+            return self.get(blocks[0])
 
-    # Ensure at least the last raw line is included.
-    if start_index >= len(raw_lines):
-        start_index = len(raw_lines) - 1
+        markdown = Markdown("")
+        markdown.parsed = [token for block in blocks for token in self.get(block).parsed]
+        return markdown
 
-    tailed = "\n".join(raw_lines[start_index:])
-    return (tailed, True)
+    def clear(self) -> None:
+        self._blocks.clear()
 
 
 def _render_streaming_markdown(
     content: str,
     show_stall_indicator: bool = False,
     is_truncated: bool = False,
+    block_cache: Optional[_BlockCache] = None,
+    split: Optional[Tuple[str, str]] = None,
 ):
     """Build a composite renderable for streaming: Markdown prefix + Text tail.
 
     Uses rich.console.Group to vertically stack the parts.  When
     *is_truncated* is True a dimmed indicator is prepended so the user
-    knows earlier content has scrolled out of view.
+    knows earlier content has scrolled out of view.  When *block_cache*
+    is given, the prefix is assembled from cached per-block parses instead
+    of being parsed from scratch.  *split* is a precomputed
+    ``(prefix, tail)`` pair for *content*; when omitted it is computed here.
 
     Returns:
         A Rich renderable (Group) containing the formatted parts.
     """
-    prefix, tail = _split_streaming_markdown(content)
+    if split is None:
+        # Without a line break there is no block boundary or fence to honour.
+        split = _split_streaming_markdown(content) if "\n" in content else ("", content)
+    prefix, tail = split
 
     parts = []
 
     # Truncation indicator (shown when tailing has kicked in)
     if is_truncated:
-        parts.append(Text(_TRUNCATION_INDICATOR_TEXT, style=_TRUNCATION_STYLE))
+        parts.append(_TRUNCATION_TEXT)
 
     if prefix:
-        parts.append(Markdown(prefix))
+        parts.append(block_cache.render(prefix) if block_cache is not None else Markdown(prefix))
 
     if tail:
         parts.append(Text(tail))
@@ -205,7 +294,7 @@ def _render_streaming_markdown(
         parts.append(Text(content))
 
     if show_stall_indicator:
-        parts.append(Text("\n\u22ef waiting for more", style="ui.stall_spinner"))
+        parts.append(_STALL_TEXT)
 
     # If there's only one part and no stall, return it directly (avoid Group overhead)
     if len(parts) == 1:
@@ -220,6 +309,7 @@ def _create_response_panel(
     show_stall_indicator: bool = False,
     streaming: bool = False,
     is_truncated: bool = False,
+    prerendered=None,
 ) -> Panel:
     """Create a styled response panel matching the final response display.
 
@@ -232,16 +322,15 @@ def _create_response_panel(
                    instead of rendering the entire content as Markdown.
         is_truncated: If True, show a truncation indicator at the top of
                       the content (only relevant when *streaming* is True).
+        prerendered: Renderable to show instead of building one from
+                     *content*; the other flags must already be applied.
     """
-    # Decorative "sonar pulse" marker
-    pulse = "[ui.response_symbol.waves](([/] [ui.response_symbol.pulse]\u25cf[/] [ui.response_symbol.waves]))[/]"
-
     # A 2-column grid: marker + content
-    grid = Table.grid(padding=(0, 1))
-    grid.add_column()
-    grid.add_column()
+    grid = _response_grid()
 
-    if use_markdown and streaming and content:
+    if prerendered is not None:
+        rendered_content = prerendered
+    elif use_markdown and streaming and content:
         # Streaming markdown: composite renderable handles stall indicator internally
         rendered_content = _render_streaming_markdown(
             content,
@@ -254,23 +343,17 @@ def _create_response_panel(
         if show_stall_indicator:
             rendered_content = Group(
                 rendered_content,
-                Text("\n\u22ef waiting for more", style="ui.stall_spinner"),
+                _STALL_TEXT,
             )
     else:
         rendered_content = Text(content) if content else Text("")
         if show_stall_indicator:
-            rendered_content.append("\n\u22ef waiting for more", style="ui.stall_spinner")
+            rendered_content.append_text(_STALL_TEXT)
 
-    grid.add_row(pulse, rendered_content)
+    grid.add_row(_PULSE, rendered_content)
 
     # Wrap in a rounded panel
-    return Panel(
-        grid,
-        border_style="ui.border",
-        box=box.ROUNDED,
-        padding=(0, 1),
-        expand=True,
-    )
+    return Panel(grid, **_RESPONSE_PANEL_OPTIONS)
 
 
 class StreamingResponseDisplay:
@@ -287,7 +370,12 @@ class StreamingResponseDisplay:
         self._live: Optional[Live] = None
 
         self._current_content: str = ""  # Full content received so far
-        self._animated_content: str = ""  # Content that has been animated
+        # Content that has been animated, kept as appended chunks and joined
+        # lazily (see _animated_content) so each word is an O(1) append.
+        self._animated_chunks: List[str] = []
+        self._animated_text: Optional[str] = ""
+        self._animated_len: int = 0
+        self._has_seen_newline: bool = False
 
         self._started: bool = False
         self._first_content_received: bool = False
@@ -301,30 +389,134 @@ class StreamingResponseDisplay:
 
         # Throttle: minimum interval between Markdown re-renders (seconds)
         self._min_render_interval = _get_env_float("AYE_STREAM_RENDER_INTERVAL", 0.08)
+        # time.monotonic() timestamp, not wall-clock
         self._last_render_time: float = 0.0
+        # Content and flags of the frame last handed to Live
+        self._last_frame: Optional[Tuple[str, bool, bool, bool, bool]] = None
 
         # Tailing configuration
         self._tail_enabled: bool = _get_env_bool("AYE_STREAM_TAIL", True)
 
-        # Synchronization: Live + internal state are touched by monitor thread
+        # Parsed Markdown of completed blocks, reused across refreshes
+        self._block_cache = _BlockCache()
+
+        # Fence state of the animated content up to "scanned_upto" (always a
+        # line start), so each split only scans newly appended lines.
+        self._fence_state = {"inside": False, "last_open": 0, "scanned_upto": 0}
+
+        # Wrapped height of every raw line of the animated content at
+        # _last_tailed_width; the last entry belongs to the line starting at
+        # _last_line_start, which may still grow.
+        self._line_heights: List[int] = []
+        self._total_height: int = 0
+        self._last_tailed_width: int = 0
+        self._last_line_start: int = 0
+
+        # Terminal size, cached only while our SIGWINCH handler is installed
+        # to invalidate it; otherwise it is read on every refresh.
+        self._terminal_size = None
+        self._resize_handler_installed: bool = False
+        self._previous_sigwinch = None
+
+        # Synchronization: Live + internal state are touched by the render thread
         # and by whichever thread calls update(). We must serialize them.
-        self._lock = threading.RLock()
+        # Not re-entrant: nothing that runs under the lock takes it again, and
+        # callbacks into other code (on_first_content) run outside it.
+        self._lock = threading.Lock()
 
         # Stall detection state
         # NOTE: this must track *when we last received new content from the stream*,
         # not when we last refreshed the UI. If we update this timestamp when we draw
         # the stall indicator, the indicator will blink on/off.
+        # Like _last_render_time, it is a time.monotonic() timestamp so clock
+        # adjustments cannot fake or hide a stall.
         self._last_receive_time: float = 0.0
         self._is_animating: bool = False
         self._showing_stall_indicator: bool = False
 
-        self._stall_monitor_thread: Optional[threading.Thread] = None
-        self._stop_monitoring = threading.Event()
+        self._render_thread: Optional[threading.Thread] = None
+        self._stop_rendering = threading.Event()
+
+        # Coalescing: a throttled refresh is not dropped but remembered here,
+        # and the render thread draws the latest state once the throttle
+        # window has passed.
+        self._pending_refresh: Optional[dict] = None
+        self._dirty = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Animated buffer
+    # ------------------------------------------------------------------
+
+    @property
+    def _animated_content(self) -> str:
+        """The animated content as one string, joined at most once per append."""
+        text = self._animated_text
+        if text is None:
+            text = self._animated_text = "".join(self._animated_chunks)
+            self._animated_chunks = [text]
+        return text
+
+    @_animated_content.setter
+    def _animated_content(self, value: str) -> None:
+        self._animated_chunks = [value] if value else []
+        self._animated_text = value
+        self._animated_len = len(value)
+        self._has_seen_newline = "\n" in value
+
+    def _append_animated(self, piece: str) -> None:
+        self._animated_chunks.append(piece)
+        self._animated_text = None
+        self._animated_len += len(piece)
+        if not self._has_seen_newline and "\n" in piece:
+            self._has_seen_newline = True
 
     # ------------------------------------------------------------------
     # Tailing helpers
     # ------------------------------------------------------------------
 
+    def _console_size(self):
+        """Return the console size, served from cache between resizes."""
+        size = self._terminal_size
+        if size is None:
+            size = self._console.size
+            if self._resize_handler_installed:
+                self._terminal_size = size
+        return size
+
+    def _on_resize(self, signum, frame) -> None:
+        self._terminal_size = None
+        previous = self._previous_sigwinch
+        if callable(previous):
+            previous(signum, frame)
+
+    def _install_resize_handler(self) -> None:
+        """Cache the terminal size for the life of the Live display.
+
+        Only possible where SIGWINCH exists (not on Windows) and from the
+        main thread; elsewhere the size is simply read on every refresh.
+        """
+        sigwinch = getattr(signal, "SIGWINCH", None)
+        if sigwinch is None or self._resize_handler_installed:
+            return
+        try:
+            self._previous_sigwinch = signal.signal(sigwinch, self._on_resize)
+        except ValueError:
+            # signal.signal() only works in the main thread
+            return
+        self._resize_handler_installed = True
+
+    def _remove_resize_handler(self) -> None:
+        if not self._resize_handler_installed:
+            return
+        previous = self._previous_sigwinch
+        try:
+            signal.signal(signal.SIGWINCH, previous if previous is not None else signal.SIG_DFL)
+        except ValueError:
+            return
+        self._resize_handler_installed = False
+        self._previous_sigwinch = None
+        self._terminal_size = None
+
     def _compute_available_lines(self, show_stall: bool) -> int:
         """Return how many wrapped content lines fit in the terminal.
 
@@ -332,7 +524,7 @@ class StreamingResponseDisplay:
         menu), so we only need to account for panel chrome, the stall
         indicator, and a small safety buffer.
         """
-        terminal_height = self._console.size.height
+        terminal_height = self._console_size().height
         panel_chrome = 2   # top + bottom border
         # "\n\u22ef waiting for more" occupies ~2 rows (blank line + text)
         stall_lines = 2 if show_stall else 0
@@ -347,12 +539,119 @@ class StreamingResponseDisplay:
         Subtracts panel borders, padding, the grid gap, and the pulse
         marker column from the terminal width.
         """
-        terminal_width = self._console.size.width
+        terminal_width = self._console_size().width
         # panel border (2) + panel padding h=1 each side (2)
         # + grid gap (1) + pulse marker column (~7 visible chars)
         overhead = 12
         return max(20, terminal_width - overhead)
 
+    def _reset_line_heights(self) -> None:
+        self._line_heights = []
+        self._total_height = 0
+        self._last_line_start = 0
+
+    def _tail_cached(
+        self, content: str, width: int, max_lines: int, reserve_rows: int = 0,
+    ) -> Tuple[str, bool]:
+        """Tail content to fit within *max_lines* when wrapped at *width*.
+
+        Estimates the number of terminal rows each raw line would occupy
+        after wrapping and keeps only the last lines that fit; at least the
+        last raw line is always kept.  *reserve_rows* are left free when the
+        content is truncated (e.g. for the truncation indicator); content
+        that fits in *max_lines* is returned unchanged.
+
+        Line heights are kept between refreshes: only the last (possibly
+        still growing) line and newly arrived lines are measured.  *content*
+        must extend the content of the previous call; the cache is rebuilt
+        when the width changes or the content got shorter.
+
+        Returns:
+            ``(tailed_content, is_truncated)`` where *is_truncated* is True
+            when content was shortened.
+        """
+        if not content or max_lines <= 0 or width <= 0:
+            return (content, False)
+
+        if width != self._last_tailed_width or len(content) < self._last_line_start:
+            self._reset_line_heights()
+            self._last_tailed_width = width
+
+        heights = self._line_heights
+        if heights:
+            self._total_height -= heights.pop()
+
+        new_heights = [
+            (len(line) + width - 1) // width or 1
+            for line in content[self._last_line_start:].split("\n")
+        ]
+        heights.extend(new_heights)
+        self._total_height += sum(new_heights)
+        self._last_line_start = content.rfind("\n") + 1
+
+        if self._total_height <= max_lines:
+            return (content, False)
+
+        # Accumulate from the end until we fill the budget.
+        budget = max_lines - reserve_rows
+        accumulated = 0
+        kept = 0
+        for height in reversed(heights):
+            if accumulated + height > budget:
+                break
+            accumulated += height
+            kept += 1
+
+        # Ensure at least the last raw line is included, then find where the
+        # first kept line begins by walking back over newlines.
+        pos = len(content)
+        for _ in range(kept or 1):
+            pos = content.rfind("\n", 0, pos)
+        return (content[pos + 1:], True)
+
+    # ------------------------------------------------------------------
+    # Markdown splitting
+    # ------------------------------------------------------------------
+
+    def _reset_fence_state(self) -> None:
+        self._fence_state = {"inside": False, "last_open": 0, "scanned_upto": 0}
+
+    def _reset_render_caches(self) -> None:
+        """Drop all state derived from the animated content (on restart)."""
+        self._block_cache.clear()
+        self._reset_fence_state()
+        self._reset_line_heights()
+
+    def _split_streaming_markdown_incremental(self, text: str) -> Tuple[str, str]:
+        """Incremental variant of :func:`_split_streaming_markdown`.
+
+        Complete lines are scanned for fences only once; the fence state is
+        kept in ``self._fence_state``.  *text* must extend the text passed on
+        the previous call.  The unfinished last line is checked on every call
+        because it may still turn into a fence marker.
+        """
+        state = self._fence_state
+        if len(text) < state["scanned_upto"]:
+            self._reset_fence_state()
+            state = self._fence_state
+
+        complete = text.rfind("\n") + 1
+        inside = state["inside"]
+        last_open = state["last_open"]
+        for fence_pos in _iter_fence_positions(text, state["scanned_upto"], complete):
+            inside = not inside
+            if inside:
+                last_open = fence_pos
+        if complete > state["scanned_upto"]:
+            state.update(inside=inside, last_open=last_open, scanned_upto=complete)
+
+        if next(_iter_fence_positions(text, complete), None) is not None:
+            inside = not inside
+            if inside:
+                last_open = complete
+
+        return _split_at_boundary(text, inside, last_open)
+
     # ------------------------------------------------------------------
     # Display refresh
     # ------------------------------------------------------------------
@@ -363,12 +662,17 @@ class StreamingResponseDisplay:
         show_stall: bool = False,
         streaming: bool = False,
         force: bool = False,
+        now: Optional[float] = None,
     ) -> None:
         """Refresh the live display with current animated content.
 
         When streaming Markdown is active, refreshes are throttled to avoid
         expensive re-parsing on every word. The throttle is bypassed when
-        ``force=True`` (used for stall-state transitions and final renders).
+        ``force=True`` (used for state transitions and final renders) and
+        for the first refresh that hides the stall indicator.
+        A throttled refresh marks the display dirty; the render thread then
+        draws it once the throttle window has passed, so the last words of a
+        burst never stay hidden.
 
         When tailing is enabled and *streaming* is True, only the last
         visible portion of the content is rendered so the panel always
@@ -379,14 +683,27 @@ class StreamingResponseDisplay:
             show_stall: Show the stall indicator.
             streaming: Use composite streaming Markdown renderer.
             force: Bypass the throttle (for state transitions / final).
+            now: ``time.monotonic()`` reading to throttle against, if the
+                caller already has one.
         """
         with self._lock:
             if not self._live:
                 return
 
             # Throttle: skip render if too soon, unless forced
-            now = time.time()
+            if now is None:
+                now = time.monotonic()
+            # Leading edge: the first refresh after a stall hides the
+            # indicator and is drawn immediately, like other state changes.
+            if self._showing_stall_indicator and not show_stall:
+                force = True
             if not force and (now - self._last_render_time) < self._min_render_interval:
+                self._pending_refresh = {
+                    "use_markdown": use_markdown,
+                    "show_stall": show_stall,
+                    "streaming": streaming,
+                }
+                self._dirty.set()
                 return
 
             content = self._animated_content
@@ -396,13 +713,39 @@ class StreamingResponseDisplay:
             if streaming and self._tail_enabled and content:
                 available = self._compute_available_lines(show_stall)
                 inner_width = self._compute_inner_width()
-                content, is_truncated = _tail_content(content, inner_width, available)
+                # Reserve one row for the truncation indicator.
+                content, is_truncated = self._tail_cached(
+                    content, inner_width, available, reserve_rows=1,
+                )
+
+            # Identical frames (same visible text and flags) are not rebuilt;
+            # the string compare is far cheaper than a Markdown parse.
+            frame = (content, use_markdown, show_stall, streaming, is_truncated)
+            if frame == self._last_frame:
+                self._showing_stall_indicator = show_stall
+                self._pending_refresh = None
+                self._dirty.clear()
+                return
+            self._last_frame = frame
+
+            prerendered = None
+            if use_markdown and streaming and content:
+                # A tailed view is bounded by the terminal height and is split
+                # on its own; the full content is split incrementally.
                 if is_truncated:
-                    # Re-tail with one fewer line to make room for the
-                    # truncation indicator.
-                    content, _ = _tail_content(
-                        self._animated_content, inner_width, available - 1,
-                    )
+                    split = None
+                elif not self._has_seen_newline:
+                    # Still in the first line: everything is tail.
+                    split = ("", content)
+                else:
+                    split = self._split_streaming_markdown_incremental(content)
+                prerendered = _render_streaming_markdown(
+                    content,
+                    show_stall_indicator=show_stall,
+                    is_truncated=is_truncated,
+                    block_cache=self._block_cache,
+                    split=split,
+                )
 
             self._live.update(
                 _create_response_panel(
@@ -411,10 +754,13 @@ class StreamingResponseDisplay:
                     show_stall_indicator=show_stall,
                     streaming=streaming,
                     is_truncated=is_truncated,
+                    prerendered=prerendered,
                 )
             )
             self._last_render_time = now
             self._showing_stall_indicator = show_stall
+            self._pending_refresh = None
+            self._dirty.clear()
 
     # ------------------------------------------------------------------
     # Final render helper
@@ -442,6 +788,7 @@ class StreamingResponseDisplay:
             live.stop()
             self._live = None
             self._started = False
+            self._remove_resize_handler()
 
         # Print the full final response outside the lock (console.print
         # is safe to call without holding our lock).
@@ -461,6 +808,17 @@ class StreamingResponseDisplay:
     # Lifecycle
     # ------------------------------------------------------------------
 
+    def _live_refresh_rate(self) -> int:
+        """Return how often Live should redraw, matching the render throttle.
+
+        Live redraws on its own timer; waking it more often than content can
+        change only re-renders identical frames.
+        """
+        if self._min_render_interval <= 0:
+            return _LIVE_MAX_REFRESH_PER_SECOND
+        rate = int(1.0 / self._min_render_interval)
+        return max(_LIVE_MIN_REFRESH_PER_SECOND, min(_LIVE_MAX_REFRESH_PER_SECOND, rate))
+
     def start(self) -> None:
         """Start the live display."""
         with self._lock:
@@ -471,20 +829,23 @@ class StreamingResponseDisplay:
             self._live = Live(
                 _create_response_panel("", use_markdown=False),
                 console=self._console,
-                refresh_per_second=30,
+                refresh_per_second=self._live_refresh_rate(),
                 transient=False,
             )
             self._live.start()
             self._started = True
-            self._last_receive_time = time.time()
+            self._last_frame = None
+            self._install_resize_handler()
+            self._last_receive_time = time.monotonic()
 
-            # Start stall monitoring thread
-            self._stop_monitoring.clear()
-            self._stall_monitor_thread = threading.Thread(target=self._monitor_stall, daemon=True)
-            self._stall_monitor_thread.start()
+            # Start the render thread (deferred refreshes + stall indicator)
+            self._stop_rendering.clear()
+            self._dirty.clear()
+            self._render_thread = threading.Thread(target=self._render_loop, daemon=True)
+            self._render_thread.start()
 
-    def _monitor_stall(self) -> None:
-        """Monitor for stalls.
+    def _stall_state(self) -> Optional[bool]:
+        """Return whether the stall indicator should show, or None if n/a.
 
         A true stall is:
         - we are not animating
@@ -493,80 +854,111 @@ class StreamingResponseDisplay:
 
         Important: do NOT use a timestamp that is updated when the stall indicator is rendered,
         otherwise the stall indicator will blink (it resets its own timer).
+
+        Must be called with ``self._lock`` held.
+        """
+        if not self._started or not self._animated_len:
+            return None
+
+        # Lengths differ on every check while animating; only join and
+        # compare the text once they match.
+        caught_up = (
+            not self._is_animating
+            and self._animated_len == len(self._current_content)
+            and self._animated_content == self._current_content
+        )
+        if not caught_up:
+            # If we were showing stall but new content is now pending/animating,
+            # the animation path will refresh with show_stall=False.
+            return None
+
+        return time.monotonic() - self._last_receive_time >= self._stall_threshold
+
+    def _render_loop(self) -> None:
+        """Background render thread: deferred refreshes and the stall indicator.
+
+        Wakes as soon as a throttled refresh marks the display dirty (and at
+        least every 0.5s otherwise), waits out the throttle window, then
+        decides under a single lock acquisition what, if anything, to draw.
         """
-        while not self._stop_monitoring.is_set():
-            if self._stop_monitoring.wait(0.5):
+        while not self._stop_rendering.is_set():
+            self._dirty.wait(0.5)
+            if self._stop_rendering.is_set():
                 break
 
+            if self._dirty.is_set():
+                delay = self._last_render_time + self._min_render_interval - time.monotonic()
+                if delay > 0 and self._stop_rendering.wait(delay):
+                    break
+
             with self._lock:
-                if not self._started or not self._animated_content:
-                    continue
+                refresh = self._pending_refresh
+                self._pending_refresh = None
+                self._dirty.clear()
 
-                caught_up = (not self._is_animating) and (self._animated_content == self._current_content)
-                if not caught_up:
-                    # If we were showing stall but new content is now pending/animating,
-                    # the animation path will refresh with show_stall=False.
-                    continue
+                # Only redraw for the stall state when it changes \u2014 force-flush the throttle.
+                should_show_stall = self._stall_state()
+                if should_show_stall is not None and should_show_stall != self._showing_stall_indicator:
+                    refresh = {"use_markdown": True, "show_stall": should_show_stall, "streaming": True}
 
-                time_since_receive = time.time() - self._last_receive_time
-                should_show_stall = time_since_receive >= self._stall_threshold
+            # Delegated to _refresh_display so tailing is applied consistently.
+            if refresh:
+                self._refresh_display(**refresh, force=True)
 
-                # Only redraw when the stall state changes \u2014 force-flush the throttle.
-                # Delegated to _refresh_display so tailing is applied consistently.
-                if should_show_stall != self._showing_stall_indicator:
-                    self._refresh_display(
-                        use_markdown=True,
-                        show_stall=should_show_stall,
-                        streaming=True,
-                        force=True,
-                    )
+    def _stop_render_thread(self) -> None:
+        """Signal the render thread to exit, waking it if it is idle."""
+        self._stop_rendering.set()
+        self._dirty.set()
 
     def _animate_words(self, new_text: str) -> None:
         """Animate new text word by word with streaming Markdown rendering."""
         if not new_text:
             return
 
+        if self._word_delay <= 0:
+            # Nothing to pace: take the whole delta at once and let a single
+            # refresh draw it, instead of one per word and line.
+            with self._lock:
+                if not self._live:
+                    return
+                self._append_animated(new_text)
+            self._refresh_display(
+                use_markdown=True, show_stall=False, streaming=True,
+                force="\n" in new_text or "\r" in new_text,
+            )
+            return
+
         with self._lock:
             if not self._live:
                 return
             self._is_animating = True
 
         try:
-            i = 0
-            n = len(new_text)
-
-            while i < n:
-                char = new_text[i]
+            for match in _TOKEN_RE.finditer(new_text):
+                token = match.group()
+                with self._lock:
+                    self._append_animated(token)
+
+                first = token[0]
+                if first in " \t":
+                    # A run of spaces changes nothing visible on its own;
+                    # the next word or newline renders it.
+                    continue
 
-                if char in "\n\r":
-                    with self._lock:
-                        self._animated_content += char
-                    i += 1
+                # One clock read per token: the word delay sleeps between
+                # tokens, so a reading taken before the loop would go stale.
+                now = time.monotonic()
+                if first in "\n\r":
                     # Newlines often complete a Markdown block \u2014 force render
                     self._refresh_display(
                         use_markdown=True, show_stall=False, streaming=True, force=True,
+                        now=now,
                     )
-
-                elif char in " \t":
-                    ws_start = i
-                    while i < n and new_text[i] in " \t":
-                        i += 1
-                    with self._lock:
-                        self._animated_content += new_text[ws_start:i]
-                    self._refresh_display(
-                        use_markdown=True, show_stall=False, streaming=True,
-                    )
-
                 else:
-                    word_start = i
-                    while i < n and new_text[i] not in " \t\n\r":
-                        i += 1
-                    with self._lock:
-                        self._animated_content += new_text[word_start:i]
                     self._refresh_display(
                         use_markdown=True, show_stall=False, streaming=True,
+                        now=now,
                     )
-
                     if self._word_delay > 0:
                         time.sleep(self._word_delay)
 
@@ -593,13 +985,14 @@ class StreamingResponseDisplay:
 
             # This is the key timestamp for stall detection:
             # it should only change when new stream content arrives.
-            self._last_receive_time = time.time()
+            self._last_receive_time = time.monotonic()
+
+            first_content = not self._first_content_received
+            self._first_content_received = True
 
-            # Fire the on_first_content callback before starting the display
-            if not self._first_content_received:
-                self._first_content_received = True
-                if self._on_first_content:
-                    self._on_first_content()
+        # Fire the on_first_content callback before starting the display
+        if first_content and self._on_first_content:
+            self._on_first_content()
 
         # Auto-start if not started
         if not self._started:
@@ -620,22 +1013,25 @@ class StreamingResponseDisplay:
                     new_text = content[len(self._current_content):]
                 else:
                     self._animated_content = ""
+                    self._reset_render_caches()
                     new_text = content
 
                 self._current_content = content
 
         # --- Final render path ---
-        # Stop monitoring, clear Live, print full panel to scrollback.
+        # Stop the render thread, clear Live, print full panel to scrollback.
         if is_final:
-            self._stop_monitoring.set()
+            self._stop_render_thread()
             self._render_final_and_stop()
             return
 
         # --- Streaming render path ---
 
         # If stall indicator is currently shown, hide it immediately.
-        # Force-flush so the change is visible without throttle delay.
-        if stall_was_showing:
+        # With new text the first animated refresh does that (hiding the
+        # indicator bypasses the throttle), so the first word after the
+        # stall is drawn at once instead of one throttle window later.
+        if stall_was_showing and not new_text:
             self._refresh_display(
                 use_markdown=True, show_stall=False, streaming=True, force=True,
             )
@@ -648,15 +1044,15 @@ class StreamingResponseDisplay:
         """Stop the live display.
 
         If ``update(is_final=True)`` was already called, Live is already
-        stopped and this method only cleans up the monitoring thread.
+        stopped and this method only cleans up the render thread.
         Otherwise it acts as a safety-net: clears Live, stops it, and
         prints whatever content has been accumulated so far.
         """
-        # Stop the monitoring thread
-        self._stop_monitoring.set()
-        if self._stall_monitor_thread and self._stall_monitor_thread.is_alive():
-            self._stall_monitor_thread.join(timeout=1.0)
-        self._stall_monitor_thread = None
+        # Stop the render thread
+        self._stop_render_thread()
+        if self._render_thread and self._render_thread.is_alive():
+            self._render_thread.join(timeout=1.0)
+        self._render_thread = None
 
         with self._lock:
             if not self._live:
@@ -18,6 +18,10 @@ from aye.plugins.model_plugin_utils import (
     build_user_message,
     parse_llm_response,
     create_error_response,
+    build_request_body,
+    bearer_json_headers,
+    serialize_message,
+    serialize_system_message,
 )
 from aye.plugins.plugin_base import Plugin
 
@@ -123,7 +127,7 @@ class TestDatabricksModelPlugin(TestCase):
 
         self.tmpdir = tempfile.TemporaryDirectory()
         self.root = Path(self.tmpdir.name)
-        self.history_file = self.root / ".aye" / "chat_history.json"
+        self.history_file = self.root / ".aye" / "chat_history.jsonl.gz"
 
         # Save original env var values (None if not set)
         self._saved_env = {key: os.environ.get(key) for key in self.ENV_KEYS}
@@ -251,6 +255,14 @@ class TestDatabricksModelPlugin(TestCase):
         self.assertEqual(len(parsed["updated_files"]), 1)
         self.assertEqual(parsed["updated_files"][0]["file_name"], "a.py")
 
+    def test_parse_llm_response_accepts_decoded_dict(self):
+        parsed = parse_llm_response(
+            {"answer_summary": "s", "source_files": [{"file_name": "a.py", "file_content": "c"}]}
+        )
+        self.assertEqual(
+            parsed, {"summary": "s", "updated_files": [{"file_name": "a.py", "file_content": "c"}]}
+        )
+
     def test_parse_llm_response_plain_text(self):
         parsed = parse_llm_response("just text")
         self.assertEqual(parsed["summary"], "just text")
@@ -274,6 +286,45 @@ class TestDatabricksModelPlugin(TestCase):
         self.assertEqual(result["summary"], "err")
         self.assertEqual(result["updated_files"], [])
 
+    # -- request body serialization ----------------------------------------
+    def test_build_request_body_roundtrip(self):
+        msgs = [{"role": "system", "content": "s"}, {"role": "user", "content": "h\u00e9 \"q\""}]
+        body = build_request_body(
+            {"model": "m", "max_tokens": 5}, [serialize_message(m) for m in msgs]
+        )
+        self.assertEqual(
+            json.loads(body), {"model": "m", "max_tokens": 5, "messages": msgs}
+        )
+
+    def test_bearer_json_headers_shared_and_read_only(self):
+        headers = bearer_json_headers("k1")
+        self.assertIs(bearer_json_headers("k1"), headers)
+        self.assertEqual(dict(headers), {"Content-Type": "application/json", "Authorization": "Bearer k1"})
+        with self.assertRaises(TypeError):
+            headers["Authorization"] = "Bearer other"
+
+    def test_serialize_system_message_is_reused(self):
+        first = serialize_system_message("sys prompt")
+        self.assertIs(serialize_system_message("sys prompt"), first)
+        self.assertEqual(json.loads(first), {"role": "system", "content": "sys prompt"})
+
+    def test_serialized_history_reuses_existing_fragments(self):
+        self.plugin.chat_history = {"default": [{"role": "user", "content": "a"}]}
+        first = self.plugin._serialized_history("default")
+        first_fragment = first[0]
+        self.plugin.chat_history["default"].append({"role": "assistant", "content": "b"})
+        second = self.plugin._serialized_history("default")
+        self.assertIs(second[0], first_fragment)
+        self.assertEqual([json.loads(f) for f in second], self.plugin.chat_history["default"])
+
+    def test_load_history_skips_unchanged_file(self):
+        self.plugin.history_file = self.history_file
+        self.plugin.chat_history = {"default": [{"role": "user", "content": "hi"}]}
+        self.plugin._save_history()
+        self.plugin.chat_history["unsaved"] = []
+        self.plugin._load_history()
+        self.assertIn("unsaved", self.plugin.chat_history)
+
     # -- _handle_databricks -------------------------------------------------
     def test_handle_databricks_no_env(self):
         self.assertIsNone(self.plugin._handle_databricks("p", {}))
@@ -301,7 +352,7 @@ class TestDatabricksModelPlugin(TestCase):
             "choices": [{"message": {"content": response_body}}]
         }
         mock_response.raise_for_status.return_value = None
-        mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+        mock_client.return_value.post.return_value = mock_response
 
         result = self.plugin._handle_databricks("hello", {})
         self.assertIsNotNone(result)
@@ -325,7 +376,7 @@ class TestDatabricksModelPlugin(TestCase):
             "choices": [{"message": {"content": response_body}}]
         }
         mock_response.raise_for_status.return_value = None
-        mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+        mock_client.return_value.post.return_value = mock_response
 
         result = self.plugin._handle_databricks("do it", {"a.py": "old"}, chat_id=3)
         self.assertEqual(result["summary"], "updated")
@@ -345,7 +396,7 @@ class TestDatabricksModelPlugin(TestCase):
             "choices": [{"message": {"content": response_body}}]
         }
         mock_response.raise_for_status.return_value = None
-        mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+        mock_client.return_value.post.return_value = mock_response
 
         self.plugin._handle_databricks("hi", {})
 
@@ -368,7 +419,7 @@ class TestDatabricksModelPlugin(TestCase):
             "choices": [{"message": {"content": response_body}}]
         }
         mock_response.raise_for_status.return_value = None
-        mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+        mock_client.return_value.post.return_value = mock_response
 
         result = self.plugin._handle_databricks("input", {})
         self.assertIsNotNone(result)
@@ -383,7 +434,7 @@ class TestDatabricksModelPlugin(TestCase):
         mock_response.status_code = 200
         mock_response.json.return_value = {"choices": []}
         mock_response.raise_for_status.return_value = None
-        mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+        mock_client.return_value.post.return_value = mock_response
 
         result = self.plugin._handle_databricks("q", {})
         self.assertIn("Failed to get a valid response", result["summary"])
@@ -397,7 +448,7 @@ class TestDatabricksModelPlugin(TestCase):
         mock_response.status_code = 200
         mock_response.json.return_value = {"choices": [{}]}
         mock_response.raise_for_status.return_value = None
-        mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+        mock_client.return_value.post.return_value = mock_response
 
         result = self.plugin._handle_databricks("q", {})
         self.assertIn("Failed to get a valid response", result["summary"])
@@ -409,7 +460,7 @@ class TestDatabricksModelPlugin(TestCase):
 
         mock_response = MagicMock(status_code=401, text="Unauthorized")
         mock_response.json.return_value = {"error": {"message": "Invalid key"}}
-        mock_client.return_value.__enter__.return_value.post.side_effect = (
+        mock_client.return_value.post.side_effect = (
             httpx.HTTPStatusError("Error", request=MagicMock(), response=mock_response)
         )
 
@@ -424,7 +475,7 @@ class TestDatabricksModelPlugin(TestCase):
 
         mock_response = MagicMock(status_code=500, text="Internal Server Error")
         mock_response.json.return_value = {"error": "something went wrong"}
-        mock_client.return_value.__enter__.return_value.post.side_effect = (
+        mock_client.return_value.post.side_effect = (
             httpx.HTTPStatusError("Error", request=MagicMock(), response=mock_response)
         )
 
@@ -438,7 +489,7 @@ class TestDatabricksModelPlugin(TestCase):
 
         mock_response = MagicMock(status_code=503, text="Service Unavailable")
         mock_response.json.side_effect = Exception("not json")
-        mock_client.return_value.__enter__.return_value.post.side_effect = (
+        mock_client.return_value.post.side_effect = (
             httpx.HTTPStatusError("Error", request=MagicMock(), response=mock_response)
         )
 
@@ -451,7 +502,7 @@ class TestDatabricksModelPlugin(TestCase):
         os.environ["AYE_DBX_API_URL"] = "http://fake.api"
         os.environ["AYE_DBX_API_KEY"] = "fake_key"
 
-        mock_client.return_value.__enter__.return_value.post.side_effect = ConnectionError(
+        mock_client.return_value.post.side_effect = ConnectionError(
             "connection refused"
         )
 
@@ -472,7 +523,7 @@ class TestDatabricksModelPlugin(TestCase):
         mock_response.text = "Accepted"
         mock_response.json.return_value = {"choices": []}
         mock_response.raise_for_status.return_value = None
-        mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+        mock_client.return_value.post.return_value = mock_response
 
         result = self.plugin._handle_databricks("p", {})
         self.assertIn("Failed to get a valid response", result["summary"])
@@ -490,7 +541,7 @@ class TestDatabricksModelPlugin(TestCase):
             "choices": [{"message": {"content": response_body}}]
         }
         mock_response.raise_for_status.return_value = None
-        mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+        mock_client.return_value.post.return_value = mock_response
 
         result = self.plugin._handle_databricks(
             "hi", {}, system_prompt="You are a pirate."
@@ -498,8 +549,8 @@ class TestDatabricksModelPlugin(TestCase):
         self.assertEqual(result["summary"], "custom sp")
 
         # Verify custom system prompt was used in the request
-        call_kwargs = mock_client.return_value.__enter__.return_value.post.call_args
-        payload = call_kwargs.kwargs.get("json") or call_kwargs[1].get("json")
+        call_kwargs = mock_client.return_value.post.call_args
+        payload = json.loads(call_kwargs.kwargs["content"])
         self.assertEqual(payload["messages"][0]["content"], "You are a pirate.")
 
     @patch("httpx.Client")
@@ -518,7 +569,7 @@ class TestDatabricksModelPlugin(TestCase):
             "choices": [{"message": {"content": raw_content}}]
         }
         mock_response.raise_for_status.return_value = None
-        mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+        mock_client.return_value.post.return_value = mock_response
 
         result = self.plugin._handle_databricks("go", {})
         self.assertEqual(result["summary"], "extracted")
@@ -537,7 +588,7 @@ class TestDatabricksModelPlugin(TestCase):
             "choices": [{"message": {"content": "no json at all just text"}}]
         }
         mock_response.raise_for_status.return_value = None
-        mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+        mock_client.return_value.post.return_value = mock_response
 
         result = self.plugin._handle_databricks("go", {})
         # _extract_json_object returns None, json.dumps(None) = "null"
@@ -656,7 +707,7 @@ class TestDatabricksModelPlugin(TestCase):
             "root": None,
         }
         self.plugin.on_command("local_model_invoke", params)
-        expected_history = self.root / ".aye" / "chat_history.json"
+        expected_history = self.root / ".aye" / "chat_history.jsonl.gz"
         self.assertEqual(self.plugin.history_file, expected_history)
 
     # -- on_command: unknown ------------------------------------------------
@@ -96,6 +96,14 @@ class TestDiffPresenter(TestCase):
         diff_presenter._python_diff_content(content, content, "file1.txt", "file2.txt")
         mock_console.print.assert_called_once_with("No differences found.", style="diff.warning")
 
+    @patch('aye.presenter.diff_presenter._diff_console')
+    def test_identical_content_skips_difflib(self, mock_console):
+        with patch('aye.presenter.diff_presenter.difflib.unified_diff') as mock_diff:
+            diff_presenter._python_diff_content("same\n", "same\n", "f1", "f2")
+            diff_presenter._python_diff_files(self.file1, self.file1)
+        mock_diff.assert_not_called()
+        self.assertEqual(mock_console.print.call_count, 2)
+
     @patch('aye.presenter.diff_presenter._diff_console')
     def test_python_diff_content_error(self, mock_console):
         # Force an error by passing non-string content
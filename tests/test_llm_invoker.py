@@ -504,6 +504,42 @@ class TestPrintContextMessage(TestCase):
         mock_rprint.assert_not_called()
 
 
+class TestAnswerSummaryStream(TestCase):
+    def _summaries(self, *deltas):
+        stream = llm_invoker._AnswerSummaryStream()
+        return [stream.summary for d in deltas if stream.feed(d)]
+
+    def test_summary_received_so_far(self):
+        self.assertEqual(self._summaries('{"answer_summary": "Hel'), ["Hel"])
+        self.assertEqual(
+            self._summaries('{"answer_summary": "a\\nb", "source_files": []}'),
+            ["a\nb"],
+        )
+
+    def test_incomplete_escapes_are_held_back(self):
+        self.assertEqual(self._summaries('{"answer_summary": "x\\', 'ny'), ["x", "x\ny"])
+        self.assertEqual(self._summaries('{"answer_summary": "x\\u00', 'e9'), ["x", "x\u00e9"])
+        self.assertEqual(self._summaries('{"answer_summary": "x\\ud83d', '\\ude00'), ["x", "x\U0001f600"])
+
+    def test_raw_newline_inside_string(self):
+        self.assertEqual(self._summaries('{"answer_summary": "a\nb'), ["a\nb"])
+
+    def test_json_before_summary_and_plain_text(self):
+        self.assertEqual(self._summaries('{"answ'), [])
+        self.assertEqual(self._summaries('```json\n{'), [])
+        self.assertEqual(self._summaries("plain", " answer"), ["plain", "plain answer"])
+
+    def test_summary_split_across_deltas(self):
+        text = '```json\n{"source_files": [], "answer_summary" :\n "caf\\u00e9 \\"ok\\"", "x": "y"}'
+        stream = llm_invoker._AnswerSummaryStream()
+        for ch in text:
+            stream.feed(ch)
+            # Only the unconsumed tail is kept, not the whole response
+            self.assertLessEqual(len(stream._pending), 24)
+        self.assertEqual(stream.summary, 'café "ok"')
+        self.assertFalse(stream.feed(" more"))
+
+
 class TestParseApiResponse(TestCase):
     """Tests for _parse_api_response function."""
 
@@ -938,12 +974,45 @@ class TestLlmInvoker(TestCase):
                 "chat_id": None,
                 "root": self.conf.root,
                 "system_prompt": SYSTEM_PROMPT,
-                "max_output_tokens": expected_max_output_tokens
+                "max_output_tokens": expected_max_output_tokens,
+                "on_stream_update": ANY,
             }
         )
         self.assertEqual(response.source, LLMSource.LOCAL)
         self.assertEqual(response.summary, "local summary")
         self.assertEqual(len(response.updated_files), 1)
+        self.assertFalse(response.summary_already_printed)
+
+    @patch('aye.controller.llm_invoker._build_system_prompt_with_skills', return_value=SYSTEM_PROMPT)
+    @patch('aye.controller.llm_invoker.StreamingResponseDisplay')
+    @patch('aye.controller.llm_invoker.collect_sources')
+    def test_invoke_llm_local_model_streams_summary(self, mock_collect_sources, mock_display_class, mock_build_skills):
+        mock_collect_sources.return_value = self.source_files
+        display = mock_display_class.return_value
+        display.has_received_content.return_value = True
+        display.is_active.return_value = False
+
+        def fake_handle_command(command, params):
+            params["on_stream_update"]('{"answer_')
+            params["on_stream_update"]('summary": "Hel')
+            params["on_stream_update"]('lo", "source_files": []}')
+            return {"summary": "Hello", "updated_files": []}
+
+        self.plugin_manager.handle_command.side_effect = fake_handle_command
+
+        response = llm_invoker.invoke_llm(
+            prompt="test prompt",
+            conf=self.conf,
+            console=self.console,
+            plugin_manager=self.plugin_manager
+        )
+
+        self.assertEqual(
+            display.update.call_args_list,
+            [call("Hel"), call("Hello"), call("Hello", is_final=True)],
+        )
+        self.assertTrue(response.summary_already_printed)
+        self.assertEqual(response.summary, "Hello")
 
     @patch('aye.controller.llm_invoker._build_system_prompt_with_skills', return_value=SYSTEM_PROMPT)
     @patch('aye.controller.llm_invoker.create_streaming_callback', return_value=MagicMock())
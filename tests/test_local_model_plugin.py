@@ -1,6 +1,8 @@
+import gzip
 import os
 import json
 import tempfile
+import zlib
 from pathlib import Path
 from unittest import TestCase
 from unittest.mock import patch, MagicMock
@@ -11,8 +13,15 @@ import aye.plugins.local_model
 
 from aye.plugins.local_model import LocalModelPlugin
 from aye.plugins.model_plugin_utils import (
+    HISTORY_MAX_CONVERSATIONS,
+    HISTORY_REWRITE_MEMBERS,
+    HISTORY_SUMMARY_PREFIX,
+    _close_http_clients,
+    _open_http_clients,
     build_user_message,
+    compact_history,
     parse_llm_response,
+    use_conversation,
 )
 
 class TestLocalModelPlugin(TestCase):
@@ -25,7 +34,7 @@ class TestLocalModelPlugin(TestCase):
         
         self.tmpdir = tempfile.TemporaryDirectory()
         self.root = Path(self.tmpdir.name)
-        self.history_file = self.root / ".aye" / "chat_history.json"
+        self.history_file = self.root / ".aye" / "chat_history.jsonl.gz"
         
         # Save original env var values (None if not set)
         self._saved_env = {key: os.environ.get(key) for key in self.ENV_KEYS}
@@ -80,6 +89,52 @@ class TestLocalModelPlugin(TestCase):
         self.plugin._load_history()
         self.assertEqual(self.plugin.chat_history, {})
 
+    def test_history_load_imports_legacy_file(self):
+        legacy_file = self.history_file.with_name("chat_history.json")
+        legacy_file.parent.mkdir(exist_ok=True)
+        conversations = {"default": [{"role": "user", "content": "hi"}]}
+        legacy_file.write_text(json.dumps({"conversations": conversations}))
+        self.plugin.history_file = self.history_file
+
+        self.plugin._load_history()
+
+        self.assertEqual(self.plugin.chat_history, conversations)
+        self.assertFalse(legacy_file.exists())
+        self.assertTrue(self.history_file.exists())
+
+        # The converted file is what later loads read.
+        self.plugin.chat_history = {}
+        self.plugin._load_history()
+        self.assertEqual(self.plugin.chat_history, conversations)
+
+    def test_history_load_prefers_new_file_over_legacy(self):
+        self.plugin.history_file = self.history_file
+        self.plugin.chat_history = {"default": [{"role": "user", "content": "new"}]}
+        self.plugin._save_history()
+        legacy_file = self.history_file.with_name("chat_history.json")
+        legacy_file.write_text(json.dumps({"conversations": {"old": [{"role": "user", "content": "old"}]}}))
+
+        self.plugin.chat_history = {}
+        self.plugin._load_history()
+
+        self.assertEqual(self.plugin.chat_history, {"default": [{"role": "user", "content": "new"}]})
+
+    def test_history_load_skips_unchanged_file(self):
+        self.plugin.history_file = self.history_file
+        self.plugin.chat_history = {"default": [{"role": "user", "content": "hi"}]}
+        self.plugin._save_history()
+        self.plugin._append_history("default", [{"role": "assistant", "content": "a"}])
+
+        # An unsaved in-memory marker survives a load of the unchanged file.
+        self.plugin.chat_history["unsaved"] = []
+        self.plugin._load_history()
+        self.assertIn("unsaved", self.plugin.chat_history)
+
+        # Replacing chat_history forces a reload from disk.
+        self.plugin.chat_history = {}
+        self.plugin._load_history()
+        self.assertEqual(list(self.plugin.chat_history), ["default"])
+
     def test_history_load_invalid_json(self):
         self.history_file.parent.mkdir(exist_ok=True)
         self.history_file.write_text("not json")
@@ -87,6 +142,151 @@ class TestLocalModelPlugin(TestCase):
         self.plugin._load_history()
         self.assertEqual(self.plugin.chat_history, {})
 
+    def test_history_append_only_writes_new_messages(self):
+        self.plugin.history_file = self.history_file
+        self.plugin.chat_history = {"default": [{"role": "user", "content": "hi"}]}
+        self.plugin._save_history()
+        before = self.history_file.read_bytes()
+
+        self.plugin._append_history("2", [{"role": "user", "content": "q"}, {"role": "assistant", "content": "a"}])
+
+        after = self.history_file.read_bytes()
+        self.assertTrue(after.startswith(before))
+        self.assertEqual(len(gzip.decompress(after).splitlines()), 3)
+        self.plugin.chat_history = {}
+        self.plugin._load_history()
+        self.assertEqual(
+            self.plugin.chat_history,
+            {
+                "default": [{"role": "user", "content": "hi"}],
+                "2": [{"role": "user", "content": "q"}, {"role": "assistant", "content": "a"}],
+            },
+        )
+
+    def test_history_load_skips_torn_append(self):
+        self.plugin.history_file = self.history_file
+        self.plugin._append_history("default", [{"role": "user", "content": "hi"}])
+        torn = gzip.compress(b'{"conv_id": "default", "role": "assistant"}\n')[:-6]
+        with open(self.history_file, "ab") as f:
+            f.write(torn)
+        self.plugin._load_history()
+        self.assertEqual(self.plugin.chat_history, {"default": [{"role": "user", "content": "hi"}]})
+
+    def test_history_torn_append_is_repaired_on_load(self):
+        self.plugin.history_file = self.history_file
+        self.plugin._append_history("default", [{"role": "user", "content": "hi"}])
+        with open(self.history_file, "ab") as f:
+            f.write(gzip.compress(b'{"conv_id": "default"}\n')[:-6])
+
+        self.plugin._load_history()
+        self.plugin._append_history("default", [{"role": "assistant", "content": "after"}])
+        self.plugin.chat_history = {}
+        self.plugin._load_history()
+
+        self.assertEqual(
+            self.plugin.chat_history,
+            {"default": [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "after"}]},
+        )
+
+    def test_fragmented_history_is_consolidated_on_load(self):
+        self.plugin.history_file = self.history_file
+        for i in range(HISTORY_REWRITE_MEMBERS + 1):
+            self.plugin._append_history("default", [{"role": "user", "content": f"m{i}"}])
+
+        self.plugin.chat_history = {}
+        self.plugin._load_history()
+
+        self.assertEqual(len(self.plugin.chat_history["default"]), HISTORY_REWRITE_MEMBERS + 1)
+        raw = self.history_file.read_bytes()
+        decomp = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        decomp.decompress(raw)
+        self.assertTrue(decomp.eof)
+        self.assertEqual(decomp.unused_data, b"")
+
+    def test_use_conversation_drops_least_recently_used(self):
+        history = {str(i): [{"role": "user", "content": str(i)}] for i in range(HISTORY_MAX_CONVERSATIONS)}
+
+        self.assertEqual(use_conversation(history, "0"), [{"role": "user", "content": "0"}])
+        self.assertEqual(use_conversation(history, "new"), [])
+
+        self.assertEqual(len(history), HISTORY_MAX_CONVERSATIONS)
+        self.assertNotIn("1", history)
+        self.assertEqual(list(history)[-2:], ["0", "new"])
+
+    def test_load_keeps_most_recent_conversations(self):
+        self.plugin.history_file = self.history_file
+        for i in range(HISTORY_MAX_CONVERSATIONS + 2):
+            self.plugin._append_history(str(i), [{"role": "user", "content": f"m{i}"}])
+        self.plugin._append_history("0", [{"role": "user", "content": "again"}])
+
+        self.plugin.chat_history = {}
+        self.plugin._load_history()
+        self.assertEqual(len(self.plugin.chat_history), HISTORY_MAX_CONVERSATIONS)
+        self.assertNotIn("1", self.plugin.chat_history)
+        self.assertNotIn("2", self.plugin.chat_history)
+        self.assertEqual(list(self.plugin.chat_history)[-1], "0")
+
+        # The dropped conversations are gone from the file as well.
+        self.plugin.chat_history = {}
+        self.plugin._load_history()
+        self.assertNotIn("1", self.plugin.chat_history)
+
+    def test_compact_history_keeps_tail_and_summarizes(self):
+        history = []
+        for i in range(6):
+            history.append({"role": "user", "content": f"request {i}"})
+            history.append({"role": "assistant", "content": "x" * 400})
+
+        self.assertIsNone(compact_history(history, max_tokens=10_000))
+
+        compacted = compact_history(history, max_tokens=300, keep_messages=4)
+        self.assertEqual(compacted[1:], history[-3:])
+        self.assertEqual([m["role"] for m in compacted], ["user", "assistant", "user", "assistant"])
+        self.assertIn("- request 0", compacted[0]["content"])
+        self.assertIn("- request 4", compacted[0]["content"])
+
+        # A second compaction carries the earlier summary forward.
+        again = compact_history(compacted + history[-4:], max_tokens=100, keep_messages=2)
+        self.assertIn("- request 0", again[0]["content"])
+        self.assertEqual(again[0]["content"].count(HISTORY_SUMMARY_PREFIX), 1)
+
+    def test_compact_history_budgets_oversized_tail(self):
+        history = []
+        for i in range(6):
+            history.append({"role": "user", "content": f"request {i}"})
+            history.append({"role": "assistant", "content": "x" * 4000})
+
+        # Each assistant turn alone exceeds the budget: only the newest is kept.
+        compacted = compact_history(history, max_tokens=100, keep_messages=8)
+        self.assertEqual(compacted[1:], history[-1:])
+        self.assertIn("- request 5", compacted[0]["content"])
+
+        # Nothing left to drop, so no rewrite is triggered.
+        self.assertIsNone(compact_history(compacted, max_tokens=100, keep_messages=1))
+
+        follow_up = compacted + [
+            {"role": "user", "content": "request 6"},
+            {"role": "assistant", "content": "y" * 4000},
+        ]
+        again = compact_history(follow_up, max_tokens=100, keep_messages=2)
+        self.assertEqual(again[1:], follow_up[-1:])
+        self.assertIn("- request 6", again[0]["content"])
+
+    def test_append_history_compacts_and_rewrites_file(self):
+        os.environ["AYE_MAX_HISTORY_TOKENS"] = "150"
+        self.addCleanup(os.environ.pop, "AYE_MAX_HISTORY_TOKENS", None)
+        self.plugin.history_file = self.history_file
+        history = [{"role": "user" if i % 2 == 0 else "assistant", "content": "y" * 100} for i in range(10)]
+        self.plugin.chat_history = {"default": history}
+
+        self.plugin._append_history("default", history[-2:])
+
+        # Summary + the newest turns that fit in 150 tokens (25 per message)
+        self.assertEqual(len(self.plugin.chat_history["default"]), 6)
+        saved = self.plugin.chat_history
+        self.plugin._load_history()
+        self.assertEqual(self.plugin.chat_history, saved)
+
     @patch('aye.plugins.local_model.rprint')
     def test_history_no_file_path(self, mock_rprint):
         self.plugin.init({"verbose": True})
@@ -132,25 +332,185 @@ class TestLocalModelPlugin(TestCase):
             "choices": [{"message": {"content": json.dumps({"answer_summary": "openai response"})}}]
         }
         mock_response.raise_for_status.return_value = None
-        mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+        mock_client.return_value.post.return_value = mock_response
         
         result = self.plugin._handle_openai_compatible("prompt", {})
         
         self.assertIsNotNone(result)
         self.assertEqual(result["summary"], "openai response")
 
+    @patch('httpx.Client')
+    def test_http_client_reused_across_calls(self, mock_client):
+        os.environ["AYE_LLM_API_URL"] = "http://fake.api"
+        os.environ["AYE_LLM_API_KEY"] = "fake_key"
+
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "choices": [{"message": {"content": json.dumps({"answer_summary": "ok"})}}]
+        }
+        mock_client.return_value.post.return_value = mock_response
+
+        self.plugin._handle_openai_compatible("one", {})
+        self.plugin._handle_openai_compatible("two", {})
+
+        mock_client.assert_called_once()
+        self.assertEqual(mock_client.return_value.post.call_count, 2)
+
+        self.plugin.close()
+        mock_client.return_value.close.assert_called_once()
+        self.assertIsNone(self.plugin._client)
+
+    @patch('httpx.Client')
+    def test_open_http_client_is_closed_at_exit(self, mock_client):
+        client = self.plugin._get_client()
+
+        _close_http_clients()
+
+        client.close.assert_called_once()
+        self.assertNotIn(client, _open_http_clients)
+
+    @patch('httpx.Client')
+    def test_request_prefix_is_stable_across_turns(self, mock_client):
+        """Each turn's messages extend the previous turn's without source dumps."""
+        os.environ["AYE_LLM_API_URL"] = "http://fake.api"
+        os.environ["AYE_LLM_API_KEY"] = "fake_key"
+
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "choices": [{"message": {"content": json.dumps({"answer_summary": "ok"})}}]
+        }
+        mock_client.return_value.post.return_value = mock_response
+
+        self.plugin._handle_openai_compatible("first", {"a.py": "x = 1"})
+        self.plugin._handle_openai_compatible("second", {"a.py": "x = 2"})
+
+        first, second = (json.loads(c.kwargs["content"])["messages"] for c in mock_client.return_value.post.call_args_list)
+        self.assertEqual(second[0], first[0])
+        self.assertEqual(second[1], {"role": "user", "content": "first"})
+        self.assertIn("x = 2", second[-1]["content"])
+        self.assertNotIn("x = 1", json.dumps(second))
+
+    def test_handle_openai_compatible_streaming(self):
+        os.environ["AYE_LLM_API_URL"] = "http://fake.api"
+        os.environ["AYE_LLM_API_KEY"] = "fake_key"
+
+        text = json.dumps({"answer_summary": "streamed"})
+        chunks = [text[:10], text[10:]]
+        sse = "".join(
+            f"data: {json.dumps({'choices': [{'delta': {'content': c}}]})}\n\n" for c in chunks
+        ) + "data: [DONE]\n\n"
+        seen = {}
+
+        def handler(request):
+            seen["body"] = json.loads(request.content)
+            return httpx.Response(200, text=sse, headers={"Content-Type": "text/event-stream"})
+
+        self.plugin._client = httpx.Client(transport=httpx.MockTransport(handler))
+        updates = []
+        result = self.plugin._handle_openai_compatible("prompt", {}, on_stream_update=updates.append)
+
+        self.assertTrue(seen["body"]["stream"])
+        self.assertEqual(updates, chunks)
+        self.assertEqual(result["summary"], "streamed")
+        self.assertEqual(self.plugin.chat_history["default"][-1]["content"], text)
+
+    @patch('time.sleep')
+    def test_handle_gemini_streaming_http_error(self, mock_sleep):
+        os.environ["GEMINI_API_KEY"] = "fake_key"
+        calls = []
+
+        def handler(request):
+            self.assertIn(":streamGenerateContent", str(request.url))
+            calls.append(1)
+            return httpx.Response(429, text="quota")
+
+        self.plugin._client = httpx.Client(transport=httpx.MockTransport(handler))
+        result = self.plugin._handle_gemini_pro_25("prompt", {}, on_stream_update=lambda _: None)
+        self.assertEqual(result["summary"], "Gemini API error: 429 - quota")
+        self.assertEqual(len(calls), 5)
+        self.assertEqual(mock_sleep.call_count, 4)
+
+    @patch('time.sleep')
+    def test_transient_error_is_retried(self, mock_sleep):
+        os.environ["AYE_LLM_API_URL"] = "http://fake.api"
+        os.environ["AYE_LLM_API_KEY"] = "fake_key"
+        statuses = [503, 429]
+
+        def handler(request):
+            if statuses:
+                status = statuses.pop(0)
+                return httpx.Response(status, headers={"Retry-After": "3"} if status == 429 else {})
+            return httpx.Response(200, json={"choices": [{"message": {"content": json.dumps({"answer_summary": "ok"})}}]})
+
+        self.plugin._client = httpx.Client(transport=httpx.MockTransport(handler))
+        result = self.plugin._handle_openai_compatible("prompt", {})
+
+        self.assertEqual(result["summary"], "ok")
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        self.assertEqual(len(delays), 2)
+        self.assertTrue(1 <= delays[0] <= 2)
+        self.assertEqual(delays[1], 3.0)
+
+    def test_client_error_is_not_retried(self):
+        os.environ["AYE_LLM_API_URL"] = "http://fake.api"
+        os.environ["AYE_LLM_API_KEY"] = "fake_key"
+        calls = []
+
+        def handler(request):
+            calls.append(1)
+            return httpx.Response(400, json={"error": {"message": "bad"}})
+
+        self.plugin._client = httpx.Client(transport=httpx.MockTransport(handler))
+        result = self.plugin._handle_openai_compatible("prompt", {})
+        self.assertEqual(result["summary"], "OpenAI API error: 400 - bad")
+        self.assertEqual(len(calls), 1)
+
+    @patch('httpx.Client')
+    def test_response_cache_serves_exact_repeat(self, mock_client):
+        os.environ["AYE_LLM_API_URL"] = "http://fake.api"
+        os.environ["AYE_LLM_API_KEY"] = "fake_key"
+        os.environ["AYE_LLM_CACHE"] = "on"
+        self.addCleanup(os.environ.pop, "AYE_LLM_CACHE", None)
+
+        mock_response = MagicMock()
+        mock_response.json.return_value = {
+            "choices": [{"message": {"content": json.dumps({"answer_summary": "cached"})}}]
+        }
+        mock_client.return_value.post.return_value = mock_response
+
+        # Patch the globals the plugin actually resolves; other tests may re-import
+        # model_plugin_utils, which would leave a name-based patch on a stale module.
+        cache_globals = aye.plugins.local_model.read_llm_cache.__globals__
+        with patch.dict(cache_globals, {"LLM_CACHE_DIR": self.root / "llm_cache"}):
+            first = self.plugin._handle_openai_compatible("same", {}, chat_id=1)
+            second = self.plugin._handle_openai_compatible("same", {}, chat_id=2)
+
+        self.assertEqual(first["summary"], "cached")
+        self.assertEqual(second["summary"], "cached")
+        mock_client.return_value.post.assert_called_once()
+        self.assertEqual(len(self.plugin.chat_history["2"]), 2)
+
     @patch('httpx.Client')
     def test_handle_openai_compatible_http_error(self, mock_client):
         os.environ["AYE_LLM_API_URL"] = "http://fake.api"
         os.environ["AYE_LLM_API_KEY"] = "fake_key"
         mock_response = MagicMock(status_code=401, text="Unauthorized")
         mock_response.json.return_value = {"error": {"message": "Invalid API key"}}
-        mock_client.return_value.__enter__.return_value.post.side_effect = httpx.HTTPStatusError(
+        mock_client.return_value.post.side_effect = httpx.HTTPStatusError(
             "Error", request=MagicMock(), response=mock_response
         )
         result = self.plugin._handle_openai_compatible("prompt", {})
         self.assertIn("OpenAI API error: 401 - Invalid API key", result["summary"])
 
+    def test_handle_openai_compatible_http_error_non_json_body(self):
+        os.environ["AYE_LLM_API_URL"] = "http://fake.api"
+        os.environ["AYE_LLM_API_KEY"] = "fake_key"
+        self.plugin._client = httpx.Client(
+            transport=httpx.MockTransport(lambda request: httpx.Response(403, text="<html>Forbidden</html>"))
+        )
+        result = self.plugin._handle_openai_compatible("prompt", {})
+        self.assertEqual(result["summary"], "OpenAI API error: 403 - <html>Forbidden</html>")
+
     def test_handle_openai_no_key(self):
         self.assertIsNone(self.plugin._handle_openai_compatible("p", {}))
 
@@ -164,7 +524,7 @@ class TestLocalModelPlugin(TestCase):
             "candidates": [{"content": {"parts": [{"text": json.dumps({"answer_summary": "gemini response"})}]}}]
         }
         mock_response.raise_for_status.return_value = None
-        mock_client.return_value.__enter__.return_value.post.return_value = mock_response
+        mock_client.return_value.post.return_value = mock_response
         
         result = self.plugin._handle_gemini_pro_25("prompt", {})
         
@@ -175,7 +535,7 @@ class TestLocalModelPlugin(TestCase):
     def test_handle_gemini_http_error(self, mock_client):
         os.environ["GEMINI_API_KEY"] = "fake_key"
         mock_response = MagicMock(status_code=400, text="Bad Request")
-        mock_client.return_value.__enter__.return_value.post.side_effect = httpx.HTTPStatusError(
+        mock_client.return_value.post.side_effect = httpx.HTTPStatusError(
             "Error", request=MagicMock(), response=mock_response
         )
         result = self.plugin._handle_gemini_pro_25("prompt", {})
@@ -199,6 +559,34 @@ class TestLocalModelPlugin(TestCase):
         self.assertFalse(self.history_file.exists())
         self.assertEqual(self.plugin.chat_history, {})
 
+    def test_on_command_new_chat_deletes_legacy_history(self):
+        os.environ["AYE_LLM_API_URL"] = "http://fake.api"
+        os.environ["AYE_LLM_API_KEY"] = "fake_key"
+
+        legacy_file = self.history_file.with_name("chat_history.json")
+        legacy_file.parent.mkdir(exist_ok=True)
+        legacy_file.write_text(json.dumps({"conversations": {"default": []}}))
+
+        self.plugin.on_command("new_chat", {"root": self.root})
+
+        self.assertFalse(legacy_file.exists())
+        self.assertFalse(self.history_file.exists())
+
+    def test_is_local_model_configured_tracks_config_file(self):
+        from aye.model import auth
+        from aye.plugins.local_model import _is_local_model_configured
+
+        cfg = self.root / ".ayecfg"
+        with patch.object(auth, "TOKEN_FILE", cfg):
+            self.assertFalse(_is_local_model_configured())
+            cfg.write_text("[default]\nllm_api_url=http://x\nllm_api_key=k\n")
+            self.assertTrue(_is_local_model_configured())
+            with patch("aye.plugins.local_model.get_user_config") as mock_get:
+                self.assertTrue(_is_local_model_configured())
+                mock_get.assert_not_called()
+            cfg.unlink()
+            self.assertFalse(_is_local_model_configured())
+
     @patch('pathlib.Path.cwd')
     def test_on_command_new_chat_no_root(self, mock_cwd):
         # Set env vars so _is_local_model_configured() returns True
@@ -208,7 +596,7 @@ class TestLocalModelPlugin(TestCase):
         mock_cwd.return_value = self.root
 
         # The file that should be unlinked
-        history_file = self.root / ".aye" / "chat_history.json"
+        history_file = self.root / ".aye" / "chat_history.jsonl.gz"
         history_file.parent.mkdir(parents=True, exist_ok=True)
         history_file.touch()
         self.assertTrue(history_file.exists())
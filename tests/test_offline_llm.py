@@ -12,7 +12,7 @@ SRC_DIR = ROOT_DIR / "src"
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
-from aye.plugins.offline_llm import OfflineLLMPlugin
+from aye.plugins.offline_llm import PROMPT_CACHE_BYTES, RESPONSE_GRAMMAR, OfflineLLMPlugin
 from aye.plugins.model_plugin_utils import (
     TRUNCATED_RESPONSE_MESSAGE,
     get_conversation_id,
@@ -69,6 +69,26 @@ def test_parse_llm_response_structured_payload():
     ]
 
 
+def test_parse_llm_response_normalizes_file_entries():
+    exact = {"file_name": "a.py", "file_content": "a"}
+    extra = {"file_name": "b.py", "file_content": "b", "language": "python"}
+    parsed = parse_llm_response({"answer_summary": "x", "source_files": [exact, extra, {"file_name": "c.py"}, "bad"]})
+
+    assert parsed["updated_files"][0] is exact
+    assert parsed["updated_files"][1:] == [
+        {"file_name": "b.py", "file_content": "b"},
+        {"file_name": "c.py", "file_content": None},
+    ]
+
+
+def test_parse_llm_response_accepts_bytes():
+    payload = b'{"answer_summary": "Caf\xc3\xa9", "source_files": []}'
+
+    assert parse_llm_response(payload)["summary"] == "Café"
+    assert parse_llm_response(bytearray(b"plain text"))["summary"] == "plain text"
+    assert parse_llm_response(b"42")["summary"] == "42"
+
+
 def test_parse_llm_response_invalid_json_returns_fallback():
     parsed = parse_llm_response("not json")
 
@@ -151,7 +171,7 @@ def test_load_history_no_history_file_resets_history():
 
 def test_save_and_load_history_round_trip(tmp_path):
     plugin = OfflineLLMPlugin()
-    history_path = tmp_path / ".aye" / "offline_chat_history.json"
+    history_path = tmp_path / ".aye" / "offline_chat_history.jsonl.gz"
     plugin.history_file = history_path
     sample_history = {"default": [{"role": "user", "content": "hi"}]}
     plugin.chat_history = sample_history.copy()
@@ -198,6 +218,27 @@ def test_check_dependencies_failure_logs(monkeypatch):
     assert "Install it with" in calls[1]
 
 
+def test_check_dependencies_probes_import_once(monkeypatch):
+    plugin = OfflineLLMPlugin()
+    monkeypatch.delitem(sys.modules, "llama_cpp", raising=False)
+
+    real_import = builtins.__import__
+    attempts = []
+
+    def fake_import(name, *args, **kwargs):
+        if name == "llama_cpp":
+            attempts.append(name)
+            raise ImportError("missing")
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.__import__", fake_import)
+    monkeypatch.setattr("aye.plugins.offline_llm.rprint", lambda message: None)
+
+    assert plugin._check_dependencies() is False
+    assert plugin._check_dependencies() is False
+    assert attempts == ["llama_cpp"]
+
+
 def test_load_model_returns_true_when_already_loaded():
     plugin = OfflineLLMPlugin()
     plugin._current_model_id = "test-model"
@@ -241,11 +282,99 @@ def test_load_model_success_path(monkeypatch, tmp_path):
     assert plugin._llm_instance.kwargs["model_path"] == str(model_file)
 
 
+@pytest.mark.parametrize("supports_gpu", [True, False])
+def test_load_model_gpu_offload_flags(monkeypatch, tmp_path, supports_gpu):
+    plugin = OfflineLLMPlugin()
+    model_file = tmp_path / "model.bin"
+    model_file.write_text("data")
+
+    class DummyLlama:
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+
+    fake_llama_cpp = SimpleNamespace(Llama=DummyLlama, llama_supports_gpu_offload=lambda: supports_gpu)
+    monkeypatch.setitem(sys.modules, "llama_cpp", fake_llama_cpp)
+    monkeypatch.setattr(plugin, "_check_dependencies", lambda: True)
+    monkeypatch.setattr("aye.plugins.offline_llm.get_model_path", lambda _: model_file)
+    monkeypatch.setattr("aye.plugins.offline_llm.get_model_config", lambda _: {"n_gpu_layers": 20})
+
+    assert plugin._load_model("foo") is True
+    kwargs = plugin._llm_instance.kwargs
+    assert kwargs["n_gpu_layers"] == (20 if supports_gpu else 0)
+    assert kwargs["flash_attn"] is supports_gpu
+    assert kwargs["offload_kqv"] is supports_gpu
+    assert kwargs["n_ctx"] == 16384
+
+
+def test_load_model_attaches_prompt_cache(monkeypatch, tmp_path):
+    plugin = OfflineLLMPlugin()
+    model_file = tmp_path / "model.bin"
+    model_file.write_text("data")
+
+    class DummyCache:
+        def __init__(self, capacity_bytes):
+            self.capacity_bytes = capacity_bytes
+
+    class DummyLlama:
+        def __init__(self, **kwargs):
+            self.cache = None
+
+        def set_cache(self, cache):
+            self.cache = cache
+
+    monkeypatch.setitem(sys.modules, "llama_cpp", SimpleNamespace(Llama=DummyLlama, LlamaRAMCache=DummyCache))
+    monkeypatch.setattr(plugin, "_check_dependencies", lambda: True)
+    monkeypatch.setattr("aye.plugins.offline_llm.get_model_path", lambda _: model_file)
+    monkeypatch.setattr("aye.plugins.offline_llm.get_model_config", lambda _: None)
+
+    assert plugin._load_model("foo") is True
+    assert isinstance(plugin._llm_instance.cache, DummyCache)
+    assert plugin._llm_instance.cache.capacity_bytes == PROMPT_CACHE_BYTES
+
+
+def test_load_model_compiles_response_grammar_once(monkeypatch, tmp_path):
+    plugin = OfflineLLMPlugin()
+    model_file = tmp_path / "model.bin"
+    model_file.write_text("data")
+    compiled = []
+
+    class DummyGrammar:
+        @classmethod
+        def from_string(cls, grammar, verbose=True):
+            compiled.append(grammar)
+            return cls()
+
+    class DummyLlama:
+        def __init__(self, **kwargs):
+            pass
+
+    monkeypatch.setitem(sys.modules, "llama_cpp", SimpleNamespace(Llama=DummyLlama, LlamaGrammar=DummyGrammar))
+    monkeypatch.setattr(plugin, "_check_dependencies", lambda: True)
+    monkeypatch.setattr("aye.plugins.offline_llm.get_model_path", lambda _: model_file)
+    monkeypatch.setattr("aye.plugins.offline_llm.get_model_config", lambda _: None)
+
+    assert plugin._load_model("foo") is True
+    assert plugin._load_model("bar") is True
+    assert compiled == [RESPONSE_GRAMMAR]
+    assert isinstance(plugin._grammar, DummyGrammar)
+
+
+
+def test_response_grammar_bounds_whitespace():
+    rules = {}
+    for line in RESPONSE_GRAMMAR.strip().splitlines():
+        name, body = line.split("::=", 1)
+        rules[name.strip()] = body.strip()
+    ws = rules["ws"]
+    assert "ws" not in ws
+    assert "{0,20}" in ws
+
 def test_load_model_switches_models_unloads_previous(monkeypatch, tmp_path):
     plugin = OfflineLLMPlugin()
     plugin.verbose = False
 
-    old_instance = object()
+    closed = []
+    old_instance = SimpleNamespace(close=lambda: closed.append(True))
     plugin._llm_instance = old_instance
     plugin._current_model_id = "old"
 
@@ -265,6 +394,7 @@ def test_load_model_switches_models_unloads_previous(monkeypatch, tmp_path):
     assert plugin._current_model_id == "new"
     assert isinstance(plugin._llm_instance, DummyLlama)
     assert plugin._llm_instance is not old_instance
+    assert closed == [True]
 
 
 def test_load_model_missing_model_path_returns_false(monkeypatch):
@@ -296,7 +426,7 @@ def test_load_model_handles_exceptions_from_llama(monkeypatch, tmp_path):
 
 def test_load_history_handles_missing_file(tmp_path):
     plugin = OfflineLLMPlugin()
-    plugin.history_file = tmp_path / ".aye" / "offline_chat_history.json"
+    plugin.history_file = tmp_path / ".aye" / "offline_chat_history.jsonl.gz"
     plugin.chat_history = {"default": []}
 
     plugin._load_history()
@@ -307,7 +437,7 @@ def test_load_history_handles_missing_file(tmp_path):
 def test_load_history_invalid_json_logs_warning(monkeypatch, tmp_path):
     plugin = OfflineLLMPlugin()
     plugin.verbose = True
-    history_file = tmp_path / ".aye" / "offline_chat_history.json"
+    history_file = tmp_path / ".aye" / "offline_chat_history.jsonl.gz"
     history_file.parent.mkdir(parents=True)
     history_file.write_text("{invalid json")
     plugin.history_file = history_file
@@ -324,23 +454,55 @@ def test_load_history_invalid_json_logs_warning(monkeypatch, tmp_path):
 def test_save_history_handles_write_errors(monkeypatch, tmp_path):
     plugin = OfflineLLMPlugin()
     plugin.verbose = True
-    history_file = tmp_path / ".aye" / "offline_chat_history.json"
+    history_file = tmp_path / ".aye" / "offline_chat_history.jsonl.gz"
     plugin.history_file = history_file
     plugin.chat_history = {"default": []}
     calls = []
     monkeypatch.setattr("aye.plugins.model_plugin_utils.rprint", lambda message: calls.append(message))
-    original_write = Path.write_text
 
-    def fake_write_text(self, *args, **kwargs):
-        if self == history_file:
-            raise OSError("disk full")
-        return original_write(self, *args, **kwargs)
+    def fake_write(fd, data):
+        raise OSError("disk full")
 
-    monkeypatch.setattr(Path, "write_text", fake_write_text, raising=False)
+    monkeypatch.setattr("aye.plugins.model_plugin_utils.os.write", fake_write)
 
     plugin._save_history()
 
     assert calls == ["[yellow]Could not save offline model chat history: disk full[/]"]
+    assert list(history_file.parent.iterdir()) == []
+
+
+def test_save_history_failed_replace_keeps_previous_file(monkeypatch, tmp_path):
+    plugin = OfflineLLMPlugin()
+    history_file = tmp_path / ".aye" / "offline_chat_history.jsonl.gz"
+    plugin.history_file = history_file
+    plugin.chat_history = {"default": [{"role": "user", "content": "old"}]}
+    plugin._save_history()
+
+    def fail_replace(src, dst):
+        raise OSError("interrupted")
+
+    monkeypatch.setattr("aye.plugins.model_plugin_utils.os.replace", fail_replace)
+    plugin.chat_history = {"default": [{"role": "user", "content": "new"}]}
+    plugin._save_history()
+
+    plugin._load_history()
+    assert plugin.chat_history == {"default": [{"role": "user", "content": "old"}]}
+    assert [p.name for p in history_file.parent.iterdir()] == [history_file.name]
+
+
+def test_load_history_skips_unchanged_file(tmp_path):
+    plugin = OfflineLLMPlugin()
+    plugin.history_file = tmp_path / ".aye" / "offline_chat_history.jsonl.gz"
+    plugin.chat_history = {"default": [{"role": "user", "content": "hi"}]}
+    plugin._save_history()
+
+    plugin.chat_history["unsaved"] = []
+    plugin._load_history()
+    assert "unsaved" in plugin.chat_history
+
+    plugin.chat_history = {}
+    plugin._load_history()
+    assert list(plugin.chat_history) == ["default"]
 
 
 def test_generate_response_returns_error_when_load_fails():
@@ -428,6 +590,46 @@ def test_generate_response_system_prompt_override(monkeypatch):
 
     assert result["summary"] == "Summary"
     assert llm.calls[0]["messages"][0] == {"role": "system", "content": "OVERRIDE_SYSTEM"}
+    assert llm.calls[0]["response_format"] == {"type": "json_object"}
+
+
+def test_generate_response_uses_response_grammar(monkeypatch):
+    plugin = OfflineLLMPlugin()
+    plugin._load_model = lambda _: True
+    plugin._grammar = grammar = object()
+    calls = []
+
+    class DummyLLM:
+        def create_chat_completion(self, **kwargs):
+            calls.append(kwargs)
+            return {"choices": [{"message": {"content": '{"answer_summary": "ok", "source_files": []}'}}]}
+
+    plugin._llm_instance = DummyLLM()
+    monkeypatch.setattr(plugin, "_append_history", lambda conv_id, messages: None)
+
+    assert plugin._generate_response("model", "Do work", {})["summary"] == "ok"
+    assert calls[0]["grammar"] is grammar
+    assert "response_format" not in calls[0]
+
+
+def test_generate_response_reuses_system_message(monkeypatch):
+    plugin = OfflineLLMPlugin()
+    plugin._load_model = lambda _: True
+    calls = []
+
+    class DummyLLM:
+        def create_chat_completion(self, **kwargs):
+            calls.append(kwargs)
+            return {"choices": [{"message": {"content": '{"answer_summary": "ok", "source_files": []}'}}]}
+
+    plugin._llm_instance = DummyLLM()
+    monkeypatch.setattr(plugin, "_append_history", lambda conv_id, messages: None)
+
+    plugin._generate_response("model", "first", {}, system_prompt="SYS")
+    plugin._generate_response("model", "second", {}, system_prompt="SYS")
+
+    assert calls[0]["messages"][0] == {"role": "system", "content": "SYS"}
+    assert calls[1]["messages"][0] is calls[0]["messages"][0]
 
 
 def test_generate_response_success_updates_history_and_saves(monkeypatch):
@@ -456,8 +658,8 @@ def test_generate_response_success_updates_history_and_saves(monkeypatch):
 
     llm = DummyLLM()
     plugin._llm_instance = llm
-    saved = {"called": False}
-    monkeypatch.setattr(plugin, "_save_history", lambda: saved.__setitem__("called", True))
+    appended = []
+    monkeypatch.setattr(plugin, "_append_history", lambda conv_id, messages: appended.append((conv_id, messages)))
 
     result = plugin._generate_response(
         "model",
@@ -469,7 +671,7 @@ def test_generate_response_success_updates_history_and_saves(monkeypatch):
     assert result["summary"] == "Summary"
     assert plugin.chat_history["7"][0]["role"] == "user"
     assert len(plugin.chat_history["7"]) == 2
-    assert saved["called"] is True
+    assert appended == [("7", plugin.chat_history["7"])]
     assert len(llm.calls) == 1
     assert llm.calls[0]["messages"][0]["role"] == "system"
 
@@ -568,7 +770,7 @@ def test_on_command_download_model_propagates_download_failure(monkeypatch):
 def test_on_command_new_chat_clears_history(monkeypatch, tmp_path):
     plugin = OfflineLLMPlugin()
     plugin.verbose = True
-    history_file = tmp_path / ".aye" / "chat_history.json"  # Matches HISTORY_FILENAME in plugin
+    history_file = tmp_path / ".aye" / "chat_history.jsonl.gz"  # Matches HISTORY_FILENAME in plugin
     history_file.parent.mkdir(parents=True)
     history_file.write_text("{}")
     plugin.chat_history = {"default": ["old"]}
@@ -636,8 +838,8 @@ def test_on_command_local_model_invoke_success(monkeypatch, tmp_path):
     assert result == {"summary": "ok", "updated_files": []}
     assert captured["args"] == ("m", "Test", {"a": "b"}, 3, "custom prompt", 4096)
     assert loaded["called"] is True
-    # HISTORY_FILENAME is "chat_history.json" in the plugin
-    assert plugin.history_file == tmp_path / ".aye" / "chat_history.json"
+    # HISTORY_FILENAME is "chat_history.jsonl.gz" in the plugin
+    assert plugin.history_file == tmp_path / ".aye" / "chat_history.jsonl.gz"
 
 
 def test_on_command_local_model_invoke_passes_max_output_tokens(monkeypatch, tmp_path):
@@ -177,6 +177,16 @@ class TestReplUi(TestCase):
         # Should be called for the grid and the newline
         self.assertEqual(mock_print.call_count, 4)
 
+    @patch('aye.presenter.repl_ui.console.print')
+    @patch('aye.presenter.repl_ui.Markdown')
+    def test_print_assistant_response_reuses_parsed_markdown(self, mock_markdown, mock_print):
+        mock_markdown.return_value = "parsed"
+        repl_ui._markdown.cache_clear()
+        repl_ui.print_assistant_response("same **summary**")
+        repl_ui.print_assistant_response("same **summary**")
+        mock_markdown.assert_called_once_with("same **summary**")
+        repl_ui._markdown.cache_clear()
+
     @patch('rich.console.Console.print')
     def test_print_no_files_changed(self, mock_print):
         # Test with a console that has no theme
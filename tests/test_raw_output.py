@@ -7,7 +7,7 @@ from aye.presenter.raw_output import (
     print_assistant_response_raw,
     _RAW_BEGIN,
     _RAW_END,
-    _NO_RESPONSE_MSG,
+    _NO_RESPONSE_TEXT,
 )
 
 
@@ -17,17 +17,17 @@ class TestPrintAssistantResponseRaw:
     def test_none_input_shows_no_response(self):
         with patch("aye.presenter.raw_output.rprint") as mock_rprint:
             print_assistant_response_raw(None)
-        mock_rprint.assert_called_once_with(f"[yellow]{_NO_RESPONSE_MSG}[/]")
+        mock_rprint.assert_called_once_with(_NO_RESPONSE_TEXT)
 
     def test_empty_string_shows_no_response(self):
         with patch("aye.presenter.raw_output.rprint") as mock_rprint:
             print_assistant_response_raw("")
-        mock_rprint.assert_called_once_with(f"[yellow]{_NO_RESPONSE_MSG}[/]")
+        mock_rprint.assert_called_once_with(_NO_RESPONSE_TEXT)
 
     def test_whitespace_only_shows_no_response(self):
         with patch("aye.presenter.raw_output.rprint") as mock_rprint:
             print_assistant_response_raw("   \t\n  ")
-        mock_rprint.assert_called_once_with(f"[yellow]{_NO_RESPONSE_MSG}[/]")
+        mock_rprint.assert_called_once_with(_NO_RESPONSE_TEXT)
 
     def test_normal_text_without_trailing_newline(self, capsys):
         with patch("aye.presenter.raw_output.rprint"):
@@ -12,6 +12,25 @@ from rich.text import Text
 import aye.presenter.streaming_ui as streaming_ui
 
 
+def reference_tail(content, width, max_lines, reserve_rows=0):
+    """Straightforward tailing that StreamingResponseDisplay._tail_cached must match."""
+    if not content or max_lines <= 0 or width <= 0:
+        return (content, False)
+
+    raw_lines = content.split("\n")
+    heights = [max(1, -(-len(line) // width)) for line in raw_lines]
+    if sum(heights) <= max_lines:
+        return (content, False)
+
+    budget = max_lines - reserve_rows
+    start = len(raw_lines) - 1  # the last raw line is always kept
+    accumulated = heights[start]
+    while start > 0 and accumulated + heights[start - 1] <= budget:
+        start -= 1
+        accumulated += heights[start]
+    return ("\n".join(raw_lines[start:]), True)
+
+
 class FakeLive:
     """Minimal stand-in for rich.live.Live used by StreamingResponseDisplay."""
 
@@ -150,14 +169,36 @@ class TestSplitStreamingMarkdown(unittest.TestCase):
     def test_no_newline_all_tail(self):
         self.assertEqual(self.split("no newlines here"), ("", "no newlines here"))
 
+    def test_incremental_split_matches_one_shot(self):
+        text = "intro\n\n```python\ncode\n\nmore\n```\nafter\n\n~~~\nopen block\n  ```\nx"
+        d = streaming_ui.StreamingResponseDisplay(console=MagicMock())
+        for end in range(len(text) + 1):
+            self.assertEqual(
+                d._split_streaming_markdown_incremental(text[:end]),
+                self.split(text[:end]),
+                text[:end],
+            )
+
+    def test_incremental_split_scans_only_new_lines(self):
+        d = streaming_ui.StreamingResponseDisplay(console=MagicMock())
+        d._split_streaming_markdown_incremental("a\n```\nb\n")
+        self.assertEqual(d._fence_state["scanned_upto"], len("a\n```\nb\n"))
+        self.assertTrue(d._fence_state["inside"])
+
+        # Shorter text (restart) resets the state instead of reusing it
+        self.assertEqual(d._split_streaming_markdown_incremental("x\ny"), ("x\n", "y"))
+        self.assertFalse(d._fence_state["inside"])
+
 
 # ------------------------------------------------------------------ #
-# _tail_content
+# StreamingResponseDisplay._tail_cached
 # ------------------------------------------------------------------ #
 
 
 class TestTailContent(unittest.TestCase):
-    tail = staticmethod(streaming_ui._tail_content)
+    def tail(self, content, width, max_lines, reserve_rows=0):
+        d = streaming_ui.StreamingResponseDisplay(console=MagicMock())
+        return d._tail_cached(content, width, max_lines, reserve_rows=reserve_rows)
 
     def test_empty_content(self):
         result, truncated = self.tail("", 80, 10)
@@ -196,6 +237,14 @@ class TestTailContent(unittest.TestCase):
         # but the function always includes at least the last raw line.
         self.assertIn("A" * 200, result)
 
+    def test_reserve_rows_applies_only_when_truncated(self):
+        lines = "\n".join(f"line{i}" for i in range(10))
+        self.assertEqual(self.tail(lines, 80, 10, reserve_rows=1), (lines, False))
+
+        result, truncated = self.tail(lines, 80, 5, reserve_rows=1)
+        self.assertTrue(truncated)
+        self.assertEqual(result, "line6\nline7\nline8\nline9")
+
     def test_empty_lines_count_as_one_row(self):
         content = "\n\n\n\n\nend"
         result, truncated = self.tail(content, 80, 3)
@@ -252,6 +301,106 @@ class TestRenderStreamingMarkdown(unittest.TestCase):
         # prefix="para1\n\n", tail="" => only Markdown part => single renderable
         self.assertIsInstance(result, Markdown)
 
+    def test_indicators_are_shared_and_left_unmodified(self):
+        from rich.console import Console
+
+        result = self.render("line1\n\nline2", show_stall_indicator=True, is_truncated=True)
+        self.assertIs(result.renderables[0], streaming_ui._TRUNCATION_TEXT)
+        self.assertIs(result.renderables[-1], streaming_ui._STALL_TEXT)
+
+        console = Console(width=30, force_terminal=False, theme=streaming_ui._STREAMING_THEME)
+        with console.capture():
+            console.print(result)
+            console.print(streaming_ui._create_response_panel("x", use_markdown=False, show_stall_indicator=True))
+        self.assertEqual(streaming_ui._STALL_TEXT.plain, "\n\u22ef waiting for more")
+        self.assertEqual(streaming_ui._TRUNCATION_TEXT.plain, streaming_ui._TRUNCATION_INDICATOR_TEXT)
+
+    def test_block_cache_parses_only_new_blocks(self):
+        cache = streaming_ui._BlockCache()
+        self.render("para1\n\npara2\n\ntail", block_cache=cache)
+
+        with patch.object(streaming_ui, "Markdown", wraps=Markdown) as md:
+            self.render("para1\n\npara2\n\npara3\n\ntail", block_cache=cache)
+
+        parsed = [c.args[0] for c in md.call_args_list]
+        self.assertNotIn("para1\n\n", parsed)
+        self.assertNotIn("para2\n\n", parsed)
+        self.assertIn("para3\n\n", parsed)
+
+
+# ------------------------------------------------------------------ #
+# _split_markdown_blocks / _BlockCache
+# ------------------------------------------------------------------ #
+
+
+class TestMarkdownBlocks(unittest.TestCase):
+    split = staticmethod(streaming_ui._split_markdown_blocks)
+
+    def test_blocks_rejoin_to_original(self):
+        text = "para1\n\n- a\n- b\n\n```py\nx = 1\n\ny = 2\n```\n\nend\n"
+        blocks = self.split(text)
+        self.assertEqual("".join(blocks), text)
+        # The list may continue its preceding paragraph's block, never the reverse
+        self.assertEqual(blocks[0], "para1\n\n- a\n- b\n\n")
+        self.assertEqual(len(blocks), 3)
+
+    def test_iter_fence_positions(self):
+        text = "a\n```py\nb\n  ~~~\n``\nc ```\n```"
+        self.assertEqual(list(streaming_ui._iter_fence_positions(text)), [2, 10, 25])
+        self.assertEqual(list(streaming_ui._iter_fence_positions(text, 8, 25)), [10])
+
+    def test_blank_line_inside_fence_does_not_split(self):
+        blocks = self.split("```\na\n\nb\n```\n")
+        self.assertEqual(blocks, ["```\na\n\nb\n```\n"])
+
+    def test_indented_continuation_stays_in_block(self):
+        blocks = self.split("- item\n\n  continued\n\nnext")
+        self.assertEqual(blocks, ["- item\n\n  continued\n\n", "next"])
+
+    def assert_cached_render_matches_full_parse(self, text):
+        from rich.console import Console
+
+        console = Console(width=60, force_terminal=False)
+        with console.capture() as full:
+            console.print(Markdown(text))
+        with console.capture() as cached:
+            console.print(streaming_ui._BlockCache().render(text))
+        self.assertEqual(cached.get(), full.get())
+
+    def test_cached_render_matches_full_parse(self):
+        for text in (
+            "# Title\n\npara with **bold**\n\n- a\n- b\n\n```py\nx = 1\n```\n\nend\n",
+            "1. a\n\n2. b\n\nafter\n",
+            "- a\n\n- b\n\n- c\n",
+            "intro\n\n* a\n\n  more a\n\n* b\n\n---\n\nend\n",
+            "see [the docs][d]\n\nmore\n\n[d]: https://example.com\n",
+            "<!--\n\nhidden\n\n-->\n\nafter\n",
+        ):
+            with self.subTest(text=text):
+                self.assert_cached_render_matches_full_parse(text)
+
+    def test_list_items_across_blank_lines_stay_in_one_block(self):
+        self.assertEqual(self.split("1. a\n\n2. b\n\nafter"), ["1. a\n\n2. b\n\n", "after"])
+
+    def test_document_wide_markup_is_parsed_whole(self):
+        text = "see [x][d]\n\n[d]: https://example.com\n"
+        with patch.object(streaming_ui, "Markdown", wraps=Markdown) as md:
+            streaming_ui._BlockCache().render(text)
+        md.assert_called_once_with(text)
+
+    def test_document_wide_markup_inside_fences_is_ignored(self):
+        text = "```html\n<div>\n\n[d]: x\n```\n\nend\n"
+        self.assertFalse(streaming_ui._has_document_wide_markup(text))
+        self.assertTrue(streaming_ui._has_document_wide_markup(text + "\n<br>\n"))
+        self.assert_cached_render_matches_full_parse(text)
+
+    def test_cache_is_bounded(self):
+        cache = streaming_ui._BlockCache(max_blocks=2)
+        first = cache.get("a")
+        cache.get("b")
+        cache.get("c")
+        self.assertIsNot(cache.get("a"), first)
+
 
 # ------------------------------------------------------------------ #
 # _create_response_panel – additional branch coverage
@@ -377,7 +526,7 @@ class TestStreamingResponseDisplay(unittest.TestCase):
 
         events = []
 
-        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False):
+        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False, prerendered=None):
             events.append((content, use_markdown, streaming))
             return {"content": content, "use_markdown": use_markdown}
 
@@ -385,7 +534,7 @@ class TestStreamingResponseDisplay(unittest.TestCase):
              patch.object(streaming_ui.time, "sleep"):
             d = streaming_ui.StreamingResponseDisplay(
                 console=self.console,
-                word_delay=0,
+                word_delay=0.01,
                 on_first_content=on_first,
             )
             d._min_render_interval = 0
@@ -397,14 +546,35 @@ class TestStreamingResponseDisplay(unittest.TestCase):
 
         self.assertEqual(events[0], ("", False, False))
         self.assertIn(("Hello", True, True), events)
-        self.assertIn(("Hello ", True, True), events)
+        self.assertNotIn(("Hello ", True, True), events)
         self.assertIn(("Hello world", True, True), events)
 
+    @patch.object(streaming_ui, "Live", FakeLive)
+    def test_on_first_content_runs_outside_the_lock(self):
+        import threading
+
+        def on_first():
+            # Would deadlock if the callback ran while update() held the lock
+            self.assertTrue(d._lock.acquire(timeout=1))
+            d._lock.release()
+
+        with patch.object(streaming_ui.time, "sleep"):
+            d = streaming_ui.StreamingResponseDisplay(
+                console=self.console, word_delay=0, on_first_content=on_first,
+            )
+            worker = threading.Thread(target=d.update, args=("Hi",))
+            worker.start()
+            worker.join(timeout=5)
+            self.assertFalse(worker.is_alive())
+            d.stop()
+
+        self.assertTrue(d.has_received_content())
+
     @patch.object(streaming_ui, "Live", FakeLive)
     def test_update_same_content_is_noop(self):
         events = []
 
-        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False):
+        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False, prerendered=None):
             events.append((content, use_markdown, streaming))
             return (content, use_markdown)
 
@@ -420,7 +590,7 @@ class TestStreamingResponseDisplay(unittest.TestCase):
     def test_update_non_appended_content_resets_animation(self):
         events = []
 
-        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False):
+        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False, prerendered=None):
             events.append((content, use_markdown, streaming))
             return (content, use_markdown)
 
@@ -438,7 +608,7 @@ class TestStreamingResponseDisplay(unittest.TestCase):
     def test_stop_final_markdown_render_and_spacing_after(self):
         events = []
 
-        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False):
+        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False, prerendered=None):
             events.append((content, use_markdown, streaming))
             return (content, use_markdown)
 
@@ -456,7 +626,7 @@ class TestStreamingResponseDisplay(unittest.TestCase):
     def test_context_manager_starts_and_stops(self):
         events = []
 
-        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False):
+        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False, prerendered=None):
             events.append((content, use_markdown, streaming))
             return (content, use_markdown)
 
@@ -546,7 +716,19 @@ class TestStreamingResponseDisplay(unittest.TestCase):
             d.start()
             # Should be the same Live instance — second start() is a no-op
             self.assertIs(d._live, live1)
-            d._stop_monitoring.set()
+            d._stop_rendering.set()
+
+    @patch.object(streaming_ui, "Live", FakeLive)
+    def test_live_refresh_rate_follows_render_interval(self):
+        d = streaming_ui.StreamingResponseDisplay(console=self.console)
+        d._min_render_interval = 0.08
+        d.start()
+        self.assertEqual(d._live.refresh_per_second, 12)
+        d.stop()
+
+        for interval, rate in ((0, 30), (0.001, 30), (1.0, 4)):
+            d._min_render_interval = interval
+            self.assertEqual(d._live_refresh_rate(), rate)
 
     @patch.object(streaming_ui, "Live", FakeLive)
     def test_stop_when_not_started_is_noop(self):
@@ -574,7 +756,7 @@ class TestStreamingResponseDisplay(unittest.TestCase):
     def test_update_is_final_stops_live_and_prints_full(self):
         events = []
 
-        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False):
+        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False, prerendered=None):
             events.append((content, use_markdown, show_stall_indicator, streaming, is_truncated))
             return Text(content)
 
@@ -619,7 +801,7 @@ class TestStreamingResponseDisplay(unittest.TestCase):
     def test_animate_words_newline_forces_render(self):
         events = []
 
-        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False):
+        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False, prerendered=None):
             events.append((content, streaming, "force" if show_stall_indicator else "normal"))
             return Text(content)
 
@@ -637,7 +819,7 @@ class TestStreamingResponseDisplay(unittest.TestCase):
     def test_animate_words_tabs_handled(self):
         events = []
 
-        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False):
+        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False, prerendered=None):
             events.append(content)
             return Text(content)
 
@@ -649,6 +831,42 @@ class TestStreamingResponseDisplay(unittest.TestCase):
 
         self.assertEqual(d._animated_content, "a\tb")
 
+    def test_animated_buffer_joins_lazily(self):
+        d = streaming_ui.StreamingResponseDisplay(console=self.console)
+        d._animated_content = "a"
+        d._append_animated(" b")
+        d._append_animated(" c")
+        self.assertIsNone(d._animated_text)
+        self.assertEqual(d._animated_len, 5)
+
+        self.assertEqual(d._animated_content, "a b c")
+        self.assertEqual(d._animated_chunks, ["a b c"])
+
+        d._animated_content = ""
+        self.assertEqual(d._animated_chunks, [])
+        self.assertEqual(d._animated_len, 0)
+
+    @patch.object(streaming_ui, "Live", FakeLive)
+    def test_first_line_skips_markdown_split(self):
+        d = streaming_ui.StreamingResponseDisplay(console=self.console, word_delay=0)
+        d._min_render_interval = 0
+        d._live = FakeLive(Text(""))
+        d._animated_content = "first"
+
+        with patch.object(d, "_split_streaming_markdown_incremental") as split:
+            d._refresh_display(use_markdown=True, streaming=True)
+            split.assert_not_called()
+
+            d._append_animated("\nsecond")
+            self.assertTrue(d._has_seen_newline)
+            split.return_value = ("first\n", "second")
+            d._refresh_display(use_markdown=True, streaming=True, force=True)
+            split.assert_called_once_with("first\nsecond")
+
+    def test_token_re_splits_words_whitespace_and_line_breaks(self):
+        tokens = [m.group() for m in streaming_ui._TOKEN_RE.finditer("a  b\t\n\n\rc")]
+        self.assertEqual(tokens, ["a", "  ", "b", "\t", "\n", "\n", "\r", "c"])
+
     @patch.object(streaming_ui, "Live", FakeLive)
     def test_animate_words_empty_new_text_is_noop(self):
         """_animate_words with empty string should not crash or produce renders."""
@@ -657,7 +875,7 @@ class TestStreamingResponseDisplay(unittest.TestCase):
             d = streaming_ui.StreamingResponseDisplay(console=self.console, word_delay=0)
             d.start()
             d._animate_words("")  # Should return immediately
-            d._stop_monitoring.set()
+            d._stop_rendering.set()
 
     @patch.object(streaming_ui, "Live", FakeLive)
     def test_animate_words_returns_early_when_no_live(self):
@@ -682,7 +900,7 @@ class TestStreamingResponseDisplay(unittest.TestCase):
     def test_refresh_display_throttled(self):
         calls = []
 
-        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False):
+        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False, prerendered=None):
             calls.append(content)
             return Text(content)
 
@@ -701,22 +919,71 @@ class TestStreamingResponseDisplay(unittest.TestCase):
             self.assertEqual(len(calls), count_after_first)
 
             # Force bypasses throttle
+            d._animated_content = "test more"
             d._refresh_display(use_markdown=True, streaming=True, force=True)
             self.assertEqual(len(calls), count_after_first + 1)
 
+    def test_refresh_display_skips_identical_frame(self):
+        calls = []
+
+        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False, prerendered=None):
+            calls.append((content, show_stall_indicator))
+            return Text(content)
+
+        with patch.object(streaming_ui, "_create_response_panel", side_effect=fake_panel):
+            d = streaming_ui.StreamingResponseDisplay(console=self.console, word_delay=0)
+            d._live = FakeLive(Text(""))
+            d._animated_content = "test"
+
+            d._refresh_display(use_markdown=True, streaming=True, force=True)
+            d._refresh_display(use_markdown=True, streaming=True, force=True)
+            self.assertEqual(calls, [("test", False)])
+
+            # A changed flag is a different frame
+            d._refresh_display(use_markdown=True, show_stall=True, streaming=True, force=True)
+            self.assertEqual(calls, [("test", False), ("test", True)])
+            self.assertTrue(d._showing_stall_indicator)
+
+    @patch.object(streaming_ui, "Live", FakeLive)
+    def test_throttled_refresh_is_flushed_by_render_thread(self):
+        calls = []
+
+        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False, prerendered=None):
+            calls.append(content)
+            return Text(content)
+
+        with patch.object(streaming_ui, "_create_response_panel", side_effect=fake_panel):
+            d = streaming_ui.StreamingResponseDisplay(console=self.console, word_delay=0)
+            d._min_render_interval = 0.05
+            d.start()
+
+            d._animated_content = "first"
+            d._refresh_display(use_markdown=True, streaming=True)
+            d._animated_content = "first second"
+            d._refresh_display(use_markdown=True, streaming=True)
+            self.assertTrue(d._dirty.is_set())
+            self.assertNotIn("first second", calls)
+
+            time.sleep(0.3)
+            flushed = list(calls)
+            d.stop()
+
+        self.assertIn("first second", flushed)
+        self.assertIsNone(d._pending_refresh)
+
     # -------------------------------------------------- #
     # Tailing during streaming
     # -------------------------------------------------- #
 
     @patch.object(streaming_ui, "Live", FakeLive)
     def test_tailing_kicks_in_for_long_content(self):
-        """When tail is enabled and content is tall, _tail_content should be called."""
+        """When tail is enabled and content is tall, the content is tailed."""
         self.console.size.height = 10  # Very small terminal
         self.console.size.width = 80
 
         panel_args = []
 
-        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False):
+        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False, prerendered=None):
             panel_args.append({"content": content, "is_truncated": is_truncated, "streaming": streaming})
             return Text(content)
 
@@ -745,7 +1012,7 @@ class TestStreamingResponseDisplay(unittest.TestCase):
 
         panel_args = []
 
-        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False):
+        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False, prerendered=None):
             panel_args.append({"content": content, "is_truncated": is_truncated})
             return Text(content)
 
@@ -768,6 +1035,27 @@ class TestStreamingResponseDisplay(unittest.TestCase):
     # _compute_available_lines / _compute_inner_width
     # -------------------------------------------------- #
 
+    def test_tail_cached_matches_reference(self):
+        d = streaming_ui.StreamingResponseDisplay(console=self.console)
+        text = "".join(f"line {i} " + "x" * (i * 7 % 50) + "\n" for i in range(60)) + "\n\nend"
+        for width in (20, 33):
+            for end in range(0, len(text) + 1, 7):
+                for budget, reserve in ((5, 0), (12, 0), (12, 1)):
+                    self.assertEqual(
+                        d._tail_cached(text[:end], width, budget, reserve_rows=reserve),
+                        reference_tail(text[:end], width, budget, reserve_rows=reserve),
+                    )
+
+    def test_tail_cached_measures_only_new_lines(self):
+        d = streaming_ui.StreamingResponseDisplay(console=self.console)
+        d._tail_cached("a\nb\nc", 80, 10)
+        self.assertEqual(d._line_heights, [1, 1, 1])
+        self.assertEqual(d._last_line_start, 4)
+
+        d._tail_cached("a\nb\nc" + "y" * 100 + "\nd", 80, 10)
+        self.assertEqual(d._line_heights, [1, 1, 2, 1])
+        self.assertEqual(d._total_height, 5)
+
     def test_compute_available_lines_no_stall(self):
         d = streaming_ui.StreamingResponseDisplay(console=self.console)
         self.console.size.height = 40
@@ -796,6 +1084,36 @@ class TestStreamingResponseDisplay(unittest.TestCase):
         # 120 - 12 = 108
         self.assertEqual(result, 108)
 
+    @unittest.skipUnless(hasattr(streaming_ui.signal, "SIGWINCH"), "requires SIGWINCH")
+    def test_terminal_size_cached_until_resize(self):
+        previous = MagicMock()
+        d = streaming_ui.StreamingResponseDisplay(console=self.console)
+        with patch.object(streaming_ui.signal, "signal", return_value=previous) as sig:
+            d._install_resize_handler()
+            self.assertEqual(d._compute_inner_width(), 108)
+
+            # Console.size returns a new tuple on every read
+            self.console.size = MagicMock(width=60, height=40)
+            self.assertEqual(d._compute_inner_width(), 108)  # cached
+
+            d._on_resize(streaming_ui.signal.SIGWINCH, None)
+            previous.assert_called_once()
+            self.assertEqual(d._compute_inner_width(), 48)
+
+            d._remove_resize_handler()
+            sig.assert_called_with(streaming_ui.signal.SIGWINCH, previous)
+
+        self.console.size.width = 100
+        self.assertEqual(d._compute_inner_width(), 88)  # read on every call again
+
+    def test_terminal_size_not_cached_off_main_thread(self):
+        d = streaming_ui.StreamingResponseDisplay(console=self.console)
+        with patch.object(streaming_ui.signal, "signal", side_effect=ValueError):
+            d._install_resize_handler()
+        self.assertFalse(d._resize_handler_installed)
+        self.console.size.width = 50
+        self.assertEqual(d._compute_inner_width(), 38)
+
     def test_compute_inner_width_minimum(self):
         d = streaming_ui.StreamingResponseDisplay(console=self.console)
         self.console.size.width = 10
@@ -854,7 +1172,7 @@ class TestStreamingResponseDisplay(unittest.TestCase):
             d._current_content = "some content"
             d._animated_content = "some content"
             d._is_animating = False
-            d._last_receive_time = time.time() - 1.0  # 1 second ago
+            d._last_receive_time = time.monotonic() - 1.0  # 1 second ago
             d._showing_stall_indicator = False
 
             original_refresh = d._refresh_display
@@ -867,7 +1185,7 @@ class TestStreamingResponseDisplay(unittest.TestCase):
                 # Give the monitor thread a chance to detect the stall
                 time.sleep(0.8)
 
-            d._stop_monitoring.set()
+            d._stop_rendering.set()
 
         # The monitor should have called _refresh_display with show_stall=True
         stall_refreshes = [c for c in refresh_calls if c.get("show_stall") is True]
@@ -890,13 +1208,13 @@ class TestStreamingResponseDisplay(unittest.TestCase):
             d._current_content = "some content"
             d._animated_content = "some con"  # Not caught up
             d._is_animating = True
-            d._last_receive_time = time.time() - 1.0
+            d._last_receive_time = time.monotonic() - 1.0
             d._showing_stall_indicator = False
 
             with patch.object(d, "_refresh_display", side_effect=lambda **kw: refresh_calls.append(kw)):
                 time.sleep(0.8)
 
-            d._stop_monitoring.set()
+            d._stop_rendering.set()
 
         # No stall refresh should have been triggered
         stall_refreshes = [c for c in refresh_calls if c.get("show_stall") is True]
@@ -918,12 +1236,12 @@ class TestStreamingResponseDisplay(unittest.TestCase):
 
             d._current_content = ""
             d._animated_content = ""
-            d._last_receive_time = time.time() - 1.0
+            d._last_receive_time = time.monotonic() - 1.0
 
             with patch.object(d, "_refresh_display", side_effect=lambda **kw: refresh_calls.append(kw)):
                 time.sleep(0.8)
 
-            d._stop_monitoring.set()
+            d._stop_rendering.set()
 
         self.assertEqual(len(refresh_calls), 0)
 
@@ -936,7 +1254,7 @@ class TestStreamingResponseDisplay(unittest.TestCase):
         """When stall indicator is shown and new content arrives, it should hide."""
         events = []
 
-        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False):
+        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False, prerendered=None):
             events.append({"content": content, "show_stall": show_stall_indicator, "streaming": streaming})
             return Text(content)
 
@@ -961,6 +1279,33 @@ class TestStreamingResponseDisplay(unittest.TestCase):
         non_stall = [e for e in events if e["streaming"] and not e["show_stall"]]
         self.assertTrue(len(non_stall) > 0)
 
+    @patch.object(streaming_ui, "Live", FakeLive)
+    def test_first_word_after_stall_is_not_throttled(self):
+        events = []
+
+        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False, prerendered=None):
+            events.append((content, show_stall_indicator))
+            return Text(content)
+
+        with patch.object(streaming_ui, "_create_response_panel", side_effect=fake_panel), \
+             patch.object(streaming_ui.time, "sleep"):
+            d = streaming_ui.StreamingResponseDisplay(console=self.console, word_delay=0.01)
+            d._min_render_interval = 1000  # Very high throttle
+            d.start()
+
+            d._showing_stall_indicator = True
+            d._current_content = "original"
+            d._animated_content = "original"
+            d._last_render_time = time.monotonic()
+
+            d.update("original more")
+            first_render = events[1]
+            d._stop_rendering.set()
+
+        # The stall is hidden by rendering the new word, not the old content
+        self.assertEqual(first_render, ("original more", False))
+        self.assertFalse(d._showing_stall_indicator)
+
     # -------------------------------------------------- #
     # word_delay > 0 calls time.sleep
     # -------------------------------------------------- #
@@ -993,7 +1338,7 @@ class TestStreamingResponseDisplay(unittest.TestCase):
     def test_carriage_return_handled(self):
         events = []
 
-        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False):
+        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False, prerendered=None):
             events.append(content)
             return Text(content)
 
@@ -1005,6 +1350,23 @@ class TestStreamingResponseDisplay(unittest.TestCase):
 
         self.assertEqual(d._animated_content, "a\rb")
 
+    @patch.object(streaming_ui, "Live", FakeLive)
+    def test_zero_word_delay_renders_delta_once(self):
+        events = []
+
+        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False, prerendered=None):
+            events.append(content)
+            return Text(content)
+
+        with patch.object(streaming_ui, "_create_response_panel", side_effect=fake_panel):
+            d = streaming_ui.StreamingResponseDisplay(console=self.console, word_delay=0)
+            d._min_render_interval = 0
+            d.update("one two\nthree\nfour")
+
+        # Start panel, then a single refresh for the whole delta
+        self.assertEqual(events, ["", "one two\nthree\nfour"])
+        self.assertEqual(d._animated_content, "one two\nthree\nfour")
+
     # -------------------------------------------------- #
     # Multiple whitespace characters
     # -------------------------------------------------- #
@@ -1013,20 +1375,20 @@ class TestStreamingResponseDisplay(unittest.TestCase):
     def test_multiple_spaces_grouped(self):
         events = []
 
-        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False):
+        def fake_panel(content, use_markdown=True, show_stall_indicator=False, streaming=False, is_truncated=False, prerendered=None):
             events.append(content)
             return Text(content)
 
         with patch.object(streaming_ui, "_create_response_panel", side_effect=fake_panel), \
              patch.object(streaming_ui.time, "sleep"):
-            d = streaming_ui.StreamingResponseDisplay(console=self.console, word_delay=0)
+            d = streaming_ui.StreamingResponseDisplay(console=self.console, word_delay=0.01)
             d._min_render_interval = 0
             d.update("a   b")
 
         self.assertEqual(d._animated_content, "a   b")
-        # "a" -> "a   " -> "a   b"
+        # "a" -> "a   b"; the space run alone is invisible and not rendered
         self.assertIn("a", events)
-        self.assertIn("a   ", events)
+        self.assertNotIn("a   ", events)
         self.assertIn("a   b", events)
 
 
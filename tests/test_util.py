@@ -11,6 +11,7 @@ try:
         discover_agents_file,
         _try_read_agents,
         is_truncated_json,
+        index_models_by_id,
         AGENTS_FILENAME,
     )
 except ImportError:
@@ -21,6 +22,7 @@ except ImportError:
         discover_agents_file,
         _try_read_agents,
         is_truncated_json,
+        index_models_by_id,
         AGENTS_FILENAME,
     )
 
@@ -266,6 +268,9 @@ class TestIsTruncatedJson(unittest.TestCase):
     def test_valid_array_with_whitespace(self):
         self.assertFalse(is_truncated_json('  [1, 2, 3]  '))
 
+    def test_valid_object_with_trailing_newlines(self):
+        self.assertFalse(is_truncated_json('{"key": "value"}\n\t\r\n'))
+
     def test_truncated_object(self):
         self.assertTrue(is_truncated_json('{"key": "val'))
 
@@ -335,5 +340,19 @@ class TestDiscoverAgentsFileEdgeCases(unittest.TestCase):
         self.assertIsNone(result)
 
 
+
+class TestIndexModelsById(unittest.TestCase):
+
+    def test_first_entry_wins_and_index_is_reused(self):
+        models = [{"id": "a", "n": 1}, {"id": "b"}, {"id": "a", "n": 2}]
+        index = index_models_by_id(models)
+        self.assertEqual(index["a"], {"id": "a", "n": 1})
+        self.assertIs(index_models_by_id(models), index)
+
+    def test_rebuilds_for_a_different_list(self):
+        index_models_by_id([{"id": "a"}])
+        self.assertEqual(index_models_by_id([{"id": "b"}]), {"b": {"id": "b"}})
+
+
 if __name__ == "__main__":
     unittest.main()